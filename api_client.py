@@ -0,0 +1,238 @@
+import os
+import time
+import threading
+from concurrent.futures import ThreadPoolExecutor
+
+import requests
+from requests.adapters import HTTPAdapter
+
+from quota import INTERACTIVE, QuotaExceeded, get_scheduler
+from config import RESPONSE_CACHE_TTLS
+
+
+# Size of the reads between cancellation checks of a cancellable request
+READ_CHUNK_BYTES = 16 * 1024
+
+# Base URL of the YouTube Data API; can be pointed at a local stand-in for offline use
+API_BASE_URL = os.environ.get('YT_API_BASE_URL', 'https://www.googleapis.com/youtube/v3')
+
+
+def _cache_key(endpoint, params):
+    # The API key is left out: any key gets the same answer
+    return endpoint, tuple(sorted((k, str(v)) for k, v in params.items() if k != 'key'))
+
+
+class ResponseCache:
+    # Successful JSON responses, each kept until its endpoint's TTL runs out
+    def __init__(self, max_entries=512):
+        self.max_entries = max_entries
+        self._entries = {}
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            expires, data = entry
+            if expires < time.monotonic():
+                del self._entries[key]
+                return None
+            return data
+
+    def put(self, key, data, ttl):
+        with self._lock:
+            if len(self._entries) >= self.max_entries:
+                # Dicts keep insertion order, so this drops the oldest entry
+                del self._entries[next(iter(self._entries))]
+            self._entries[key] = (time.monotonic() + ttl, data)
+
+    def clear(self):
+        with self._lock:
+            self._entries.clear()
+
+
+class _InFlightCall:
+    def __init__(self):
+        self.done = threading.Event()
+        self.result = (None, 'API Exception: request failed')
+
+
+class YouTubeApiClient:
+    # One shared session so every request reuses pooled keep-alive connections
+    def __init__(self, base_url=API_BASE_URL, pool_size=16, max_workers=8, timeout=15, scheduler=None,
+                 response_ttls=RESPONSE_CACHE_TTLS):
+        self.base_url = base_url.rstrip('/')
+        self.timeout = timeout
+        # Every API call is charged against the daily quota before it is sent
+        self.scheduler = scheduler or get_scheduler()
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=pool_size)
+        self.session.mount('https://', adapter)
+        self.session.mount('http://', adapter)
+        # Google only compresses responses when the user agent mentions gzip
+        self.session.headers.update({
+            'Accept-Encoding': 'gzip, deflate',
+            'User-Agent': 'YT-playlist-sorter (gzip)',
+        })
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix='yt-api')
+        self._stats = {}
+        self._stats_lock = threading.Lock()
+        # get_json responses for (endpoint, part) pairs listed in response_ttls are cached,
+        # and identical calls already on the wire are joined instead of sent again
+        self.response_ttls = response_ttls
+        self.response_cache = ResponseCache()
+        self._inflight = {}
+        self._inflight_lock = threading.Lock()
+
+    def _endpoint_stats(self, endpoint):
+        return self._stats.setdefault(endpoint, {'count': 0, 'errors': 0, 'total_ms': 0.0, 'max_ms': 0.0, 'shared': 0})
+
+    def _record(self, endpoint, elapsed, ok):
+        with self._stats_lock:
+            stats = self._endpoint_stats(endpoint)
+            ms = elapsed * 1000
+            stats['count'] += 1
+            stats['total_ms'] += ms
+            stats['max_ms'] = max(stats['max_ms'], ms)
+            if not ok:
+                stats['errors'] += 1
+
+    def _send(self, url, cancel, **kwargs):
+        # session.get, except that with a CancelToken the body is read in chunks and a cancel
+        # between them raises Cancelled. The response is then closed rather than read to the
+        # end, so its connection is dropped instead of going back to the pool half-read.
+        if cancel is None:
+            return self.session.get(url, **kwargs)
+        cancel.raise_if_cancelled()
+        resp = self.session.get(url, stream=True, **kwargs)
+        chunks = []
+        try:
+            for chunk in resp.iter_content(READ_CHUNK_BYTES):
+                cancel.raise_if_cancelled()
+                chunks.append(chunk)
+            cancel.raise_if_cancelled()
+        except BaseException:
+            resp.close()
+            raise
+        # What a non-streamed get would have read
+        resp._content = b''.join(chunks)
+        return resp
+
+    def get(self, endpoint, params, headers=None, priority=INTERACTIVE, cancel=None):
+        # Returns the raw response; network errors, QuotaExceeded and Cancelled (when the
+        # optional CancelToken is cancelled) propagate to the caller
+        url = f'{self.base_url}/{endpoint}'
+        if cancel is not None:
+            cancel.raise_if_cancelled()  # before any quota is spent
+        self.scheduler.acquire(endpoint, priority)
+        start = time.perf_counter()
+        ok = False
+        try:
+            resp = self._send(url, cancel, params=params, headers=headers, timeout=self.timeout)
+            ok = resp.status_code < 400
+            if resp.status_code == 403 and 'quotaExceeded' in resp.text:
+                self.scheduler.mark_exhausted()
+            return resp
+        finally:
+            self._record(endpoint, time.perf_counter() - start, ok)
+            self.scheduler.release(priority)
+
+    def _record_shared(self, endpoint):
+        # A call answered from the response cache or by joining an in-flight request
+        with self._stats_lock:
+            self._endpoint_stats(endpoint)['shared'] += 1
+
+    def get_json(self, endpoint, params, priority=INTERACTIVE):
+        # Returns (data, error) in the same style as the helpers module.
+        # The returned data may be shared with other callers and must not be modified.
+        key = _cache_key(endpoint, params)
+        ttl = self.response_ttls.get((endpoint, params.get('part')))
+        if ttl:
+            data = self.response_cache.get(key)
+            if data is not None:
+                self._record_shared(endpoint)
+                return data, None
+        with self._inflight_lock:
+            call = self._inflight.get(key)
+            leader = call is None
+            if leader:
+                call = self._inflight[key] = _InFlightCall()
+        if not leader:
+            call.done.wait()
+            self._record_shared(endpoint)
+            return call.result
+        try:
+            call.result = self._fetch_json(endpoint, params, priority)
+            if ttl and call.result[1] is None:
+                self.response_cache.put(key, call.result[0], ttl)
+        finally:
+            with self._inflight_lock:
+                del self._inflight[key]
+            call.done.set()
+        return call.result
+
+    def _fetch_json(self, endpoint, params, priority):
+        try:
+            resp = self.get(endpoint, params, priority=priority)
+        except QuotaExceeded as e:
+            return None, f"Quota Error: {str(e)}"
+        except requests.RequestException as e:
+            return None, f"API Exception: {str(e)}"
+        if resp.status_code != 200:
+            return None, f"API Error: {resp.text}"
+        return resp.json(), None
+
+    def fetch_url(self, url, timeout=5, cancel=None):
+        # Plain download over the same pool (thumbnails); returns bytes or None
+        start = time.perf_counter()
+        ok = False
+        try:
+            resp = self._send(url, cancel, timeout=timeout)
+            ok = resp.status_code == 200
+            return resp.content if ok else None
+        except requests.RequestException:
+            return None
+        finally:
+            self._record('thumbnail', time.perf_counter() - start, ok)
+
+    def submit(self, fn, *args, **kwargs):
+        return self._executor.submit(fn, *args, **kwargs)
+
+    def get_async(self, endpoint, params, priority=INTERACTIVE):
+        # Future resolving to (data, error)
+        return self._executor.submit(self.get_json, endpoint, params, priority)
+
+    def latency_stats(self):
+        with self._stats_lock:
+            snapshot = {}
+            for endpoint, stats in self._stats.items():
+                snapshot[endpoint] = dict(stats, avg_ms=stats['total_ms'] / stats['count'] if stats['count'] else 0.0)
+            return snapshot
+
+    def reset_stats(self):
+        with self._stats_lock:
+            self._stats.clear()
+
+    def close(self):
+        self._executor.shutdown(wait=False)
+        self.session.close()
+
+
+_client = None
+_client_lock = threading.Lock()
+
+
+def get_client():
+    global _client
+    with _client_lock:
+        if _client is None:
+            _client = YouTubeApiClient()
+        return _client
+
+
+def set_client(client):
+    # Swap the shared client, e.g. for one pointed at a local fake API
+    global _client
+    with _client_lock:
+        _client = client
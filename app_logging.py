@@ -0,0 +1,53 @@
+import os
+import sys
+import json
+import logging
+
+
+# Below DEBUG: per-item and per-page detail that is too expensive to keep on by default.
+# Guard such calls with log.isEnabledFor(TRACE) so disabled levels cost nothing.
+TRACE = 5
+logging.addLevelName(TRACE, 'TRACE')
+
+ROOT_LOGGER = 'yt_sorter'
+
+
+class JsonLinesFormatter(logging.Formatter):
+    # One JSON object per line, for log shippers and batch jobs
+    def format(self, record):
+        entry = {
+            'ts': round(record.created, 3),
+            'level': record.levelname,
+            'logger': record.name,
+            'msg': record.getMessage(),
+        }
+        if record.exc_info:
+            entry['exc'] = self.formatException(record.exc_info)
+        return json.dumps(entry, ensure_ascii=False)
+
+
+def get_logger(name):
+    return logging.getLogger(f'{ROOT_LOGGER}.{name}')
+
+
+def setup_logging(level=None, json_lines=None, stream=None):
+    # Level and format come from YT_SORTER_LOG_LEVEL (TRACE/DEBUG/INFO/...) and
+    # YT_SORTER_LOG_FORMAT=json unless given explicitly. Logs go to stderr.
+    if level is None:
+        level = os.environ.get('YT_SORTER_LOG_LEVEL', 'INFO')
+    if isinstance(level, str):
+        level = TRACE if level.upper() == 'TRACE' else logging.getLevelName(level.upper())
+        if not isinstance(level, int):
+            level = logging.INFO
+    if json_lines is None:
+        json_lines = os.environ.get('YT_SORTER_LOG_FORMAT', '').lower() == 'json'
+    handler = logging.StreamHandler(stream or sys.stderr)
+    if json_lines:
+        handler.setFormatter(JsonLinesFormatter())
+    else:
+        handler.setFormatter(logging.Formatter('[%(levelname)s] %(name)s: %(message)s'))
+    root = logging.getLogger(ROOT_LOGGER)
+    root.handlers[:] = [handler]
+    root.setLevel(level)
+    root.propagate = False
+    return root
@@ -0,0 +1,298 @@
+import os
+import sys
+import json
+import time
+import platform
+import argparse
+import tempfile
+import tracemalloc
+
+
+# Benchmark harness: serves synthetic playlists from fake_api and times the
+# app's hot paths against them. Results are written as JSON so two runs can
+# be compared with --compare.
+#
+#   python benchmark.py --sizes 1000,10000 --output bench.json
+#   python benchmark.py --output new.json --compare bench.json
+
+DEFAULT_SIZES = [1000, 10000, 100000]
+VIEWED_PLAYLISTS = 1000
+SYNC_NEW_UPLOADS = 5
+
+
+def measure(fn, repeat, track_memory):
+    # Best-of-N wall time; peak Python allocations from one extra traced run
+    best = None
+    result = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        result = fn()
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    entry = {'seconds': round(best, 6)}
+    if track_memory:
+        tracemalloc.start()
+        fn()
+        _, peak = tracemalloc.get_traced_memory()
+        tracemalloc.stop()
+        entry['peak_kb'] = round(peak / 1024, 1)
+    return entry, result
+
+
+def run(args):
+    # Isolated app data directory so runs never touch the real store
+    os.environ['APPDATA'] = tempfile.mkdtemp(prefix='yt-sorter-bench-')
+
+    from app_logging import setup_logging
+    setup_logging(level='WARNING')
+    from fake_api import FakeYouTubeApi
+    from api_client import YouTubeApiClient, set_client
+    from quota import QuotaScheduler
+    from playlist_store import get_store
+    from helpers import fetch_playlist_items, sync_playlist_items, iter_playlist_pages, set_api_key_override
+    set_api_key_override('benchmark')
+    from sort_index import SortIndex
+    from snapshot import load_playlist_videos, save_playlist_snapshot
+
+    api = FakeYouTubeApi(latency=args.latency)
+    for size in args.sizes:
+        api.add_playlist(f'PLbench{size}', size)
+        api.add_playlist(f'UUbench{size}', size)
+    base_url = api.start()
+    # Repeated cold fetches of big playlists would overrun a real daily budget
+    client = YouTubeApiClient(base_url=base_url, scheduler=QuotaScheduler(budget=10 ** 9))
+    set_client(client)
+    store = get_store()
+
+    results = {}
+    for size in args.sizes:
+        playlist_id = f'PLbench{size}'
+        # Cold fetch: clear cached pages so every page is downloaded
+        def cold_fetch():
+            with store._conn() as conn:
+                conn.execute('DELETE FROM page_cache WHERE playlist_id = ?', (playlist_id,))
+            videos, error = fetch_playlist_items(playlist_id)
+            if error:
+                raise RuntimeError(error)
+            return videos
+        results[f'fetch_cold[{size}]'], videos = measure(cold_fetch, args.repeat, args.memory)
+        # Time to first result: the GUI shows the first page as soon as it arrives
+        def first_page():
+            with store._conn() as conn:
+                conn.execute('DELETE FROM page_cache WHERE playlist_id = ?', (playlist_id,))
+            return next(iter_playlist_pages(playlist_id))
+        results[f'first_page[{size}]'], _ = measure(first_page, args.repeat, False)
+        # Warm fetch: every page revalidates with a 304
+        results[f'fetch_revalidate[{size}]'], _ = measure(lambda: fetch_playlist_items(playlist_id), args.repeat, args.memory)
+        store.save_videos(playlist_id, videos)
+        results[f'store_load[{size}]'], _ = measure(lambda: store.get_videos(playlist_id), args.repeat, args.memory)
+        # Reopening a stored playlist: map its snapshot and sort it, as the Sort Playlist tab does
+        save_playlist_snapshot(playlist_id, videos, store.get_playlist(playlist_id)['fetched_at'])
+        results[f'snapshot_open_sort[{size}]'], _ = measure(
+            lambda: SortIndex(load_playlist_videos(playlist_id)).view('added', ascending=False), args.repeat, args.memory)
+        results[f'sort_added[{size}]'], _ = measure(lambda: SortIndex(videos).view('added', ascending=False), args.repeat, args.memory)
+        results[f'sort_published[{size}]'], _ = measure(lambda: SortIndex(videos).view('published'), args.repeat, args.memory)
+        # Switching modes on an already loaded playlist: cached permutations, reversed views
+        index = SortIndex(videos)
+        for key in ('added', 'published', 'title'):
+            index.order(key)
+        results[f'sort_switch[{size}]'], _ = measure(
+            lambda: [index.view(key, ascending) for key in ('added', 'published', 'title') for ascending in (True, False)],
+            args.repeat, args.memory)
+        # Refresh of an uploads playlist after a few new uploads: only the top pages are read
+        uploads_id = f'UUbench{size}'
+        sync_playlist_items(uploads_id)
+        def sync_uploads():
+            api.upload_videos(uploads_id, SYNC_NEW_UPLOADS)
+            return sync_playlist_items(uploads_id)
+        results[f'sync_uploads[{size}]'], _ = measure(sync_uploads, args.repeat, args.memory)
+        if args.gui:
+            results[f'render[{size}]'], _ = measure(lambda: render_results(videos), args.repeat, False)
+
+    results.update(bench_payloads(api, f'PLbench{args.sizes[0]}', args.repeat))
+
+    if args.search_size:
+        results.update(bench_search(store, args.search_size, args.repeat))
+
+    if args.gui:
+        for i in range(VIEWED_PLAYLISTS):
+            store.update_playlist(f'PLviewed{i}', playlist_name=f'Viewed playlist {i}', channel_name='Fake Channel',
+                                  playlist_link=f'https://www.youtube.com/playlist?list=PLviewed{i}', no_of_vids=i)
+        # First build creates every card; later tab switches only touch what changed
+        start = time.perf_counter()
+        load_viewed_playlists()
+        results[f'viewed_playlists_first_load[{VIEWED_PLAYLISTS}]'] = {'seconds': round(time.perf_counter() - start, 6)}
+        def switch_after_one_update():
+            store.update_playlist('PLviewed0', no_of_vids=int(time.time()))
+            load_viewed_playlists()
+        results[f'viewed_playlists_load[{VIEWED_PLAYLISTS}]'], _ = measure(switch_after_one_update, args.repeat, False)
+
+    results['api_latency'] = client.latency_stats()
+    api.stop()
+    return results
+
+
+SEARCH_WORDS = ['guitar', 'lesson', 'piano', 'review', 'travel', 'vlog', 'python', 'tutorial', 'cooking', 'recipe',
+                'live', 'concert', 'highlights', 'interview', 'podcast', 'episode', 'unboxing', 'gaming', 'speedrun', 'news']
+SEARCH_PLAYLIST_SIZE = 50000
+
+
+def bench_payloads(api, playlist_id, repeat):
+    # Response bytes per video and JSON parse time for a full playlist walk plus its
+    # video details, with and without the partial-response masks the app sends
+    from fake_api import encode_page_token
+    from helpers import parse_playlist_items, PLAYLIST_ITEMS_FIELDS
+    from enrichment import parse_video_details, VIDEO_DETAILS_FIELDS, BATCH_SIZE
+    count = len(api.playlists[playlist_id])
+    results = {}
+    for label, masked in (('full', False), ('masked', True)):
+        payloads = []
+        for offset in range(0, count, 50):
+            query = {'playlistId': playlist_id, 'maxResults': 50}
+            if offset:
+                query['pageToken'] = encode_page_token(offset)
+            if masked:
+                query['fields'] = PLAYLIST_ITEMS_FIELDS
+            _, body, _ = api.handle('playlistItems', query, {})
+            payloads.append(('playlistItems', json.dumps(body)))
+        for offset in range(0, count, BATCH_SIZE):
+            ids = ','.join(f'v{n:010d}' for n in api.playlists[playlist_id][offset:offset + BATCH_SIZE])
+            query = {'id': ids, 'fields': VIDEO_DETAILS_FIELDS} if masked else {'id': ids}
+            _, body, _ = api.handle('videos', query, {})
+            payloads.append(('videos', json.dumps(body)))
+
+        def parse():
+            for endpoint, payload in payloads:
+                data = json.loads(payload)
+                if endpoint == 'playlistItems':
+                    parse_playlist_items(data)
+                else:
+                    [parse_video_details(item) for item in data['items']]
+        entry, _ = measure(parse, repeat, False)
+        entry['bytes_per_video'] = round(sum(len(p) for _, p in payloads) / count)
+        results[f'parse_responses[{count}:{label}]'] = entry
+    return results
+
+
+def bench_search(store, total, repeat):
+    # Synthetic playlists totalling `total` videos with word-based titles, then title queries
+    from video_record import VideoRecord
+    n_words = len(SEARCH_WORDS)
+    for p in range(0, total, SEARCH_PLAYLIST_SIZE):
+        videos = [VideoRecord(f'{SEARCH_WORDS[i % n_words]} {SEARCH_WORDS[(i // n_words) % n_words]} part {i}',
+                              f'srch{i:07d}', 1600000000 + i)
+                  for i in range(p, min(p + SEARCH_PLAYLIST_SIZE, total))]
+        store.save_videos(f'PLsearch{p}', videos)
+    from config import SEARCH_RESULT_LIMIT
+    results = {}
+    for query in ('gu', 'guitar', 'guitar less'):
+        results[f'title_search_all[{total}:{query}]'], _ = measure(
+            lambda: store.search_videos(query, limit=SEARCH_RESULT_LIMIT), repeat, False)
+        results[f'title_search_playlist[{SEARCH_PLAYLIST_SIZE}:{query}]'], _ = measure(
+            lambda: store.search_video_ids(query, playlist_id='PLsearch0'), repeat, False)
+    return results
+
+
+_app = None
+_window = None
+
+
+def get_window():
+    global _app, _window
+    if _window is None:
+        from PyQt5.QtWidgets import QApplication
+        _app = QApplication.instance() or QApplication([])
+        import main_app
+        _window = main_app.PlaylistSorterQt()
+        _window.resize(1200, 800)
+        _window.show()
+        _window.tabs.setCurrentIndex(0)
+        _app.processEvents()
+    return _window
+
+
+def render_results(videos):
+    # Model reset plus painting the first screenful
+    from PyQt5.QtWidgets import QApplication
+    window = get_window()
+    window.sorted_videos = videos
+    window.update_playlist_display_links()
+    window.result_view.viewport().grab()
+    QApplication.processEvents()
+
+
+def load_viewed_playlists():
+    from PyQt5.QtWidgets import QApplication
+    window = get_window()
+    window.load_viewed_playlists()
+    QApplication.processEvents()
+
+
+def compare(current, baseline, threshold):
+    # Prints a side-by-side table; returns the names that got slower than threshold
+    regressions = []
+    print(f"{'benchmark':40} {'baseline':>12} {'current':>12} {'change':>9}")
+    for name, entry in current['results'].items():
+        old = baseline['results'].get(name)
+        if name == 'api_latency' or not old or 'seconds' not in old:
+            continue
+        change = (entry['seconds'] - old['seconds']) / old['seconds'] if old['seconds'] else 0.0
+        flag = ' REGRESSION' if change > threshold else ''
+        print(f"{name:40} {old['seconds']:>12.4f} {entry['seconds']:>12.4f} {change:>+8.1%}{flag}")
+        if flag:
+            regressions.append(name)
+    return regressions
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Benchmark the playlist sorter against a local fake YouTube API.')
+    parser.add_argument('--sizes', default=','.join(str(s) for s in DEFAULT_SIZES), help='comma-separated playlist sizes')
+    parser.add_argument('--latency', type=float, default=0.0, help='simulated seconds of latency per request')
+    parser.add_argument('--repeat', type=int, default=3, help='runs per benchmark (best is kept)')
+    parser.add_argument('--no-memory', dest='memory', action='store_false', help='skip tracemalloc peak memory runs')
+    parser.add_argument('--search-size', type=int, default=500000, help='videos indexed for the title search benchmarks (0 to skip)')
+    parser.add_argument('--no-gui', dest='gui', action='store_false', help='skip the Qt rendering benchmarks')
+    parser.add_argument('--output', default='bench_results.json', help='where to write the results JSON')
+    parser.add_argument('--compare', help='baseline results JSON to compare against')
+    parser.add_argument('--threshold', type=float, default=0.10, help='slowdown counted as a regression (default 0.10)')
+    args = parser.parse_args(argv)
+    args.sizes = [int(s) for s in args.sizes.split(',') if s]
+    if args.gui:
+        try:
+            import PyQt5  # noqa: F401
+            os.environ.setdefault('QT_QPA_PLATFORM', 'offscreen')
+        except ImportError:
+            print('PyQt5 not installed, skipping rendering benchmarks', file=sys.stderr)
+            args.gui = False
+
+    results = run(args)
+    report = {
+        'meta': {
+            'timestamp': time.strftime('%Y-%m-%dT%H:%M:%S'),
+            'python': platform.python_version(),
+            'platform': platform.platform(),
+            'sizes': args.sizes,
+            'latency': args.latency,
+            'repeat': args.repeat,
+        },
+        'results': results,
+    }
+    with open(args.output, 'w', encoding='utf-8') as f:
+        json.dump(report, f, indent=2)
+    for name, entry in results.items():
+        if name != 'api_latency':
+            peak = f"  peak {entry['peak_kb']:.0f} KB" if 'peak_kb' in entry else ''
+            size = f"  {entry['bytes_per_video']} bytes/video" if 'bytes_per_video' in entry else ''
+            print(f"{name:40} {entry['seconds']:.4f}s{peak}{size}")
+    print(f'Results written to {args.output}')
+
+    if args.compare:
+        with open(args.compare, 'r', encoding='utf-8') as f:
+            baseline = json.load(f)
+        if compare(report, baseline, args.threshold):
+            return 1
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
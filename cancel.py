@@ -0,0 +1,44 @@
+import threading
+
+
+class Cancelled(Exception):
+    # Raised inside work whose CancelToken has been cancelled
+    pass
+
+
+class CancelToken:
+    # Cancelled once by whoever supersedes the work. The work checks it between steps;
+    # blocking waits register a callback so they wake up as soon as it is cancelled.
+    def __init__(self):
+        self._lock = threading.Lock()
+        self._cancelled = False
+        self._callbacks = []
+
+    @property
+    def cancelled(self):
+        return self._cancelled
+
+    def cancel(self):
+        with self._lock:
+            if self._cancelled:
+                return
+            self._cancelled = True
+            callbacks, self._callbacks = self._callbacks, []
+        for callback in callbacks:
+            callback()
+
+    def add_callback(self, callback):
+        with self._lock:
+            if not self._cancelled:
+                self._callbacks.append(callback)
+                return
+        callback()
+
+    def remove_callback(self, callback):
+        with self._lock:
+            if callback in self._callbacks:
+                self._callbacks.remove(callback)
+
+    def raise_if_cancelled(self):
+        if self._cancelled:
+            raise Cancelled()
@@ -0,0 +1,191 @@
+import os
+import sys
+import csv
+import json
+import argparse
+
+from helpers import get_playlist_id, fetch_playlist_items, sync_playlist_items, set_api_key_override
+from sort_index import SortIndex, SORT_KEYS
+from playlist_store import get_store
+from snapshot import load_playlist_videos, save_playlist_snapshot
+from app_logging import setup_logging
+
+
+# Headless entry point: python -m cli <command> ...
+# Only the API client and the store are imported, never Qt.
+
+FIELDS = ['playlist_id', 'position', 'video_id', 'title', 'added_at', 'published_at',
+          'duration', 'view_count', 'like_count', 'thumbnail']
+DIFF_FIELDS = ['change'] + FIELDS
+
+
+class RecordWriter:
+    # Streams one record at a time as NDJSON or CSV
+    def __init__(self, out, fmt, fields):
+        self.out = out
+        self.fmt = fmt
+        if fmt == 'csv':
+            self.csv_writer = csv.DictWriter(out, fieldnames=fields, extrasaction='ignore')
+            self.csv_writer.writeheader()
+
+    def write(self, record):
+        if self.fmt == 'csv':
+            self.csv_writer.writerow(record)
+        else:
+            self.out.write(json.dumps(record, ensure_ascii=False) + '\n')
+        self.out.flush()
+
+
+def resolve_playlist_ids(args):
+    values = list(args.playlists)
+    if args.from_file:
+        with open(args.from_file, 'r', encoding='utf-8') as f:
+            values.extend(line.strip() for line in f if line.strip() and not line.startswith('#'))
+    ids = []
+    for value in values:
+        # Accept full playlist URLs as well as bare IDs
+        ids.append(get_playlist_id(value) if 'list=' in value else value)
+    return ids
+
+
+def enrich(playlist_id, videos):
+    from enrichment import enrich_videos
+    from quota import INTERACTIVE
+    # Asked for explicitly on the command line, so not paced like the GUI's background enrichment
+    videos, enrich_error = enrich_videos(videos, priority=INTERACTIVE)
+    if enrich_error:
+        print(f'[WARN] {playlist_id}: video details unavailable: {enrich_error}', file=sys.stderr)
+    return videos
+
+
+def fetch_and_store(store, playlist_id, with_details):
+    # Brings the stored copy up to date; returns (PlaylistSync, error)
+    sync, error = sync_playlist_items(playlist_id, playlist_link=f'https://www.youtube.com/playlist?list={playlist_id}')
+    if error:
+        return None, error
+    if with_details:
+        enrich(playlist_id, sync.videos)
+    store.update_playlist(playlist_id, no_of_vids=len(sync.videos))
+    return sync, None
+
+
+def emit_videos(writer, playlist_id, videos, extra=None):
+    for position, v in enumerate(videos):
+        record = dict(v.to_dict(), playlist_id=playlist_id, position=position)
+        if extra:
+            record.update(extra)
+        writer.write(record)
+
+
+def cmd_fetch(args, store, writer):
+    failed = False
+    for playlist_id in resolve_playlist_ids(args):
+        sync, error = fetch_and_store(store, playlist_id, args.enrich)
+        if error:
+            print(f'[ERROR] {playlist_id}: {error}', file=sys.stderr)
+            failed = True
+            continue
+        emit_videos(writer, playlist_id, sync.videos)
+    return 1 if failed else 0
+
+
+def cmd_sort(args, store, writer):
+    failed = False
+    for playlist_id in resolve_playlist_ids(args):
+        if store.has_videos(playlist_id) and not args.refresh:
+            fetched_at = store.get_playlist(playlist_id)['fetched_at']
+            videos = load_playlist_videos(playlist_id, store)
+            if args.enrich:
+                # A snapshot's sort columns are its own, so the records are enriched as a list
+                # and the snapshot rewritten with what they gained
+                videos = enrich(playlist_id, list(videos))
+                save_playlist_snapshot(playlist_id, videos, fetched_at, store)
+        else:
+            sync, error = fetch_and_store(store, playlist_id, args.enrich)
+            if error:
+                print(f'[ERROR] {playlist_id}: {error}', file=sys.stderr)
+                failed = True
+                continue
+            videos = sync.videos
+        ordered = SortIndex(videos).view(args.by, ascending=not args.desc)
+        emit_videos(writer, playlist_id, ordered)
+    return 1 if failed else 0
+
+
+def cmd_diff(args, store, writer):
+    # Compares the playlist against the stored copy and reports added/removed videos.
+    # Normally the stored copy is synced (a few pages for uploads playlists); --dry-run fetches
+    # everything and leaves the store alone.
+    failed = False
+    for playlist_id in resolve_playlist_ids(args):
+        old_videos = store.get_videos(playlist_id)
+        if args.dry_run:
+            videos, error = fetch_playlist_items(playlist_id)
+        else:
+            sync, error = fetch_and_store(store, playlist_id, False)
+            videos = sync.videos if sync else None
+        if error:
+            print(f'[ERROR] {playlist_id}: {error}', file=sys.stderr)
+            failed = True
+            continue
+        old_ids = set(v.video_id for v in old_videos)
+        new_ids = set(v.video_id for v in videos)
+        added = [(position, v) for position, v in enumerate(videos) if v.video_id not in old_ids]
+        if args.enrich:
+            enrich(playlist_id, [v for _, v in added])
+        for position, v in added:
+            emit_videos(writer, playlist_id, [v], extra={'position': position, 'change': 'added'})
+        for position, v in enumerate(old_videos):
+            if v.video_id not in new_ids:
+                emit_videos(writer, playlist_id, [v], extra={'position': position, 'change': 'removed'})
+    return 1 if failed else 0
+
+
+def build_parser():
+    parser = argparse.ArgumentParser(prog='python -m cli', description='Fetch, sort and diff YouTube playlists without the GUI.')
+    parser.add_argument('--api-key', help='YouTube Data API key (defaults to GOOGLE_API_KEY or the saved key)')
+    parser.add_argument('--format', choices=['ndjson', 'csv'], default='ndjson', help='output format (default: ndjson)')
+    parser.add_argument('--log-level', help='TRACE, DEBUG, INFO, WARNING or ERROR (default: YT_SORTER_LOG_LEVEL or INFO)')
+    parser.add_argument('--log-json', action='store_true', help='write logs to stderr as JSON lines')
+    subparsers = parser.add_subparsers(dest='command', required=True)
+
+    def add_common(sub):
+        sub.add_argument('playlists', nargs='*', help='playlist IDs or URLs')
+        sub.add_argument('--from-file', help='file with one playlist ID or URL per line')
+        sub.add_argument('--enrich', action='store_true', help='also fetch publish dates, durations and statistics')
+
+    fetch = subparsers.add_parser('fetch', help='fetch playlists, store them and print their videos')
+    add_common(fetch)
+    fetch.set_defaults(func=cmd_fetch, fields=FIELDS)
+
+    sort = subparsers.add_parser('sort', help='print playlist videos in sorted order')
+    add_common(sort)
+    sort.add_argument('--by', choices=list(SORT_KEYS), default='added', help='duration and views need --enrich')
+    sort.add_argument('--desc', action='store_true', help='descending (newest/longest/most viewed first)')
+    sort.add_argument('--refresh', action='store_true', help='fetch even if the playlist is stored')
+    sort.set_defaults(func=cmd_sort, fields=FIELDS)
+
+    diff = subparsers.add_parser('diff', help='print videos added or removed since the stored copy')
+    add_common(diff)
+    diff.add_argument('--dry-run', action='store_true', help='do not update the stored copy')
+    diff.set_defaults(func=cmd_diff, fields=DIFF_FIELDS)
+    return parser
+
+
+def main(argv=None):
+    args = build_parser().parse_args(argv)
+    set_api_key_override(args.api_key or os.environ.get('GOOGLE_API_KEY'))
+    # Logs go to stderr so stdout carries only records
+    setup_logging(level=args.log_level, json_lines=args.log_json or None)
+    try:
+        writer = RecordWriter(sys.stdout, args.format, args.fields)
+        return args.func(args, get_store(), writer)
+    except BrokenPipeError:
+        # The reader went away (e.g. piped into head). Output still buffered is flushed at exit,
+        # so stdout is pointed at devnull to keep that from failing the same way.
+        os.dup2(os.open(os.devnull, os.O_WRONLY), sys.stdout.fileno())
+        return 1
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,3 +1,57 @@
 # Configuration for link colors
 CLICKED_LINK_COLOR = '#8888ff'  # Light blue for clicked links
 UNCLICKED_LINK_COLOR = '#0000ee'  # Default blue for unclicked links
+
+# How long fetched video details (publish date, duration, statistics) stay fresh, in seconds
+VIDEO_DETAILS_TTL = 7 * 24 * 60 * 60
+
+# Thumbnail cache budgets, in bytes: decoded images kept in memory, and downloaded files kept on disk
+THUMBNAIL_MEMORY_CACHE_BYTES = 64 * 1024 * 1024
+THUMBNAIL_DISK_CACHE_BYTES = 200 * 1024 * 1024
+
+# Threads downloading thumbnails; they have their own pool so fetches never queue behind them
+THUMBNAIL_THREADS = 4
+
+# Watched-link clicks are written to a journal at most this often (seconds) and folded
+# into the database once this many have accumulated
+WATCHED_FLUSH_INTERVAL = 1.0
+WATCHED_COMPACT_EVENTS = 256
+
+# Most title-search matches shown when filtering across all playlists
+SEARCH_RESULT_LIMIT = 2000
+
+# How long a channel's playlist listing is served from the local database before it is fetched again, in seconds
+CHANNEL_PLAYLISTS_TTL = 24 * 60 * 60
+
+# Seconds a successful response stays cached, per (endpoint, part). Only metadata that
+# rarely changes is listed; item counts and playlist pages are always fetched fresh.
+RESPONSE_CACHE_TTLS = {
+    ('playlists', 'snippet'): 60 * 60,
+    ('channels', 'id'): 24 * 60 * 60,
+}
+
+# YouTube Data API quota, in units per day (10000 is the default for a new project).
+# The last QUOTA_INTERACTIVE_RESERVE units are only spent on requests the user is waiting for;
+# background work may burst up to QUOTA_BACKGROUND_BURST units and then is paced to the daily rate,
+# giving up after QUOTA_BACKGROUND_MAX_WAIT seconds.
+DAILY_QUOTA_BUDGET = 10000
+QUOTA_INTERACTIVE_RESERVE = 2000
+QUOTA_BACKGROUND_BURST = 500
+QUOTA_BACKGROUND_MAX_WAIT = 30
+
+# Background checks for new videos in tracked playlists. Each playlist is checked about as
+# often as it gets uploads (its rate is a moving average with weight POLL_RATE_SMOOTHING on
+# the newest observation), within POLL_MIN_INTERVAL..POLL_MAX_INTERVAL seconds; playlists
+# with no history yet are checked every POLL_DEFAULT_INTERVAL. The poller wakes up every
+# POLL_TICK seconds, the first time POLL_STARTUP_DELAY seconds after launch.
+POLL_MIN_INTERVAL = 15 * 60
+POLL_MAX_INTERVAL = 7 * 24 * 60 * 60
+POLL_DEFAULT_INTERVAL = 6 * 60 * 60
+POLL_RATE_SMOOTHING = 0.3
+POLL_TICK = 60
+POLL_STARTUP_DELAY = 5
+
+# Compression of the strings (IDs, titles) in playlist snapshot files: None keeps them
+# memory-mapped as they are, 'zlib' or 'zstd' (needs the zstandard package, else zlib)
+# makes the files smaller but decompresses all strings when a playlist is opened
+SNAPSHOT_CODEC = None
@@ -0,0 +1,121 @@
+import re
+import time
+from concurrent.futures import as_completed
+
+from api_client import get_client
+from quota import BACKGROUND
+from playlist_store import get_store
+from helpers import load_api_key
+from config import VIDEO_DETAILS_TTL
+from app_logging import get_logger
+from video_record import parse_timestamp
+
+
+log = get_logger('enrichment')
+
+
+BATCH_SIZE = 50  # videos.list accepts at most 50 IDs per call
+VIDEO_DETAILS_FIELDS = 'items(id,snippet/publishedAt,contentDetails/duration,statistics(viewCount,likeCount))'
+
+DURATION_RE = re.compile(r'P(?:(\d+)D)?(?:T(?:(\d+)H)?(?:(\d+)M)?(?:(\d+)S)?)?')
+
+
+def parse_duration(value):
+    # ISO 8601 duration such as PT1H2M3S -> seconds
+    match = DURATION_RE.fullmatch(value or '')
+    if not match:
+        return None
+    days, hours, minutes, seconds = (int(g) if g else 0 for g in match.groups())
+    return ((days * 24 + hours) * 60 + minutes) * 60 + seconds
+
+
+def parse_video_details(item):
+    stats = item.get('statistics', {})
+    return {
+        'video_id': item['id'],
+        'published_ts': parse_timestamp(item.get('snippet', {}).get('publishedAt')),
+        'duration': parse_duration(item.get('contentDetails', {}).get('duration')),
+        'view_count': int(stats['viewCount']) if 'viewCount' in stats else None,
+        'like_count': int(stats['likeCount']) if 'likeCount' in stats else None,
+    }
+
+
+def unavailable_video_details(video_id):
+    return {'video_id': video_id, 'published_ts': None, 'duration': None, 'view_count': None, 'like_count': None}
+
+
+def fetch_video_details_batch(video_ids, api_key, priority=BACKGROUND):
+    params = {
+        'part': 'snippet,contentDetails,statistics',
+        'id': ','.join(video_ids),
+        'maxResults': BATCH_SIZE,
+        'fields': VIDEO_DETAILS_FIELDS,
+        'key': api_key
+    }
+    data, error = get_client().get_json('videos', params, priority=priority)
+    if error:
+        return None, error
+    details = [parse_video_details(item) for item in data.get('items', [])]
+    # Deleted and private videos are left out of the response. An empty entry is stored for
+    # them, so they are not asked for again until it expires like any other.
+    returned = {d['video_id'] for d in details}
+    details.extend(unavailable_video_details(vid) for vid in video_ids if vid not in returned)
+    return details, None
+
+
+def enrich_videos(videos, ttl=VIDEO_DETAILS_TTL, priority=BACKGROUND, cancel=None):
+    # Fills in published_ts, duration, view_count and like_count on each VideoRecord.
+    # Details younger than ttl come from the store; the rest are fetched 50 at a time.
+    # Cancelling the optional CancelToken drops the batches not started yet and raises
+    # Cancelled; nothing is stored or filled in after that.
+    log.debug('enrich_videos called for %d videos', len(videos))
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    store = get_store()
+    video_ids = list(dict.fromkeys(v.video_id for v in videos))
+    details = store.get_video_details(video_ids, max_age=ttl)
+    missing = [vid for vid in video_ids if vid not in details]
+    error = None
+    if missing:
+        api_key = load_api_key()
+        batches = [missing[i:i + BATCH_SIZE] for i in range(0, len(missing), BATCH_SIZE)]
+        log.debug('Fetching details for %d videos in %d batches', len(missing), len(batches))
+        # Batches run concurrently on the shared client's worker pool
+        client = get_client()
+        futures = [client.submit(fetch_video_details_batch, b, api_key, priority) for b in batches]
+
+        def drop_pending():
+            for f in futures:
+                f.cancel()
+
+        if cancel is not None:
+            cancel.add_callback(drop_pending)
+        try:
+            for future in as_completed(futures):
+                if cancel is not None:
+                    cancel.raise_if_cancelled()
+                if future.cancelled():
+                    continue
+                fetched, batch_error = future.result()
+                if batch_error:
+                    # Throttling or a lost quota fails every later batch the same way, so the
+                    # ones not started yet are dropped; they are fetched on the next enrichment
+                    drop_pending()
+                    error = batch_error
+                    continue
+                store.save_video_details(fetched, fetched_at=time.time())
+                for d in fetched:
+                    details[d['video_id']] = d
+        finally:
+            if cancel is not None:
+                cancel.remove_callback(drop_pending)
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    for v in videos:
+        d = details.get(v.video_id)
+        if d:
+            v.published_ts = d['published_ts']
+            v.duration = d['duration']
+            v.view_count = d['view_count']
+            v.like_count = d['like_count']
+    return videos, error
@@ -0,0 +1,309 @@
+import sys
+import json
+import time
+import base64
+import hashlib
+import argparse
+import threading
+from datetime import datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from urllib.parse import urlparse, parse_qs
+
+
+# Local stand-in for the YouTube Data API, used to exercise the app offline.
+# Start it and point the app at it with YT_API_BASE_URL=http://127.0.0.1:<port>
+
+BASE_TIME = datetime(2015, 1, 1, tzinfo=timezone.utc)
+
+
+def make_video_id(n):
+    return f'v{n:010d}'
+
+
+def make_playlist_item(playlist_id, position, n):
+    video_id = make_video_id(n)
+    published = (BASE_TIME + timedelta(hours=n)).strftime('%Y-%m-%dT%H:%M:%SZ')
+    thumbs = {}
+    for size, name, w, h in (('default', 'default', 120, 90), ('medium', 'mqdefault', 320, 180), ('high', 'hqdefault', 480, 360)):
+        thumbs[size] = {'url': f'https://i.ytimg.com/vi/{video_id}/{name}.jpg', 'width': w, 'height': h}
+    return {
+        'kind': 'youtube#playlistItem',
+        'id': f'{playlist_id}.{n}',
+        'snippet': {
+            'publishedAt': published,
+            'channelId': 'UCfakechannel000000000',
+            'title': f'Synthetic video {n}',
+            'description': f'Description of synthetic video {n}. ' * 4,
+            'thumbnails': thumbs,
+            'channelTitle': 'Fake Channel',
+            'playlistId': playlist_id,
+            'position': position,
+            'resourceId': {'kind': 'youtube#video', 'videoId': video_id},
+            'videoOwnerChannelTitle': 'Fake Channel',
+            'videoOwnerChannelId': 'UCfakechannel000000000',
+        },
+    }
+
+
+def encode_page_token(offset):
+    return base64.urlsafe_b64encode(f'o:{offset}'.encode()).decode().rstrip('=')
+
+
+def decode_page_token(token):
+    padded = token + '=' * (-len(token) % 4)
+    return int(base64.urlsafe_b64decode(padded).decode().split(':')[1])
+
+
+def compute_etag(body):
+    return '"' + hashlib.sha1(json.dumps(body, sort_keys=True).encode()).hexdigest() + '"'
+
+
+def parse_fields(spec):
+    # Partial-response mask such as 'nextPageToken,items(id,snippet/title)' -> nested dict,
+    # where None selects the whole value
+    tree, _ = _parse_fields(spec, 0)
+    return tree
+
+
+def _parse_fields(spec, i):
+    tree = {}
+    while i < len(spec):
+        j = i
+        while j < len(spec) and spec[j] not in ',()':
+            j += 1
+        path = spec[i:j].strip().split('/')
+        sub = None
+        if j < len(spec) and spec[j] == '(':
+            sub, j = _parse_fields(spec, j + 1)
+            j += 1  # the closing parenthesis
+        node = tree
+        for name in path[:-1]:
+            if name in node and node[name] is None:
+                break  # already selected whole
+            node = node.setdefault(name, {})
+        else:
+            node[path[-1]] = _merge_fields(node.get(path[-1], {}), sub) if path[-1] in node else sub
+        if j < len(spec) and spec[j] == ')':
+            return tree, j
+        i = j + 1
+    return tree, i
+
+
+def _merge_fields(a, b):
+    if a is None or b is None:
+        return None
+    merged = dict(a)
+    for k, v in b.items():
+        merged[k] = _merge_fields(merged[k], v) if k in merged else v
+    return merged
+
+
+def apply_fields(value, tree):
+    if tree is None:
+        return value
+    if isinstance(value, list):
+        return [apply_fields(v, tree) for v in value]
+    if isinstance(value, dict):
+        return {k: apply_fields(value[k], sub) for k, sub in tree.items() if k in value}
+    return value
+
+
+class FakeYouTubeApi:
+    # Playlists hold only video numbers; item resources are built per page so
+    # 100k-item playlists stay cheap to serve.
+    def __init__(self, latency=0.0):
+        self.latency = latency
+        self.playlists = {}
+        self.channels = {}
+        self.request_log = []
+        self._next_video = 0
+        self._lock = threading.Lock()
+        self._server = None
+        self._thread = None
+
+    def add_playlist(self, playlist_id, count, channel_handle=None):
+        with self._lock:
+            self.playlists[playlist_id] = []
+            if channel_handle:
+                self.add_channel(channel_handle)
+                self.channels[channel_handle].append(playlist_id)
+        self.append_videos(playlist_id, count)
+
+    def add_channel(self, handle):
+        self.channels.setdefault(handle, [])
+
+    def append_videos(self, playlist_id, count):
+        with self._lock:
+            self.playlists[playlist_id].extend(range(self._next_video, self._next_video + count))
+            self._next_video += count
+
+    def upload_videos(self, playlist_id, count):
+        # New uploads go to the top, as in a channel's uploads playlist
+        with self._lock:
+            new = range(self._next_video + count - 1, self._next_video - 1, -1)
+            self.playlists[playlist_id][:0] = new
+            self._next_video += count
+
+    def remove_videos(self, playlist_id, positions):
+        with self._lock:
+            items = self.playlists[playlist_id]
+            for position in sorted(positions, reverse=True):
+                del items[position]
+
+    def handle(self, endpoint, query, headers):
+        # Returns (status, body, extra_headers)
+        handler = getattr(self, f'_handle_{endpoint}', None)
+        if handler is None:
+            return 404, {'error': {'code': 404, 'message': f'Unknown endpoint {endpoint}'}}, {}
+        status, body = handler(query)
+        if status != 200:
+            return status, body, {}
+        etag = compute_etag(body)
+        body = dict(body, etag=etag)
+        if headers.get('If-None-Match') == etag:
+            return 304, None, {'ETag': etag}
+        if query.get('fields'):
+            body = apply_fields(body, parse_fields(query['fields']))
+        return 200, body, {'ETag': etag}
+
+    def _handle_playlistItems(self, query):
+        playlist_id = query.get('playlistId')
+        with self._lock:
+            items = self.playlists.get(playlist_id)
+            if items is None:
+                return 404, {'error': {'code': 404, 'message': 'playlistNotFound'}}
+            max_results = min(int(query.get('maxResults', 5)), 50)
+            offset = decode_page_token(query['pageToken']) if query.get('pageToken') else 0
+            numbers = items[offset:offset + max_results]
+            total = len(items)
+        page = [make_playlist_item(playlist_id, offset + i, n) for i, n in enumerate(numbers)]
+        body = {
+            'kind': 'youtube#playlistItemListResponse',
+            'items': page,
+            'pageInfo': {'totalResults': total, 'resultsPerPage': max_results},
+        }
+        if offset + max_results < total:
+            body['nextPageToken'] = encode_page_token(offset + max_results)
+        return 200, body
+
+    def _playlist_resource(self, playlist_id):
+        return {
+            'kind': 'youtube#playlist',
+            'id': playlist_id,
+            'snippet': {
+                'title': f'Synthetic playlist {playlist_id}',
+                'description': f'Synthetic playlist {playlist_id} served by the fake API.',
+                'channelTitle': 'Fake Channel',
+                'channelId': 'UCfakechannel000000000',
+                'thumbnails': {'medium': {'url': f'https://i.ytimg.com/vi/{make_video_id(0)}/mqdefault.jpg', 'width': 320, 'height': 180}},
+            },
+            'contentDetails': {'itemCount': len(self.playlists[playlist_id])},
+        }
+
+    def _handle_playlists(self, query):
+        with self._lock:
+            if 'channelId' in query:
+                # Channel IDs are UC + handle; pages of maxResults playlists
+                playlist_ids = self.channels.get(query['channelId'][2:])
+                if playlist_ids is None:
+                    return 404, {'error': {'code': 404, 'message': 'channelNotFound'}}
+                max_results = min(int(query.get('maxResults', 5)), 50)
+                offset = decode_page_token(query['pageToken']) if query.get('pageToken') else 0
+                ids = playlist_ids[offset:offset + max_results]
+                total = len(playlist_ids)
+                next_offset = offset + max_results if offset + max_results < total else None
+            else:
+                ids = [pid for pid in query.get('id', '').split(',') if pid in self.playlists]
+                total = len(ids)
+                next_offset = None
+            items = [self._playlist_resource(pid) for pid in ids]
+        body = {'kind': 'youtube#playlistListResponse', 'items': items, 'pageInfo': {'totalResults': total}}
+        if next_offset is not None:
+            body['nextPageToken'] = encode_page_token(next_offset)
+        return 200, body
+
+    def _handle_channels(self, query):
+        handle = query.get('forHandle', '').lstrip('@')
+        with self._lock:
+            items = [{'kind': 'youtube#channel', 'id': f'UC{handle}'}] if handle in self.channels else []
+        return 200, {'kind': 'youtube#channelListResponse', 'items': items, 'pageInfo': {'totalResults': len(items)}}
+
+    def _handle_videos(self, query):
+        items = []
+        for video_id in query.get('id', '').split(','):
+            if not video_id.startswith('v') or not video_id[1:].isdigit():
+                continue
+            n = int(video_id[1:])
+            published = (BASE_TIME - timedelta(days=(n * 37) % 3000)).strftime('%Y-%m-%dT%H:%M:%SZ')
+            items.append({
+                'kind': 'youtube#video',
+                'id': video_id,
+                'snippet': {'publishedAt': published, 'title': f'Synthetic video {n}', 'channelTitle': 'Fake Channel'},
+                'contentDetails': {'duration': f'PT{n % 3}H{n % 60}M{(n * 7) % 60}S'},
+                'statistics': {'viewCount': str((n * 7919) % 1000000), 'likeCount': str((n * 31) % 10000)},
+            })
+        return 200, {'kind': 'youtube#videoListResponse', 'items': items, 'pageInfo': {'totalResults': len(items)}}
+
+    def _make_handler(self):
+        api = self
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(self):
+                parsed = urlparse(self.path)
+                endpoint = parsed.path.rstrip('/').rsplit('/', 1)[-1]
+                query = {k: v[0] for k, v in parse_qs(parsed.query).items()}
+                if api.latency:
+                    time.sleep(api.latency)
+                status, body, extra = api.handle(endpoint, query, self.headers)
+                payload = json.dumps(body).encode() if body is not None else b''
+                with api._lock:
+                    api.request_log.append((endpoint, status, len(payload)))
+                self.send_response(status)
+                for k, v in extra.items():
+                    self.send_header(k, v)
+                if body is not None:
+                    self.send_header('Content-Type', 'application/json; charset=UTF-8')
+                self.send_header('Content-Length', str(len(payload)))
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, format, *args):
+                pass
+
+        return Handler
+
+    def start(self, host='127.0.0.1', port=0):
+        self._server = ThreadingHTTPServer((host, port), self._make_handler())
+        self._thread = threading.Thread(target=self._server.serve_forever, daemon=True)
+        self._thread.start()
+        return f'http://{host}:{self._server.server_address[1]}'
+
+    def stop(self):
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+            self._server = None
+
+
+def main(argv=None):
+    parser = argparse.ArgumentParser(description='Serve a fake YouTube Data API for offline testing.')
+    parser.add_argument('--port', type=int, default=8765)
+    parser.add_argument('--playlist', default='PLfake', help='playlist ID to serve')
+    parser.add_argument('--items', type=int, default=1000, help='number of videos in the playlist')
+    parser.add_argument('--channel', default='fakechannel', help='channel handle that owns the playlist')
+    parser.add_argument('--latency', type=float, default=0.0, help='seconds of delay per request')
+    args = parser.parse_args(argv)
+    api = FakeYouTubeApi(latency=args.latency)
+    api.add_playlist(args.playlist, args.items, channel_handle=args.channel)
+    base_url = api.start(port=args.port)
+    print(f'Fake YouTube API serving {args.items} items of {args.playlist} (channel @{args.channel}) at {base_url}')
+    print(f'Run the app with YT_API_BASE_URL={base_url}')
+    try:
+        while True:
+            time.sleep(1)
+    except KeyboardInterrupt:
+        api.stop()
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -1,165 +1,360 @@
 import os
-import requests
 import json
+import time
+from collections import namedtuple
+from concurrent.futures import as_completed
+
+import requests
+
+from api_client import get_client
+from quota import BACKGROUND, INTERACTIVE, QuotaExceeded
+from playlist_store import get_store, get_app_data_dir
+from app_logging import get_logger, TRACE
+from video_record import VideoRecord, parse_timestamp
+from config import CHANNEL_PLAYLISTS_TTL
+
+
+log = get_logger('helpers')
+
+# Saved API key, read once instead of on every request
+_api_key_cache = None
+_api_key_override = None
 
 
 def get_config_path():
-    print('[DEBUG] get_config_path called')
-    config_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter')
-    os.makedirs(config_dir, exist_ok=True)
-    config_path = os.path.join(config_dir, 'config.json')
-    print(f'[DEBUG] config_path: {config_path}')
+    config_path = os.path.join(get_app_data_dir(), 'config.json')
+    log.debug('config_path: %s', config_path)
     return config_path
 
 def save_api_key(api_key):
-    print(f'[DEBUG] save_api_key called with api_key: {api_key}')
+    global _api_key_cache
     config_path = get_config_path()
     with open(config_path, 'w', encoding='utf-8') as f:
         json.dump({'GOOGLE_API_KEY': api_key}, f)
-    print('[DEBUG] API key saved')
+    _api_key_cache = api_key
+    log.debug('API key saved')
+
+def set_api_key_override(api_key):
+    # Headless entry points (cli.py) use a key given on the command line or in GOOGLE_API_KEY
+    # instead of the saved one; the GUI always uses the key saved in its Configurations tab
+    global _api_key_override
+    _api_key_override = api_key
 
 def load_api_key():
-    print('[DEBUG] load_api_key called')
+    global _api_key_cache
+    if _api_key_override:
+        return _api_key_override
+    if _api_key_cache:
+        return _api_key_cache
     config_path = get_config_path()
     if os.path.exists(config_path):
         try:
             with open(config_path, 'r', encoding='utf-8') as f:
                 config = json.load(f)
-                api_key = config.get('GOOGLE_API_KEY')
-                print(f'[DEBUG] Loaded API key: {api_key}')
-                return api_key
+                _api_key_cache = config.get('GOOGLE_API_KEY')
+                log.debug('Loaded API key from config (%s)', 'set' if _api_key_cache else 'empty')
+                return _api_key_cache
         except Exception as e:
-            print(f'[DEBUG] Error loading API key: {e}')
+            log.warning('Error loading API key: %s', e)
             return None
-    print('[DEBUG] No config file found for API key')
+    log.debug('No config file found for API key')
     return None
 
 
 
 def get_playlist_id(url):
-    print(f'[DEBUG] get_playlist_id called with url: {url}')
     if 'list=' in url:
         playlist_id = url.split('list=')[1].split('&')[0]
-        print(f'[DEBUG] Extracted playlist_id: {playlist_id}')
+        log.debug('Extracted playlist_id: %s', playlist_id)
         return playlist_id
-    print('[DEBUG] No playlist_id found in url')
+    log.debug('No playlist_id found in url: %s', url)
     return None
 
-def fetch_playlist_items(playlist_id):
-    print(f'[DEBUG] fetch_playlist_items called with playlist_id: {playlist_id}')
+def parse_playlist_items(data):
     videos = []
+    trace = log.isEnabledFor(TRACE)
+    for item in data.get('items', []):
+        snippet = item['snippet']
+        video_id = snippet['resourceId']['videoId']
+        title = snippet['title']
+        thumbnails = snippet.get('thumbnails', {})
+        thumb_url = thumbnails.get('medium', {}).get('url') or thumbnails.get('default', {}).get('url')
+        if trace:
+            log.log(TRACE, 'Appending video: %s (%s)', title, video_id)
+        videos.append(VideoRecord(title, video_id, parse_timestamp(snippet['publishedAt']), thumb_url))
+    return videos
+
+# Partial-response masks: each wrapper asks only for the fields it reads
+PLAYLIST_ITEMS_FIELDS = ('etag,nextPageToken,pageInfo/totalResults,'
+                         'items/snippet(publishedAt,title,resourceId/videoId,thumbnails(medium/url,default/url))')
+
+def iter_playlist_pages(playlist_id, cancel=None, priority=INTERACTIVE):
+    # Yields (page_videos, total_results, error) for each playlistItems page in playlist order,
+    # stopping after an error. Cached pages are revalidated by ETag and reused when unchanged.
+    # Cancelling the optional CancelToken raises Cancelled, also mid-request.
     API_KEY = load_api_key()
-    print(f'[DEBUG] Using API_KEY: {API_KEY}')
-    base_url = 'https://www.googleapis.com/youtube/v3/playlistItems'
     params = {
         'part': 'snippet',
         'maxResults': 50,
         'playlistId': playlist_id,
+        'fields': PLAYLIST_ITEMS_FIELDS,
         'key': API_KEY
     }
+    store = get_store()
     nextPageToken = None
     while True:
         if nextPageToken:
             params['pageToken'] = nextPageToken
-            print(f'[DEBUG] Using nextPageToken: {nextPageToken}')
-        print(f'[DEBUG] Sending request to {base_url} with params: {params}')
-        resp = requests.get(base_url, params=params)
-        print(f'[DEBUG] Response status code: {resp.status_code}')
-        if resp.status_code != 200:
-            print(f'[DEBUG] API Error: {resp.text}')
-            return None, f"API Error: {resp.text}"
-        data = resp.json()
-        print(f'[DEBUG] Received data: {json.dumps(data)[:300]}...')
-        for item in data.get('items', []):
-            snippet = item['snippet']
-            video_id = snippet['resourceId']['videoId']
-            title = snippet['title']
-            added_at = snippet['publishedAt']
-            thumbnails = snippet.get('thumbnails', {})
-            thumb_url = thumbnails.get('medium', {}).get('url') or thumbnails.get('default', {}).get('url')
-            print(f'[DEBUG] Appending video: {title} ({video_id})')
-            videos.append({
-                'title': title,
-                'video_id': video_id,
-                'added_at': added_at,
-                'thumbnail': thumb_url
-            })
-        nextPageToken = data.get('nextPageToken')
-        print(f'[DEBUG] nextPageToken for next loop: {nextPageToken}')
+        # Revalidate against the cached copy of this page when we have its ETag
+        cached = store.get_page(playlist_id, nextPageToken)
+        headers = {'If-None-Match': cached['etag']} if cached and cached['etag'] else None
+        try:
+            resp = get_client().get('playlistItems', params, headers=headers, priority=priority, cancel=cancel)
+        except QuotaExceeded as e:
+            log.warning('Quota Error: %s', e)
+            yield None, None, f"Quota Error: {str(e)}"
+            return
+        except requests.RequestException as e:
+            log.warning('API Exception: %s', e)
+            yield None, None, f"API Exception: {str(e)}"
+            return
+        log.debug('playlistItems page %s: status %s', nextPageToken or 'first', resp.status_code)
+        if resp.status_code == 304 and cached:
+            page = cached['page']
+            page_videos = [VideoRecord.from_row(row) for row in page['videos']]
+        elif resp.status_code != 200:
+            log.warning('API Error: %s', resp.text)
+            yield None, None, f"API Error: {resp.text}"
+            return
+        else:
+            data = resp.json()
+            if log.isEnabledFor(TRACE):
+                log.log(TRACE, 'Received data: %s...', json.dumps(data)[:300])
+            page_videos = parse_playlist_items(data)
+            page = {'videos': [v.to_row() for v in page_videos], 'nextPageToken': data.get('nextPageToken'),
+                    'total': data.get('pageInfo', {}).get('totalResults')}
+            etag = resp.headers.get('ETag') or data.get('etag')
+            store.save_page(playlist_id, nextPageToken, etag, page)
+        yield page_videos, page.get('total'), None
+        nextPageToken = page['nextPageToken']
         if not nextPageToken:
             break
-    print(f'[DEBUG] Total videos fetched: {len(videos)}')
+
+def fetch_playlist_items(playlist_id):
+    log.debug('fetch_playlist_items called with playlist_id: %s', playlist_id)
+    videos = []
+    for page_videos, _, error in iter_playlist_pages(playlist_id):
+        if error:
+            return None, error
+        videos.extend(page_videos)
+    log.debug('Total videos fetched: %d', len(videos))
     return videos, None
 
-def sort_videos(videos, ascending=True, by_published=False):
-    print(f'[DEBUG] sort_videos called with ascending={ascending}, by_published={by_published}')
-    if not videos:
-        print('[DEBUG] No videos to sort')
-        return []
-    if by_published:
-        def get_published(x):
-            return x.get('publishedAt') or x.get('added_at')
-        sorted_videos = sorted(videos, key=get_published, reverse=not ascending)
-        print(f'[DEBUG] Sorted {len(sorted_videos)} videos by published time')
-        return sorted_videos
+# Result of sync_playlist_items: the playlist's videos in order, the exact changes against
+# the copy that was stored before, and the fetched_at the store now has for them
+PlaylistSync = namedtuple('PlaylistSync', ['videos', 'added', 'removed', 'fetched_at'])
+
+def is_newest_first(playlist_id):
+    # Channel uploads playlists (UU...) list the newest upload first and only grow at the top
+    return playlist_id.startswith('UU')
+
+def sync_playlist_items(playlist_id, playlist_link=None, on_page=None, cancel=None):
+    # Brings the stored copy of a playlist up to date; returns (PlaylistSync, error).
+    # Newest-first playlists stop paging at the first known video when the counts prove
+    # nothing further down changed; other playlists are walked in full and diffed by video ID.
+    # on_page(page_videos, videos_so_far, total_results) is called as each page arrives.
+    # A cancelled sync raises Cancelled and never writes to the store.
+    store = get_store()
+    stored = store.get_videos(playlist_id) if store.has_videos(playlist_id) else []
+    known = {v.video_id for v in stored}
+    early_stop = bool(known) and is_newest_first(playlist_id)
+    videos = []
+    for pages, (page_videos, total, error) in enumerate(iter_playlist_pages(playlist_id, cancel=cancel), 1):
+        if error:
+            return None, error
+        start = len(videos)
+        videos.extend(page_videos)
+        if on_page is not None:
+            on_page(page_videos, len(videos), total)
+        if not early_stop:
+            continue
+        first_known = next((i for i in range(start, len(videos)) if videos[i].video_id in known), None)
+        if first_known is None:
+            continue
+        # Everything above the first known video is new; with the stored copy intact below it,
+        # stored + new must add up to the total, and any removal would leave it short
+        seen = [v.video_id for v in videos[first_known:]]
+        if total == len(stored) + first_known and seen == [v.video_id for v in stored[:len(seen)]]:
+            if cancel is not None:
+                cancel.raise_if_cancelled()
+            added = videos[:first_known]
+            fetched_at = time.time()
+            if added:
+                store.prepend_videos(playlist_id, added, playlist_link=playlist_link, fetched_at=fetched_at)
+            else:
+                store.update_playlist(playlist_id, playlist_link=playlist_link, fetched_at=fetched_at)
+            log.debug('Synced %s from %d pages: %d added', playlist_id, pages, len(added))
+            return PlaylistSync(added + stored, added, [], fetched_at), None
+        early_stop = False
+    if cancel is not None:
+        cancel.raise_if_cancelled()
+    current = {v.video_id for v in videos}
+    added = [v for v in videos if v.video_id not in known]
+    removed = [v for v in stored if v.video_id not in current]
+    fetched_at = time.time()
+    if [v.to_row() for v in videos] != [v.to_row() for v in stored]:
+        store.save_videos(playlist_id, videos, playlist_link=playlist_link, fetched_at=fetched_at)
     else:
-        sorted_videos = sorted(videos, key=lambda x: x['added_at'], reverse=not ascending)
-        print(f'[DEBUG] Sorted {len(sorted_videos)} videos by added time')
-        return sorted_videos
+        store.update_playlist(playlist_id, playlist_link=playlist_link, fetched_at=fetched_at)
+    log.debug('Synced %s in full: %d added, %d removed', playlist_id, len(added), len(removed))
+    return PlaylistSync(videos, added, removed, fetched_at), None
 
+def count_new_videos(playlist_id, priority=BACKGROUND):
+    # Number of videos in the playlist that are not in its stored copy, told apart by ID;
+    # returns (count, error). Nothing is stored, so the next sync still finds them as added.
+    # Newest-first playlists stop paging at the first stored video, everything new being above it.
+    store = get_store()
+    known = {v.video_id for v in store.get_videos(playlist_id)}
+    newest_first = bool(known) and is_newest_first(playlist_id)
+    count = 0
+    for page_videos, _, error in iter_playlist_pages(playlist_id, priority=priority):
+        if error:
+            return None, error
+        for v in page_videos:
+            if v.video_id in known:
+                if newest_first:
+                    return count, None
+            else:
+                count += 1
+    return count, None
 
-def get_number_of_new_videos(playlist_link):
-    print(f'[DEBUG] get_number_of_new_videos called with playlist_link: {playlist_link}')
-    API_KEY = load_api_key()
-    playlist_id = get_playlist_id(playlist_link)
-    print(f"[DEBUG] Extracted playlist_id: {playlist_id}")
-    if not playlist_id:
-        print("[DEBUG] Invalid playlist link.")
-        return None, "Invalid playlist link."
-    base_url = 'https://www.googleapis.com/youtube/v3/playlistItems'
+PLAYLIST_METADATA_FIELDS = 'items/snippet(title,channelTitle)'
+
+def fetch_playlist_metadata(playlist_id):
+    # Returns (playlist_name, channel_name, error); snippets are served from the client's response cache
     params = {
         'part': 'snippet',
-        'maxResults': 1,
-        'playlistId': playlist_id,
-        'key': API_KEY
+        'id': playlist_id,
+        'fields': PLAYLIST_METADATA_FIELDS,
+        'key': load_api_key()
     }
-    try:
-        print(f'[DEBUG] Sending request to {base_url} with params: {params}')
-        resp = requests.get(base_url, params=params)
-        print(f'[DEBUG] Response status code: {resp.status_code}')
-        if resp.status_code != 200:
-            print(f"[DEBUG] API Error: {resp.text}")
-            return None, f"API Error: {resp.text}"
-        data = resp.json()
-        total = data.get('pageInfo', {}).get('totalResults', None)
-        print(f"[DEBUG] API returned totalResults: {total}")
-        if total is None:
-            print("[DEBUG] Could not retrieve video count.")
-            return None, "Could not retrieve video count."
-    except Exception as e:
-        print(f"[DEBUG] API Exception: {str(e)}")
-        return None, f"API Exception: {str(e)}"
-    memory_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter', 'memory')
-    os.makedirs(memory_dir, exist_ok=True)
-    json_path = os.path.join(memory_dir, f'{playlist_id}.json')
-    stored_count = None
-    if os.path.exists(json_path):
-        try:
-            with open(json_path, 'r', encoding='utf-8') as f:
-                data = json.load(f)
-                stored_count = data.get('no_of_vids', None)
-                print(f"[DEBUG] Loaded stored_count from JSON: {stored_count}")
-        except Exception as e:
-            print(f"[DEBUG] Error reading playlist JSON: {str(e)}")
-            return None, "Error reading playlist JSON."
-    else:
-        print("[DEBUG] JSON file does not exist.")
-    if stored_count is None:
-        print("[DEBUG] No stored video count found in JSON.")
-        return None, "No stored video count found in JSON."
-    new_vids = total - stored_count
-    print(f'[DEBUG] Calculated new_vids: {new_vids}')
-    if new_vids < 0:
-        new_vids = 0
-    return new_vids, None
+    data, error = get_client().get_json('playlists', params)
+    if error:
+        return None, None, error
+    items = data.get('items', [])
+    if not items:
+        return None, None, None
+    snippet = items[0]['snippet']
+    return snippet.get('title'), snippet.get('channelTitle'), None
+
+CHANNEL_ID_FIELDS = 'items/id'
+
+def resolve_channel_handle(handle):
+    # '@handle' (or 'handle') -> channel ID; returns (channel_id, error)
+    handle = handle.lstrip('@')
+    store = get_store()
+    channel_id = store.get_channel_for_handle(handle)
+    if channel_id:
+        return channel_id, None
+    params = {
+        'part': 'id',
+        'forHandle': f'@{handle}',
+        'fields': CHANNEL_ID_FIELDS,
+        'key': load_api_key()
+    }
+    data, error = get_client().get_json('channels', params)
+    if error:
+        return None, error
+    items = data.get('items', [])
+    if not items:
+        return None, None
+    channel_id = items[0]['id']
+    store.save_channel_handle(handle, channel_id)
+    log.debug('Resolved @%s to %s', handle, channel_id)
+    return channel_id, None
+
+def resolve_channel_id(url):
+    # Channel URL in the form https://www.youtube.com/channel/CHANNEL_ID or /@handle -> (channel_id, error)
+    if '/channel/' in url:
+        return url.split('/channel/')[1].split('/')[0], None
+    if '/@' in url:
+        return resolve_channel_handle(url.split('/@')[1].split('/')[0])
+    return None, None
+
+CHANNEL_PLAYLISTS_FIELDS = ('nextPageToken,'
+                            'items(id,snippet(title,thumbnails(medium/url,default/url)),contentDetails/itemCount)')
 
+def parse_channel_playlists(data):
+    playlists = []
+    for item in data.get('items', []):
+        thumbnails = item['snippet'].get('thumbnails', {})
+        thumb_url = thumbnails.get('medium', {}).get('url') or thumbnails.get('default', {}).get('url')
+        playlists.append({
+            'playlist_id': item['id'],
+            'title': item['snippet']['title'],
+            'item_count': item.get('contentDetails', {}).get('itemCount'),
+            'thumbnail': thumb_url,
+        })
+    return playlists
+
+def iter_channel_playlists(channel_id):
+    # Yields (playlists, error) one page at a time so callers can show results as they arrive.
+    # Fresh listings come from the store in a single chunk; fetched ones are stored once complete.
+    store = get_store()
+    cached = store.get_channel_playlists(channel_id, max_age=CHANNEL_PLAYLISTS_TTL)
+    if cached is not None:
+        log.debug('Channel %s: %d playlists from the store', channel_id, len(cached))
+        yield cached, None
+        return
+    playlists = []
+    params = {
+        'part': 'snippet,contentDetails',  # contentDetails adds itemCount at no extra quota cost
+        'maxResults': 50,
+        'channelId': channel_id,
+        'fields': CHANNEL_PLAYLISTS_FIELDS,
+        'key': load_api_key()
+    }
+    nextPageToken = None
+    while True:
+        if nextPageToken:
+            params['pageToken'] = nextPageToken
+        data, error = get_client().get_json('playlists', params)
+        if error:
+            yield None, error
+            return
+        page = parse_channel_playlists(data)
+        playlists.extend(page)
+        yield page, None
+        nextPageToken = data.get('nextPageToken')
+        if not nextPageToken:
+            break
+    store.save_channel_playlists(channel_id, playlists)
+
+
+PLAYLISTS_PER_REQUEST = 50  # playlists.list accepts at most 50 IDs per call
+PLAYLIST_COUNTS_FIELDS = 'items(id,contentDetails/itemCount)'
+
+def fetch_playlist_item_counts(playlist_ids, api_key, priority=BACKGROUND):
+    # One playlists.list call for up to 50 playlists; returns ({playlist_id: itemCount}, error)
+    params = {
+        'part': 'contentDetails',
+        'id': ','.join(playlist_ids),
+        'maxResults': PLAYLISTS_PER_REQUEST,
+        'fields': PLAYLIST_COUNTS_FIELDS,
+        'key': api_key
+    }
+    data, error = get_client().get_json('playlists', params, priority=priority)
+    if error:
+        return None, error
+    return {item['id']: item['contentDetails']['itemCount'] for item in data.get('items', [])}, None
+
+def iter_playlist_item_counts(playlist_ids):
+    # Runs the batches concurrently and yields (batch_ids, counts, error) as each one completes
+    log.debug('iter_playlist_item_counts called for %d playlists', len(playlist_ids))
+    API_KEY = load_api_key()
+    client = get_client()
+    batches = [playlist_ids[i:i + PLAYLISTS_PER_REQUEST] for i in range(0, len(playlist_ids), PLAYLISTS_PER_REQUEST)]
+    futures = {client.submit(fetch_playlist_item_counts, batch, API_KEY): batch for batch in batches}
+    for future in as_completed(futures):
+        counts, error = future.result()
+        yield futures[future], counts, error
@@ -1,71 +1,320 @@
 import os
-import requests
-import json
+import time
 from dotenv import load_dotenv
-from PyQt5.QtCore import QThread, pyqtSignal
 from PyQt5.QtWidgets import (
-    QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QTextBrowser, QRadioButton, QButtonGroup, QMessageBox, QSizePolicy, QTabWidget,
-    QScrollArea, QHBoxLayout, QFrame, QSpacerItem
+    QApplication, QWidget, QVBoxLayout, QLabel, QLineEdit, QPushButton, QRadioButton, QButtonGroup, QMessageBox, QSizePolicy, QTabWidget,
+    QScrollArea, QHBoxLayout, QFrame, QSpacerItem, QCheckBox
 )
-from PyQt5.QtCore import Qt
+from PyQt5.QtCore import Qt, QTimer
 import sys
 
-# Import link colors from config.py
-from config import CLICKED_LINK_COLOR, UNCLICKED_LINK_COLOR
+from config import SEARCH_RESULT_LIMIT
 from PyQt5.QtCore import QSize
-from PyQt5.QtGui import QFontMetrics
-
-from helpers import get_config_path, save_api_key, load_api_key, get_playlist_id, fetch_playlist_items, sort_videos, get_number_of_new_videos
-
-
-API_KEY = load_api_key()
-
-
-# Worker thread for fetching playlist items
-class FetchPlaylistWorker(QThread):
-    finished = pyqtSignal(list, object)  # videos, error
-    def __init__(self, playlist_id):
+from PyQt5.QtGui import QFontMetrics, QPixmap
+
+from api_client import get_client
+from quota import get_scheduler
+from app_logging import get_logger, setup_logging
+from playlist_store import get_store
+from enrichment import enrich_videos
+from video_list_view import VideoListView, ThumbnailLoader, ThumbnailSignals, get_thumbnail_pool
+from thumbnail_cache import get_thumbnail_cache
+from sort_index import SortIndex, SORT_KEYS
+from tasks import run_task, cancel_all_tasks
+from watched_journal import get_watched_journal
+from poller import AdaptivePoller, check_new_videos
+from snapshot import load_playlist_videos, save_playlist_snapshot
+from helpers import get_config_path, save_api_key, load_api_key, get_playlist_id, sync_playlist_items, fetch_playlist_metadata, resolve_channel_id, iter_channel_playlists
+
+
+log = get_logger('main_app')
+
+CHANNEL_THUMB_WIDTH = 160
+CHANNEL_THUMB_HEIGHT = 90
+
+# Typing pause before the title filter runs
+FILTER_DEBOUNCE_MS = 150
+
+# How often pages streamed in by a fetch are merged into the shown list
+STREAM_REFRESH_MS = 250
+
+SORT_OPTIONS = [
+    ('added', 'Sort by Added Time'),
+    ('published', 'Sort by Published Time'),
+    ('title', 'Sort by Title'),
+    ('duration', 'Sort by Duration'),
+    ('views', 'Sort by Views'),
+]
+
+
+# Task functions; these run on the shared pool through tasks.run_task
+def fetch_and_store_playlist(playlist_id, url, progress, cancel):
+    # Syncs the stored copy and returns (videos, number of videos added since the last fetch,
+    # or None on the first fetch, the fetched_at they were stored with). Each page is also reported through progress as
+    # (page_videos, videos_so_far, total_results) while the sync runs. A superseded fetch is
+    # cancelled; it stops at its next request or step.
+    had_videos = get_store().has_videos(playlist_id)
+    sync, error = sync_playlist_items(playlist_id, playlist_link=url,
+                                      on_page=lambda page, done, total: progress((page, done, total)),
+                                      cancel=cancel)
+    if error:
+        return None, error
+    return (sync.videos, len(sync.added) if had_videos else None, sync.fetched_at), None
+
+
+def enrich_and_snapshot_playlist(playlist_id, videos, fetched_at, cancel):
+    # Runs after the fetched list is shown: background-priority detail requests are paced,
+    # so the user is not kept waiting on them. Fills in the VideoRecords and returns them.
+    # Cancelled when another playlist or a refresh is requested, before anything is written.
+    videos, error = enrich_videos(videos, cancel=cancel)
+    if error:
+        # A failed batch only loses those fields
+        log.warning('Video details enrichment failed: %s', error)
+    cancel.raise_if_cancelled()
+    # Reopening this playlist later maps the snapshot instead of reading rows
+    save_playlist_snapshot(playlist_id, videos, fetched_at)
+    return videos, None
+
+
+def enrich_stored_playlist(playlist_id, videos, fetched_at, cancel):
+    # The same for a playlist read from the store, whose details may never have been fetched
+    # (an enrichment cut short by an error, a cancel or closing the app). Returns None when
+    # every video already has stored details, without touching the snapshot.
+    video_ids = list(dict.fromkeys(v.video_id for v in videos))
+    if len(get_store().get_video_details(video_ids)) == len(video_ids):
+        return None, None
+    # A snapshot sorts by its own columns, so the enriched records are handed back as a list
+    return enrich_and_snapshot_playlist(playlist_id, list(videos), fetched_at, cancel)
+
+
+def stream_channel_playlists(url, progress):
+    # Resolves the channel, then reports its playlists through progress one page at a time.
+    # Returns the number of playlists, or None when the URL does not resolve to a channel.
+    channel_id, error = resolve_channel_id(url)
+    if error or not channel_id:
+        return None, error
+    count = 0
+    for page, error in iter_channel_playlists(channel_id):
+        if error:
+            return None, error
+        count += len(page)
+        progress(page)
+    return count, None
+
+
+def elide_label(label, full_text, max_width):
+    fm = QFontMetrics(label.font())
+    elided = fm.elidedText(full_text, Qt.ElideRight, max_width)
+    label.setText(elided)
+
+
+# Shared by every ViewedPlaylistCard; set once on the container instead of parsed per card
+VIEWED_CARD_STYLE = '''
+    ViewedPlaylistCard {
+        background: #f5f7fa;
+        border-radius: 8px;
+        margin: 4px;
+        padding: 8px;
+        border: 1px solid #e0e0e0;
+    }
+    ViewedPlaylistCard QLabel {
+        border: none;
+        margin: 0px;
+        padding: 0px;
+    }
+    QLabel#vidCount { font-size: 20px; font-weight: bold; color: #222; }
+    QLabel#vidLabel { font-size: 12px; color: #888; }
+    QLabel#newVidsCount { font-size: 20px; font-weight: bold; color: #8d5524; }
+    QLabel#newVidsLabel { font-size: 12px; color: #8d5524; }
+    QLabel#channelCaption { font-size: 11px; color: #888; margin: 0px; }
+    QLabel#channelName { font-size: 17px; font-weight: bold; color: #222; margin: 0px; }
+    QLabel#playlistCaption { font-size: 11px; color: #888; margin: 0px; }
+    QLabel#playlistName { font-size: 17px; font-weight: bold; color: #222; margin: 0px; }
+    QPushButton#checkButton {
+        background: #a0522d;
+        color: #fff;
+        border-radius: 4px;
+        font-weight: bold;
+        font-size: 15px;
+        border: none;
+    }
+    QPushButton#checkButton:hover {
+        background: #c68642;
+    }
+    QPushButton#loadButton {
+        background: #4f8cff;
+        color: white;
+        border-radius: 4px;
+        font-weight: bold;
+        font-size: 15px;
+        border: none;
+    }
+    QPushButton#loadButton:hover {
+        background: #357ae8;
+    }
+'''
+
+
+# One card on the Viewed Playlists tab; kept across tab switches and refreshed in place
+class ViewedPlaylistCard(QFrame):
+    def __init__(self, window):
         super().__init__()
-        self.playlist_id = playlist_id
-    def run(self):
-        videos, error = fetch_playlist_items(self.playlist_id)
-        # Ensure videos is always a list for signal emit
-        if videos is None:
-            videos = []
-        self.finished.emit(videos, error)
+        self.playlist_id = None
+        self.playlist_link = None
+        self.ch_name_text = ''
+        self.pl_name_text = ''
+        self._shown = None
+        self.setFrameShape(QFrame.StyledPanel)
+        self.setFixedHeight(80)
+        self.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
+
+        main_layout = QHBoxLayout()
+        main_layout.setContentsMargins(0, 0, 0, 0)
+        main_layout.setSpacing(0)
+
+        # Left section: Video count
+        vid_count_widget = QWidget()
+        vid_count_widget.setFixedSize(60, 60)
+        vid_count_layout = QVBoxLayout()
+        vid_count_layout.setContentsMargins(0, 0, 0, 0)
+        vid_count_layout.setSpacing(0)
+        self.vid_count = vid_count = QLabel('')
+        vid_count.setObjectName('vidCount')
+        vid_count.setAlignment(Qt.AlignCenter)
+        vid_label = QLabel("videos")
+        vid_label.setObjectName('vidLabel')
+        vid_label.setAlignment(Qt.AlignCenter)
+        vid_count_layout.addWidget(vid_count)
+        vid_count_layout.addWidget(vid_label)
+        vid_count_widget.setLayout(vid_count_layout)
+        main_layout.addWidget(vid_count_widget)
+
+        # Dynamic spacer 1
+        main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        # New section: new vids count (hidden initially)
+        self.new_vids_widget = new_vids_widget = QWidget()
+        new_vids_widget.setFixedSize(60, 60)
+        new_vids_layout = QVBoxLayout()
+        new_vids_layout.setContentsMargins(0, 0, 0, 0)
+        new_vids_layout.setSpacing(0)
+        self.new_vids_count_label = new_vids_count_label = QLabel("")
+        new_vids_count_label.setObjectName('newVidsCount')
+        new_vids_count_label.setAlignment(Qt.AlignCenter)
+        new_vids_label = QLabel("new vids")
+        new_vids_label.setObjectName('newVidsLabel')
+        new_vids_label.setAlignment(Qt.AlignCenter)
+        new_vids_layout.addWidget(new_vids_count_label)
+        new_vids_layout.addWidget(new_vids_label)
+        new_vids_widget.setLayout(new_vids_layout)
+        new_vids_widget.setVisible(False)
+        main_layout.addWidget(new_vids_widget)
+
+        # Dynamic spacer 2
+        main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        # Second section: Channel info
+        ch_widget = QWidget()
+        ch_widget.setFixedWidth(150)  # Fixed width for alignment
+        ch_layout = QVBoxLayout()
+        ch_layout.setContentsMargins(0, 0, 0, 0)
+        ch_layout.setSpacing(0)
+        ch_label = QLabel("channel name")
+        ch_label.setObjectName('channelCaption')
+        ch_label.setAlignment(Qt.AlignLeft)
+        self.ch_name = ch_name = QLabel('')
+        ch_name.setObjectName('channelName')
+        ch_name.setAlignment(Qt.AlignLeft)
+        ch_layout.addWidget(ch_label)
+        ch_layout.addWidget(ch_name)
+        ch_widget.setLayout(ch_layout)
+        main_layout.addWidget(ch_widget)
+
+        # Dynamic spacer 3
+        main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        # Third section: Playlist info
+        pl_widget = QWidget()
+        pl_widget.setFixedWidth(150)  # Fixed width for alignment
+        pl_layout = QVBoxLayout()
+        pl_layout.setContentsMargins(0, 0, 0, 0)
+        pl_layout.setSpacing(0)
+        pl_label = QLabel("playlist name")
+        pl_label.setObjectName('playlistCaption')
+        pl_label.setAlignment(Qt.AlignLeft)
+        self.pl_name = pl_name = QLabel('')
+        pl_name.setObjectName('playlistName')
+        pl_name.setAlignment(Qt.AlignLeft)
+        pl_layout.addWidget(pl_label)
+        pl_layout.addWidget(pl_name)
+        pl_widget.setLayout(pl_layout)
+        main_layout.addWidget(pl_widget)
+
+        # Dynamic spacer 4
+        main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        # New brown check button
+        check_btn = QPushButton("check")
+        check_btn.setFixedSize(80, 30)
+        check_btn.setObjectName('checkButton')
+
+        check_btn.clicked.connect(lambda: window.check_playlists([self.playlist_id]))
+        main_layout.addWidget(check_btn)
+
+        # Dynamic spacer 5
+        main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
+
+        # Right section: Load button
+        btn = QPushButton("Load to sorter")
+        btn.setFixedSize(120, 30)
+        btn.setObjectName('loadButton')
+        btn.clicked.connect(lambda: window.load_playlist_to_sorter(self.playlist_link))
+        main_layout.addWidget(btn)
+
+        self.setLayout(main_layout)
 
+    def update_from(self, p):
+        # Labels are only touched when the summary shown on the card changed
+        self.playlist_id = p['playlist_id']
+        self.playlist_link = p.get('playlist_link')
+        shown = (p.get('no_of_vids'), p.get('channel_name'), p.get('playlist_name'), p.get('new_vids_count'))
+        if shown == self._shown:
+            return
+        self._shown = shown
+        if p.get('new_vids_count') is not None:
+            self.new_vids_count_label.setText(str(p['new_vids_count']))
+            self.new_vids_widget.setVisible(True)
+        self.vid_count.setText(str(p['no_of_vids'] if p.get('no_of_vids') is not None else 'N/A'))
+        self.ch_name_text = p.get('channel_name') or 'Unknown Channel'
+        self.ch_name.setToolTip(self.ch_name_text)
+        self.pl_name_text = p.get('playlist_name') or 'Unknown Playlist'
+        self.pl_name.setToolTip(self.pl_name_text)
+        self.update_eliding()
+
+    def show_check_status(self, text):
+        # A check in progress or without a count; the next update_from redraws the card
+        self.new_vids_count_label.setText(text)
+        self.new_vids_widget.setVisible(True)
+        self._shown = None
+
+    def update_eliding(self):
+        # Fonts come from the container's style sheet, so polish before measuring
+        self.ch_name.ensurePolished()
+        self.pl_name.ensurePolished()
+        elide_label(self.ch_name, self.ch_name_text, 140)
+        # Use the actual width of the label, fallback to 140 if not available
+        w = self.pl_name.width() if self.pl_name.width() > 10 else 140
+        elide_label(self.pl_name, self.pl_name_text, w)
 
-# Worker thread for loading a thumbnail image
-class ThumbnailLoader(QThread):
-    loaded = pyqtSignal(object, object)  # (QLabel, QPixmap)
-    def __init__(self, url, label, width, height):
-        super().__init__()
-        self.url = url
-        self.label = label
-        self.width = width
-        self.height = height
-    def run(self):
-        try:
-            import requests
-            from PyQt5.QtGui import QPixmap
-            resp = requests.get(self.url, timeout=5)
-            if resp.status_code == 200:
-                pixmap = QPixmap()
-                pixmap.loadFromData(resp.content)
-                scaled = pixmap.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
-                self.loaded.emit(self.label, scaled)
-        except Exception:
-            pass
 
 class PlaylistSorterQt(QWidget):
     def closeEvent(self, event):
-        # Delete the playlist video cache file on app close
-        cache_path = os.path.join(os.path.dirname(__file__), 'playlist_videos_cache.json')
-        if os.path.exists(cache_path):
-            try:
-                os.remove(cache_path)
-            except Exception:
-                pass
+        # Running fetches stop at their next request instead of reporting to a closed window
+        cancel_all_tasks()
+        self.result_view.video_model.clear()
+        log.info('API latency stats: %s', get_client().latency_stats())
+        log.info('API quota usage: %s', get_scheduler().usage())
+        get_watched_journal().close()
         event.accept()
 
 
@@ -113,54 +362,31 @@ class PlaylistSorterQt(QWidget):
         sort_config_outer_layout.setSpacing(12)
         sort_config_outer_layout.setContentsMargins(4, 2, 4, 2)
 
-        # Added time group (left)
-        added_time_group = QFrame()
-        added_time_group.setStyleSheet('QFrame { background: transparent; }')
-        added_time_layout = QVBoxLayout(added_time_group)
-        added_time_layout.setSpacing(2)
-        added_time_layout.setContentsMargins(2, 2, 2, 2)
-        added_time_group_label = QLabel('Sort by Added Time')
-        added_time_layout.addWidget(added_time_group_label)
-        added_time_radio_layout = QHBoxLayout()
-        added_time_radio_layout.setSpacing(2)
-        added_time_radio_layout.setContentsMargins(0, 0, 0, 0)
-        self.radio_added_asc = QRadioButton('Ascending')
-        self.radio_added_desc = QRadioButton('Descending')
-        added_time_radio_layout.addWidget(self.radio_added_asc)
-        added_time_radio_layout.addWidget(self.radio_added_desc)
-        added_time_layout.addLayout(added_time_radio_layout)
-        added_time_group.setLayout(added_time_layout)
-
-        # Published time group (right)
-        published_time_group = QFrame()
-        published_time_group.setStyleSheet('QFrame { background: transparent; }')
-        published_time_layout = QVBoxLayout(published_time_group)
-        published_time_layout.setSpacing(2)
-        published_time_layout.setContentsMargins(2, 2, 2, 2)
-        published_time_group_label = QLabel('Sort by Published Time')
-        published_time_layout.addWidget(published_time_group_label)
-        published_time_radio_layout = QHBoxLayout()
-        published_time_radio_layout.setSpacing(2)
-        published_time_radio_layout.setContentsMargins(0, 0, 0, 0)
-        self.radio_published_asc = QRadioButton('Ascending')
-        self.radio_published_desc = QRadioButton('Descending')
-        published_time_radio_layout.addWidget(self.radio_published_asc)
-        published_time_radio_layout.addWidget(self.radio_published_desc)
-        published_time_layout.addLayout(published_time_radio_layout)
-        published_time_group.setLayout(published_time_layout)
-
-        # Add both groups side by side
-        sort_config_outer_layout.addWidget(added_time_group)
-        sort_config_outer_layout.addWidget(published_time_group)
-
-        # Button groups for exclusivity
+        # One group per sort key, side by side; ascending/descending radios share one exclusive group
         self.sort_radio_group = QButtonGroup(self)
         self.sort_radio_group.setExclusive(True)
-        self.sort_radio_group.addButton(self.radio_added_asc)
-        self.sort_radio_group.addButton(self.radio_added_desc)
-        self.sort_radio_group.addButton(self.radio_published_asc)
-        self.sort_radio_group.addButton(self.radio_published_desc)
+        self.sort_radios = {}
+        for key, label in SORT_OPTIONS:
+            group = QFrame()
+            group.setStyleSheet('QFrame { background: transparent; }')
+            group_layout = QVBoxLayout(group)
+            group_layout.setSpacing(2)
+            group_layout.setContentsMargins(2, 2, 2, 2)
+            group_layout.addWidget(QLabel(label))
+            radio_layout = QHBoxLayout()
+            radio_layout.setSpacing(2)
+            radio_layout.setContentsMargins(0, 0, 0, 0)
+            for ascending, text in ((True, 'Ascending'), (False, 'Descending')):
+                radio = QRadioButton(text)
+                radio_layout.addWidget(radio)
+                self.sort_radio_group.addButton(radio)
+                self.sort_radios[radio] = (key, ascending)
+                setattr(self, f"radio_{key}_{'asc' if ascending else 'desc'}", radio)
+            group_layout.addLayout(radio_layout)
+            sort_config_outer_layout.addWidget(group)
         self.radio_added_asc.setChecked(True)
+        # Changing the sort mode re-orders the loaded playlist in place, without a fetch
+        self.sort_radio_group.buttonToggled.connect(self.on_sort_mode_changed)
 
         # Remove logic that disables other sorting options when one is chosen.
         # QButtonGroup with setExclusive(True) already ensures only one can be selected at a time.
@@ -182,8 +408,27 @@ class PlaylistSorterQt(QWidget):
                 background: #4f8cff;
             }
         ''')
-        self.sort_button.clicked.connect(self.sort_playlist)
-        tab1_layout.addWidget(self.sort_button)
+        self.sort_button.clicked.connect(lambda: self.sort_playlist())
+        self.refresh_button = QPushButton('Refresh from YouTube')
+        self.refresh_button.setFixedHeight(32)
+        self.refresh_button.setStyleSheet('''
+            QPushButton {
+                background: #eaf6ff;
+                color: #357ae8;
+                border-radius: 6px;
+                font-weight: bold;
+                font-size: 15px;
+                border: 1px solid #b3d8ff;
+            }
+            QPushButton:hover {
+                background: #d6ecff;
+            }
+        ''')
+        self.refresh_button.clicked.connect(lambda: self.sort_playlist(force_refresh=True))
+        sort_buttons_layout = QHBoxLayout()
+        sort_buttons_layout.addWidget(self.sort_button, 4)
+        sort_buttons_layout.addWidget(self.refresh_button, 1)
+        tab1_layout.addLayout(sort_buttons_layout)
         self.new_vids_card = QFrame()
         self.new_vids_card.setVisible(False)
         self.new_vids_card.setStyleSheet('''
@@ -201,13 +446,60 @@ class PlaylistSorterQt(QWidget):
         self.new_vids_layout = QVBoxLayout()
         self.new_vids_card.setLayout(self.new_vids_layout)
         tab1_layout.addWidget(self.new_vids_card)
-        self.result_scroll = QScrollArea()
-        self.result_scroll.setWidgetResizable(True)
-        self.result_widget = QWidget()
-        self.result_layout = QVBoxLayout()
-        self.result_widget.setLayout(self.result_layout)
-        self.result_scroll.setWidget(self.result_widget)
-        tab1_layout.addWidget(self.result_scroll)
+        # Loading animation shown while fetching or resorting
+        self.loading_frame = QFrame()
+        loading_layout = QVBoxLayout()
+        loading_layout.setAlignment(Qt.AlignCenter)
+        self.loading_frame.setLayout(loading_layout)
+        self.loading_icon = QLabel()
+        self.loading_icon.setAlignment(Qt.AlignCenter)
+        self.loading_icon.setFixedSize(64, 64)
+        loading_layout.addWidget(self.loading_icon, alignment=Qt.AlignCenter)
+        self.loading_text = QLabel()
+        self.loading_text.setAlignment(Qt.AlignCenter)
+        self.loading_text.setStyleSheet('font-size:32px; color:#04044b; margin-top:18px; font-weight:bold;')
+        loading_layout.addWidget(self.loading_text)
+        self.loading_frame.setVisible(False)
+        tab1_layout.addWidget(self.loading_frame)
+        # Filter-as-you-type over video titles, answered by the store's full-text index
+        filter_layout = QHBoxLayout()
+        self.filter_entry = QLineEdit()
+        self.filter_entry.setPlaceholderText('Filter videos by title...')
+        self.filter_entry.setClearButtonEnabled(True)
+        self.filter_entry.setStyleSheet('font-size:15px; padding:6px 10px; border-radius:6px; border:1.5px solid #d0d0d0;')
+        filter_layout.addWidget(self.filter_entry, 1)
+        self.filter_all_checkbox = QCheckBox('All playlists')
+        self.filter_all_checkbox.setStyleSheet('font-size:15px;')
+        filter_layout.addWidget(self.filter_all_checkbox)
+        tab1_layout.addLayout(filter_layout)
+        self.filter_timer = QTimer(self)
+        self.filter_timer.setSingleShot(True)
+        self.filter_timer.setInterval(FILTER_DEBOUNCE_MS)
+        self.filter_timer.timeout.connect(self.apply_filter)
+        self.filter_entry.textChanged.connect(lambda _: self.filter_timer.start())
+        self.filter_all_checkbox.toggled.connect(lambda _: self.apply_filter())
+        self._filter_ids = None        # video IDs matching the filter in the loaded playlist
+        self._search_index = None      # SortIndex over matches from every playlist
+        self._search_playlists = {}    # video link -> playlist ID for those matches
+        self._search_clicked = set()
+
+        # Each sort request bumps the generation and cancels the fetch it supersedes;
+        # results of older generations are dropped
+        self._fetch_generation = 0
+        self._fetch_task = None
+        self._enrich_task = None
+
+        # While a fetch streams in, arrived pages are merged into the list on this timer
+        self._stream = None
+        self.stream_timer = QTimer(self)
+        self.stream_timer.setSingleShot(True)
+        self.stream_timer.setInterval(STREAM_REFRESH_MS)
+        self.stream_timer.timeout.connect(self.flush_stream)
+
+        # Virtualized result list: only visible cards are painted
+        self.result_view = VideoListView()
+        self.result_view.video_delegate.linkActivated.connect(self.on_video_link_activated)
+        tab1_layout.addWidget(self.result_view)
         tab1.setLayout(tab1_layout)
         self.tabs.addTab(tab1, "Sort Playlist")
 
@@ -240,11 +532,23 @@ class PlaylistSorterQt(QWidget):
         ''')
         self.channel_button.clicked.connect(self.list_channel_playlists)
         tab2_layout.addWidget(self.channel_button)
-        self.channel_result_box = QTextBrowser()
-        self.channel_result_box.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
-        tab2_layout.addWidget(self.channel_result_box)
-        self.channel_result_box.setOpenExternalLinks(False)
-        self.channel_result_box.anchorClicked.connect(self.open_link)
+        self.channel_status = QLabel('')
+        self.channel_status.setStyleSheet('font-size:15px; color:#555;')
+        tab2_layout.addWidget(self.channel_status)
+        # One scroll area for every search; cards are appended page by page as they arrive
+        self.channel_result_scroll = QScrollArea()
+        self.channel_result_scroll.setWidgetResizable(True)
+        self.channel_result_scroll.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Expanding)
+        channel_result_container = QWidget()
+        self.channel_result_layout = QVBoxLayout(channel_result_container)
+        self.channel_result_layout.setAlignment(Qt.AlignTop)
+        self.channel_result_scroll.setWidget(channel_result_container)
+        tab2_layout.addWidget(self.channel_result_scroll)
+        self._channel_search = 0
+        self._channel_count = 0
+        self._channel_thumb_labels = {}
+        self._channel_thumb_signals = ThumbnailSignals()
+        self._channel_thumb_signals.loaded.connect(self.on_channel_thumbnail_loaded)
         tab2.setLayout(tab2_layout)
         self.tabs.addTab(tab2, "Channel Playlists")
 
@@ -256,6 +560,7 @@ class PlaylistSorterQt(QWidget):
         self.viewed_container = QWidget()
         self.viewed_layout = QVBoxLayout()
         self.viewed_container.setLayout(self.viewed_layout)
+        self.viewed_container.setStyleSheet(VIEWED_CARD_STYLE)
         self.viewed_scroll.setWidget(self.viewed_container)
         tab3_layout.addWidget(self.viewed_scroll)
         tab3.setLayout(tab3_layout)
@@ -334,6 +639,12 @@ class PlaylistSorterQt(QWidget):
         self.api_key_status.setAlignment(Qt.AlignCenter)
         card_layout.addWidget(self.api_key_status)
 
+        # Quota units spent today, as counted by the request scheduler
+        self.quota_label = QLabel("")
+        self.quota_label.setStyleSheet('font-size:15px; color:#555; margin-bottom:8px;')
+        self.quota_label.setAlignment(Qt.AlignCenter)
+        card_layout.addWidget(self.quota_label)
+
         # Instructions box
         instructions_box = QFrame()
         instructions_box.setStyleSheet('''
@@ -381,6 +692,10 @@ class PlaylistSorterQt(QWidget):
         # For tracking current playlist and clicked links
         self.current_playlist_id = None
         self.clicked_links = set()
+        self._viewed_header = None
+        self._viewed_cards_by_id = {}
+        self._viewed_synced_at = None
+        self._viewed_fingerprint = None
 
         # Load API key from config
         self.api_key_entry.setText(load_api_key() or "")
@@ -392,6 +707,14 @@ class PlaylistSorterQt(QWidget):
         # Connect tab change to refresh viewed playlists
         self.tabs.currentChanged.connect(self.on_tab_changed)
 
+        self.update_quota_label()
+
+        # Tracked playlists are checked in the background, so counts are ready before the tab is opened
+        self.poller = AdaptivePoller(self)
+        self.poller.checked.connect(lambda res: self.on_poll_result(*res))
+        if load_api_key():
+            self.poller.start()
+
         # If no API key, go to Configurations tab and show error
         if not load_api_key():
             self.tabs.setCurrentIndex(3)  # Configurations tab
@@ -403,38 +726,43 @@ class PlaylistSorterQt(QWidget):
             self.api_key_status.setText("<b style='color:#d32f2f;'>API Key cannot be empty.</b>")
             return
         save_api_key(key)
-        global API_KEY
-        API_KEY = key
+        self.poller.start()
         self.api_key_status.setText("<b style='color:#388e3c;'>API Key saved! You can now use all features.</b>")
 
     def on_tab_changed(self, idx):
         # If viewed playlists tab is selected, refresh
         if self.tabs.tabText(idx) == "Viewed Playlists":
             self.load_viewed_playlists()
+        elif self.tabs.tabText(idx) == "Configurations":
+            self.update_quota_label()
+
+    def update_quota_label(self):
+        usage = get_scheduler().usage()
+        self.quota_label.setText(f"API quota used today: {usage['used']} / {usage['budget']} units ({usage['remaining']} left)")
 
     def load_viewed_playlists(self):
-        # Clear layout
-        while self.viewed_layout.count():
-            item = self.viewed_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        # Scan memory folder for playlist JSONs
-        memory_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter', 'memory')
-        os.makedirs(memory_dir, exist_ok=True)
-        if not os.path.exists(memory_dir):
+        # Only playlists saved since the last call are read; their cards are updated in
+        # place (or created) and moved to the end, keeping the list ordered by last update
+        store = get_store()
+        if self._viewed_header is None:
+            self.build_viewed_header()
+        fingerprint = store.playlists_fingerprint()
+        if fingerprint == self._viewed_fingerprint:
             return
-        files = [f for f in os.listdir(memory_dir) if f.endswith('.json')]
-        playlists = []
-        for fname in files:
-            try:
-                with open(os.path.join(memory_dir, fname), 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    playlists.append(data)
-            except Exception:
-                continue
+        for p in store.list_playlists(updated_after=self._viewed_synced_at):
+            card = self._viewed_cards_by_id.get(p['playlist_id'])
+            if card is None:
+                card = ViewedPlaylistCard(self)
+                self._viewed_cards_by_id[p['playlist_id']] = card
+            else:
+                self.viewed_layout.removeWidget(card)
+            self.viewed_layout.addWidget(card)
+            card.update_from(p)
+            self._viewed_synced_at = max(self._viewed_synced_at or 0, p['updated_at'] or 0)
+        self._viewed_fingerprint = fingerprint
 
-        # Add 'check all' button at the top
+    def build_viewed_header(self):
+        # 'check all' button at the top
         check_all_btn = QPushButton("check all")
         check_all_btn.setFixedSize(100, 32)
         check_all_btn.setStyleSheet('''
@@ -452,391 +780,125 @@ class PlaylistSorterQt(QWidget):
             }
         ''')
         self.viewed_layout.addWidget(check_all_btn)
+        # 'check all' checks every card in batches of 50 playlists per request
+        check_all_btn.clicked.connect(lambda: self.check_playlists(list(self._viewed_cards_by_id)))
+        self._viewed_header = check_all_btn
 
         # Make cards start from the top
         self.viewed_layout.setAlignment(Qt.AlignTop)
-        # Get available width for playlist name eliding
-
-        def elide_label(label, full_text, max_width):
-            fm = QFontMetrics(label.font())
-            elided = fm.elidedText(full_text, Qt.ElideRight, max_width)
-            label.setText(elided)
-
-        self._viewed_cards = []  # Store card/pl_name for resize event
-        self._check_btns = []    # Store check buttons for 'check all'
-        for p in playlists:
-            card = QFrame()
-            card.setFrameShape(QFrame.StyledPanel)
-            card.setFixedHeight(80)
-            card.setSizePolicy(QSizePolicy.Expanding, QSizePolicy.Fixed)
-            card.setStyleSheet('''
-                QFrame {
-                    background: #f5f7fa;
-                    border-radius: 8px;
-                    margin: 4px;
-                    padding: 8px;
-                    border: 1px solid #e0e0e0;
-                }
-                QLabel {
-                    border: none;
-                    margin: 0px;
-                    padding: 0px;
-                }
-            ''')
-
-            main_layout = QHBoxLayout()
-            main_layout.setContentsMargins(0, 0, 0, 0)
-            main_layout.setSpacing(0)
-
-            # Left section: Video count
-            vid_count_widget = QWidget()
-            vid_count_widget.setFixedSize(60, 60)
-            vid_count_layout = QVBoxLayout()
-            vid_count_layout.setContentsMargins(0, 0, 0, 0)
-            vid_count_layout.setSpacing(0)
-            vid_count = QLabel(str(p.get('no_of_vids', 'N/A')))
-            vid_count.setStyleSheet('font-size: 20px; font-weight: bold; color: #222;')
-            vid_count.setAlignment(Qt.AlignCenter)
-            vid_label = QLabel("videos")
-            vid_label.setStyleSheet('font-size: 12px; color: #888;')
-            vid_label.setAlignment(Qt.AlignCenter)
-            vid_count_layout.addWidget(vid_count)
-            vid_count_layout.addWidget(vid_label)
-            vid_count_widget.setLayout(vid_count_layout)
-            main_layout.addWidget(vid_count_widget)
-
-            # Dynamic spacer 1
-            main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
-
-            # New section: new vids count (hidden initially)
-            new_vids_widget = QWidget()
-            new_vids_widget.setFixedSize(60, 60)
-            new_vids_layout = QVBoxLayout()
-            new_vids_layout.setContentsMargins(0, 0, 0, 0)
-            new_vids_layout.setSpacing(0)
-            new_vids_count_label = QLabel("")
-            new_vids_count_label.setStyleSheet('font-size: 20px; font-weight: bold; color: #8d5524;')
-            new_vids_count_label.setAlignment(Qt.AlignCenter)
-            new_vids_label = QLabel("new vids")
-            new_vids_label.setStyleSheet('font-size: 12px; color: #8d5524;')
-            new_vids_label.setAlignment(Qt.AlignCenter)
-            new_vids_layout.addWidget(new_vids_count_label)
-            new_vids_layout.addWidget(new_vids_label)
-            new_vids_widget.setLayout(new_vids_layout)
-            new_vids_widget.setVisible(False)
-            main_layout.addWidget(new_vids_widget)
-
-            # Dynamic spacer 2
-            main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
-
-            # Second section: Channel info
-            ch_widget = QWidget()
-            ch_widget.setFixedWidth(150)  # Fixed width for alignment
-            ch_layout = QVBoxLayout()
-            ch_layout.setContentsMargins(0, 0, 0, 0)
-            ch_layout.setSpacing(0)
-            ch_label = QLabel("channel name")
-            ch_label.setStyleSheet('font-size: 11px; color: #888; margin: 0px;')
-            ch_label.setAlignment(Qt.AlignLeft)
-            ch_name_text = p.get('channel_name', 'Unknown Channel')
-            ch_name = QLabel(ch_name_text)
-            ch_name.setStyleSheet('font-size: 17px; font-weight: bold; color: #222; margin: 0px;')
-            ch_name.setAlignment(Qt.AlignLeft)
-            elide_label(ch_name, ch_name_text, 140)
-            ch_name.setToolTip(ch_name_text)
-            ch_layout.addWidget(ch_label)
-            ch_layout.addWidget(ch_name)
-            ch_widget.setLayout(ch_layout)
-            main_layout.addWidget(ch_widget)
-
-            # Dynamic spacer 3
-            main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
-
-            # Third section: Playlist info
-            pl_widget = QWidget()
-            pl_widget.setFixedWidth(150)  # Fixed width for alignment
-            pl_layout = QVBoxLayout()
-            pl_layout.setContentsMargins(0, 0, 0, 0)
-            pl_layout.setSpacing(0)
-            pl_label = QLabel("playlist name")
-            pl_label.setStyleSheet('font-size: 11px; color: #888; margin: 0px;')
-            pl_label.setAlignment(Qt.AlignLeft)
-            pl_name_text = p.get('playlist_name', 'Unknown Playlist')
-            pl_name = QLabel(pl_name_text)
-            pl_name.setStyleSheet('font-size: 17px; font-weight: bold; color: #222; margin: 0px;')
-            pl_name.setAlignment(Qt.AlignLeft)
-            # Elide based on available width (initial, will update on resize)
-            elide_label(pl_name, pl_name_text, 140)
-            pl_name.setToolTip(pl_name_text)
-            pl_layout.addWidget(pl_label)
-            pl_layout.addWidget(pl_name)
-            pl_widget.setLayout(pl_layout)
-            main_layout.addWidget(pl_widget)
-
-            # Store for resize event
-            self._viewed_cards.append((pl_widget, pl_name, pl_name_text))
-
-            # Dynamic spacer 4
-            main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
-
-            # New brown check button
-            check_btn = QPushButton("check")
-            check_btn.setFixedSize(80, 30)
-            check_btn.setStyleSheet('''
-                QPushButton {
-                    background: #a0522d;
-                    color: #fff;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 15px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background: #c68642;
-                }
-            ''')
-
-            def on_check_clicked(checked=False, playlist_link=p.get('playlist_link', None),
-                                 count_label=new_vids_count_label,
-                                 widget=new_vids_widget):
-                if not playlist_link:
-                    print("[DEBUG] No playlist_link found in card data.")
-                    count_label.setText("N/A")
-                    widget.setVisible(True)
-                    return
-                count_label.setText("...")
-                widget.setVisible(True)
-                QApplication.processEvents()
-                new_vids, error = get_number_of_new_videos(playlist_link)
-                print(f"[DEBUG] get_number_of_new_videos returned: new_vids={new_vids}, error={error}")
-                if error:
-                    count_label.setText("Err")
-                    self.show_api_error_popup(error)
-                else:
-                    count_label.setText(str(new_vids))
-            check_btn.clicked.connect(on_check_clicked)
-            main_layout.addWidget(check_btn)
-            self._check_btns.append(check_btn)
-
-            # Dynamic spacer 5
-            main_layout.addItem(QSpacerItem(0, 0, QSizePolicy.Expanding, QSizePolicy.Minimum))
-
-            # Right section: Load button
-            btn = QPushButton("Load to sorter")
-            btn.setFixedSize(120, 30)
-            btn.setStyleSheet('''
-                QPushButton {
-                    background: #4f8cff;
-                    color: white;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 15px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background: #357ae8;
-                }
-            ''')
-            playlist_link = p.get('playlist_link', None)
-            btn.clicked.connect(lambda checked, link=playlist_link: self.load_playlist_to_sorter(link))
-            main_layout.addWidget(btn)
-
-            card.setLayout(main_layout)
-            self.viewed_layout.addWidget(card)
-        # Connect 'check all' button to trigger all check buttons
-        def trigger_all_checks():
-            for btn in self._check_btns:
-                btn.click()
-        check_all_btn.clicked.connect(trigger_all_checks)
 
         # Update eliding on resize using actual label width
-        def update_eliding():
-            for pl_widget, pl_name, pl_name_text in getattr(self, '_viewed_cards', []):
-                # Use the actual width of the label, fallback to 140 if not available
-                w = pl_name.width() if pl_name.width() > 10 else 140
-                elide_label(pl_name, pl_name_text, w)
-
         def viewed_container_resize_event(event):
             QWidget.resizeEvent(self.viewed_container, event)
-            update_eliding()
+            for card in self._viewed_cards_by_id.values():
+                card.update_eliding()
         self.viewed_container.resizeEvent = viewed_container_resize_event
 
-    def open_link(self, url):
-        import webbrowser
-        webbrowser.open(url.toString())
-        spacer = QSpacerItem(80, 10, QSizePolicy.Expanding, QSizePolicy.Minimum)
-        if self.current_playlist_id:
-            video_url = url.toString()
-            self.clicked_links.add(video_url)
-            self.save_clicked_links()
-            self.update_playlist_display_links()
-        # Clear internal navigation to suppress warning
-        self.result_box.setSource(url.fromUserInput(''))
-        self.channel_result_box.setSource(url.fromUserInput(''))
-
-    def save_clicked_links(self, new_vids_count=None):
+    def check_playlists(self, playlist_ids):
+        # Runs in the background; each card updates as its batch comes back
+        for playlist_id in playlist_ids:
+            self._viewed_cards_by_id[playlist_id].show_check_status("...")
+        run_state = {'error_shown': False}
+        run_task(check_new_videos, playlist_ids,
+                 on_progress=lambda res: self.on_check_result(run_state, *res),
+                 on_error=self.show_api_error_popup)
+
+    def on_check_result(self, run_state, playlist_id, new_vids, error):
+        card = self._viewed_cards_by_id.get(playlist_id)
+        if card is None:
+            return
+        if error:
+            card.show_check_status("Err")
+            # One popup per check run, not one per playlist
+            if not run_state['error_shown']:
+                run_state['error_shown'] = True
+                self.show_api_error_popup(error)
+        elif new_vids is None:
+            card.show_check_status("N/A")
+        else:
+            # The check has already stored the count
+            card.update_from(get_store().get_playlist(playlist_id))
+
+    def on_poll_result(self, playlist_id, new_vids, error):
+        # Background results only ever fill in a count; failures are left for the next poll
+        card = self._viewed_cards_by_id.get(playlist_id)
+        if card is None or error or new_vids is None:
+            return
+        card.update_from(get_store().get_playlist(playlist_id))
+
+    def save_playlist_state(self, new_vids_count=None):
         if not self.current_playlist_id:
             return
-        memory_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter', 'memory')
-        os.makedirs(memory_dir, exist_ok=True)
-        json_path = os.path.join(memory_dir, f'{self.current_playlist_id}.json')
-
-        # Try to get playlist and channel name
-        playlist_name = getattr(self, 'current_playlist_name', None)
-        channel_name = getattr(self, 'current_channel_name', None)
-        playlist_link = getattr(self, 'current_playlist_link', None)
-        no_of_vids = getattr(self, 'current_no_of_vids', None)
-
-        # Load previous data if exists
-        prev_data = {}
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    prev_data = json.load(f)
-            except Exception:
-                pass
-
-        data = {
-            'clicked_vids': list(self.clicked_links)
-        }
-        if playlist_name:
-            data['playlist_name'] = playlist_name
-        if channel_name:
-            data['channel_name'] = channel_name
-        if playlist_link:
-            data['playlist_link'] = playlist_link
-        if no_of_vids is not None:
-            data['no_of_vids'] = no_of_vids
-        # If new vids count is provided, store for UI
-        if new_vids_count is not None:
-            data['new_vids_count'] = new_vids_count
-
-        with open(json_path, 'w', encoding='utf-8') as f:
-            json.dump(data, f)
+        get_store().update_playlist(
+            self.current_playlist_id,
+            playlist_name=getattr(self, 'current_playlist_name', None),
+            channel_name=getattr(self, 'current_channel_name', None),
+            playlist_link=getattr(self, 'current_playlist_link', None),
+            no_of_vids=getattr(self, 'current_no_of_vids', None),
+            new_vids_count=new_vids_count,
+        )
+
+    def save_clicked_link(self, video_url):
+        if not self.current_playlist_id:
+            return
+        # Returns immediately; the journal writes and compacts in the background
+        get_watched_journal().record(self.current_playlist_id, video_url)
 
     def load_clicked_links(self, playlist_id):
-        memory_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter', 'memory')
-        os.makedirs(memory_dir, exist_ok=True)
-        json_path = os.path.join(memory_dir, f'{playlist_id}.json')
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    data = json.load(f)
-                    # Optionally set playlist/channel name if present
-                    self.current_playlist_name = data.get('playlist_name', None)
-                    self.current_channel_name = data.get('channel_name', None)
-                    return set(data.get('clicked_vids', []))
-            except Exception:
-                return set()
-        return set()
+        store = get_store()
+        playlist = store.get_playlist(playlist_id) or {}
+        self.current_playlist_name = playlist.get('playlist_name')
+        self.current_channel_name = playlist.get('channel_name')
+        return get_watched_journal().get_watched(playlist_id)
 
     def update_playlist_display_links(self):
-        # Clear previous widgets
-        while self.result_layout.count():
-            item = self.result_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-        if not hasattr(self, 'sorted_videos') or not self.sorted_videos:
+        if self._search_index is not None:
+            key, ascending = self.selected_sort()
+            self.result_view.video_model.set_videos(self._search_index.view(key, ascending), self._search_clicked)
+            return
+        if self._stream is not None:
+            # The title filter applies once the fetch has completed
+            self.flush_stream()
             return
-        # Get the width of the scroll area for responsive layout
-        scroll_width = self.result_scroll.viewport().width() if self.result_scroll else 800
-        card_width = scroll_width - 24  # account for margins/padding
-        thumb_w = int(card_width * 0.4)
-        info_w = int(card_width * 0.6)
-        thumb_h = int(thumb_w * 9 / 16)  # 16:9 aspect ratio
-        self._thumb_threads = []  # Store threads to prevent GC
-        for v in self.sorted_videos:
-            card = QFrame()
-            card.setFrameShape(QFrame.StyledPanel)
-            card.setStyleSheet('''
-                QFrame {
-                    background: #fafbfc;
-                    border-radius: 8px;
-                    margin: 8px 0px;
-                    padding: 8px;
-                    border: 1px solid #d0d0d0;
-                }
-            ''')
-            card_layout = QHBoxLayout()
-            card_layout.setContentsMargins(8, 8, 8, 8)
-            card_layout.setSpacing(16)
-            card.setLayout(card_layout)
-
-            # Thumbnail section (40% width)
-            thumb_label = QLabel()
-            thumb_label.setFixedSize(thumb_w, thumb_h)
-            thumb_label.setStyleSheet('border-radius:6px; background:#eee;')
-            thumb_url = v.get('thumbnail')
-            if thumb_url:
-                thread = ThumbnailLoader(thumb_url, thumb_label, thumb_w, thumb_h)
-                thread.loaded.connect(self._set_thumbnail_pixmap)
-                thread.start()
-                self._thumb_threads.append(thread)
-            card_layout.addWidget(thumb_label, 2)
-
-            # Info layout (60% width)
-            info_widget = QWidget()
-            info_widget.setFixedWidth(info_w)
-            info_layout = QVBoxLayout()
-            info_layout.setContentsMargins(0, 0, 0, 0)
-            info_layout.setSpacing(6)
-            info_widget.setLayout(info_layout)
-            # Date/time
-            dt_label = QLabel(f"{v['added_at']}")
-            dt_label.setTextFormat(Qt.RichText)
-            dt_label.setStyleSheet('font-size:13px; color:#666; border:none;')
-            info_layout.addWidget(dt_label)
-            # Title
-            title_label = QLabel(v['title'])
-            title_label.setStyleSheet('font-size:16px; font-weight:bold; color:#222; margin-bottom:2px; border:none;')
-            info_layout.addWidget(title_label)
-            # Link
-            link = f"https://www.youtube.com/watch?v={v['video_id']}"
-            link_label = QLabel()
-            link_label.setText(f"<a href='{link}' style='color:{CLICKED_LINK_COLOR if link in self.clicked_links else UNCLICKED_LINK_COLOR};'>{link}</a>")
-            link_label.setTextFormat(Qt.RichText)
-            link_label.setOpenExternalLinks(False)
-            link_label.setStyleSheet('border:none;')
-            def handle_link_click(url=link, label=link_label):
-                import webbrowser
-                webbrowser.open(url)
-                if self.current_playlist_id:
+        videos = getattr(self, 'sorted_videos', None) or []
+        if self._filter_ids is not None:
+            videos = [v for v in videos if v.video_id in self._filter_ids]
+        self.result_view.video_model.set_videos(videos, self.clicked_links)
+
+    def apply_filter(self):
+        text = self.filter_entry.text().strip()
+        store = get_store()
+        self._filter_ids = None
+        self._search_index = None
+        if text and self.filter_all_checkbox.isChecked():
+            matches = store.search_videos(text, limit=SEARCH_RESULT_LIMIT)
+            self._search_playlists = {v.link: pid for pid, v in matches}
+            self._search_clicked = set()
+            journal = get_watched_journal()
+            for pid in set(self._search_playlists.values()):
+                self._search_clicked |= journal.get_watched(pid)
+            self._search_index = SortIndex([v for _, v in matches])
+        elif text and self.current_playlist_id:
+            self._filter_ids = store.search_video_ids(text, playlist_id=self.current_playlist_id)
+        self.update_playlist_display_links()
+
+    def on_video_link_activated(self, url, row):
+        import webbrowser
+        webbrowser.open(url)
+        if self._search_index is not None:
+            # A match from another playlist is marked watched in that playlist
+            playlist_id = self._search_playlists.get(url)
+            if playlist_id:
+                self._search_clicked.add(url)
+                get_watched_journal().record(playlist_id, url)
+                if playlist_id == self.current_playlist_id:
                     self.clicked_links.add(url)
-                    self.save_clicked_links()
-                    # Update only this link's color
-                    label.setText(f"<a href='{url}' style='color:{CLICKED_LINK_COLOR};'>{url}</a>")
-            link_label.linkActivated.connect(handle_link_click)
-            info_layout.addWidget(link_label)
-            card_layout.addWidget(info_widget, 3)
-
-            self.result_layout.addWidget(card)
-
-    def _set_thumbnail_pixmap(self, label, pixmap):
-        label.setPixmap(pixmap)
-
-    def get_channel_id(self, url):
-        # Accepts channel URL in the form https://www.youtube.com/channel/CHANNEL_ID or /@handle
-        if '/channel/' in url:
-            return url.split('/channel/')[1].split('/')[0]
-        elif '/@' in url:
-            # Need to resolve handle to channel ID
-            handle = url.split('/@')[1].split('/')[0]
-            # Use YouTube Data API to resolve handle
-            api_url = f'https://www.googleapis.com/youtube/v3/channels'
-            params = {
-                'part': 'id',
-                'forHandle': f'@{handle}',
-                'key': API_KEY
-            }
-            resp = requests.get(api_url, params=params)
-            if resp.status_code == 200:
-                data = resp.json()
-                items = data.get('items', [])
-                if items:
-                    return items[0]['id']
-            return None
-        return None
+                self.result_view.video_model.mark_watched(row)
+        elif self.current_playlist_id:
+            self.clicked_links.add(url)
+            self.save_clicked_link(url)
+            # Repaint only this row in the watched color
+            self.result_view.video_model.mark_watched(row)
 
     def show_api_error_popup(self, error_text):
         instructions = (
@@ -859,164 +921,183 @@ class PlaylistSorterQt(QWidget):
 
     def list_channel_playlists(self):
         url = self.channel_entry.text().strip()
-        channel_id = self.get_channel_id(url)
-        if not channel_id:
+        # A new search supersedes any listing still streaming in
+        self._channel_search += 1
+        search = self._channel_search
+        self.clear_channel_results()
+        self.channel_status.setText('Fetching playlists...')
+        run_task(stream_channel_playlists, url,
+                 on_progress=lambda page: self.on_channel_page(search, page),
+                 on_result=lambda count: self.on_channel_playlists_done(search, count),
+                 on_error=lambda error: self.on_channel_playlists_error(search, error))
+
+    def clear_channel_results(self):
+        while self.channel_result_layout.count():
+            widget = self.channel_result_layout.takeAt(0).widget()
+            if widget:
+                widget.deleteLater()
+        self._channel_count = 0
+        self._channel_thumb_labels = {}
+
+    def on_channel_page(self, search, page):
+        if search != self._channel_search:
+            return
+        for p in page:
+            self.channel_result_layout.addWidget(self.make_channel_playlist_card(p))
+        self._channel_count += len(page)
+        self.channel_status.setText(f'Fetching playlists... {self._channel_count} so far')
+
+    def on_channel_playlists_done(self, search, count):
+        if search != self._channel_search:
+            return
+        if count is None:
+            self.channel_status.setText('')
             QMessageBox.critical(self, 'Error', 'Invalid channel URL or unable to resolve channel ID.')
             return
-        self.channel_result_box.setText('Fetching playlists...')
-        QApplication.processEvents()
-        playlists = []
-        base_url = 'https://www.googleapis.com/youtube/v3/playlists'
-        params = {
-            'part': 'snippet',
-            'maxResults': 50,
-            'channelId': channel_id,
-            'key': API_KEY
-        }
-        nextPageToken = None
-        while True:
-            if nextPageToken:
-                params['pageToken'] = nextPageToken
-            resp = requests.get(base_url, params=params)
-            if resp.status_code != 200:
-                self.show_api_error_popup(resp.text)
-                return
-            data = resp.json()
-            for item in data.get('items', []):
-                title = item['snippet']['title']
-                playlist_id = item['id']
-                playlists.append({'title': title, 'playlist_id': playlist_id})
-            nextPageToken = data.get('nextPageToken')
-            if not nextPageToken:
-                break
-        # Clear previous results
-        self.channel_result_box.clear()
-        # Create a widget to hold playlist entries
-        result_widget = QWidget()
-        result_layout = QVBoxLayout()
-        result_widget.setLayout(result_layout)
-
-        for p in playlists:
-            link = f"https://www.youtube.com/playlist?list={p['playlist_id']}"
-            card = QFrame()
-            card.setFrameShape(QFrame.StyledPanel)
-            card.setStyleSheet('''
-                QFrame {
-                    background: #fafbfc;
-                    border-radius: 8px;
-                    margin: 8px 0px;
-                    padding: 8px;
-                    border: 1px solid #d0d0d0;
-                }
-            ''')
-            card_layout = QHBoxLayout()
-            card_layout.setContentsMargins(16, 8, 16, 8)
-            card_layout.setSpacing(16)
-            card.setLayout(card_layout)
-
-            # Info layout (title and link)
-            info_widget = QWidget()
-            info_layout = QVBoxLayout()
-            info_layout.setContentsMargins(0, 0, 0, 0)
-            info_layout.setSpacing(6)
-            info_widget.setLayout(info_layout)
-            title_label = QLabel(f"<b>{p['title']}</b>")
-            title_label.setTextFormat(Qt.RichText)
-            title_label.setStyleSheet('font-size:16px; font-weight:bold; color:#222; border:none;')
-            info_layout.addWidget(title_label)
-            link_label = QLabel(f"<a href='{link}'>{link}</a>")
-            link_label.setTextFormat(Qt.RichText)
-            link_label.setOpenExternalLinks(True)
-            link_label.setStyleSheet('font-size:13px; color:#357ae8; border:none;')
-            info_layout.addWidget(link_label)
-            card_layout.addWidget(info_widget, 3)
-
-            # Load to sorter button
-            btn = QPushButton("Load to sorter")
-            btn.setFixedSize(120, 30)
-            btn.setStyleSheet('''
-                QPushButton {
-                    background: #4f8cff;
-                    color: white;
-                    border-radius: 4px;
-                    font-weight: bold;
-                    font-size: 15px;
-                    border: none;
-                }
-                QPushButton:hover {
-                    background: #357ae8;
-                }
-            ''')
-            btn.clicked.connect(lambda checked, lnk=link: self.load_playlist_to_sorter(lnk))
-            card_layout.addWidget(btn, 1)
-
-            result_layout.addWidget(card)
-
-        # Set the widget in the QTextBrowser using setCentralWidget if available, else fallback to HTML
-        # QTextBrowser does not support widgets directly, so use a QScrollArea
-        scroll = QScrollArea()
-        scroll.setWidgetResizable(True)
-        scroll.setWidget(result_widget)
-        # Replace the QTextBrowser with the scroll area
-        parent_layout = self.channel_result_box.parentWidget().layout()
-        parent_layout.removeWidget(self.channel_result_box)
-        self.channel_result_box.setParent(None)
-        parent_layout.addWidget(scroll)
-        self.channel_result_scroll = scroll
-
-    def sort_playlist(self):
+        self.channel_status.setText(f"{count} playlist{'s' if count != 1 else ''}")
+
+    def on_channel_playlists_error(self, search, error):
+        if search != self._channel_search:
+            return
+        self.channel_status.setText(f'Stopped after {self._channel_count} playlists')
+        self.show_api_error_popup(error)
+
+    def make_channel_playlist_card(self, p):
+        link = f"https://www.youtube.com/playlist?list={p['playlist_id']}"
+        card = QFrame()
+        card.setFrameShape(QFrame.StyledPanel)
+        card.setStyleSheet('''
+            QFrame {
+                background: #fafbfc;
+                border-radius: 8px;
+                margin: 8px 0px;
+                padding: 8px;
+                border: 1px solid #d0d0d0;
+            }
+        ''')
+        card_layout = QHBoxLayout()
+        card_layout.setContentsMargins(16, 8, 16, 8)
+        card_layout.setSpacing(16)
+        card.setLayout(card_layout)
+
+        # Thumbnail, filled in when the shared loader has it
+        thumb_label = QLabel()
+        thumb_label.setFixedSize(CHANNEL_THUMB_WIDTH, CHANNEL_THUMB_HEIGHT)
+        thumb_label.setAlignment(Qt.AlignCenter)
+        thumb_label.setStyleSheet('background:#eee; border:none; padding:0px; margin:0px;')
+        card_layout.addWidget(thumb_label)
+        self.request_channel_thumbnail(p.get('thumbnail'), thumb_label)
+
+        # Info layout (title, video count and link)
+        info_widget = QWidget()
+        info_layout = QVBoxLayout()
+        info_layout.setContentsMargins(0, 0, 0, 0)
+        info_layout.setSpacing(6)
+        info_widget.setLayout(info_layout)
+        title_label = QLabel(f"<b>{p['title']}</b>")
+        title_label.setTextFormat(Qt.RichText)
+        title_label.setStyleSheet('font-size:16px; font-weight:bold; color:#222; border:none;')
+        info_layout.addWidget(title_label)
+        if p.get('item_count') is not None:
+            count_label = QLabel(f"{p['item_count']} video{'s' if p['item_count'] != 1 else ''}")
+            count_label.setStyleSheet('font-size:13px; color:#666; border:none;')
+            info_layout.addWidget(count_label)
+        link_label = QLabel(f"<a href='{link}'>{link}</a>")
+        link_label.setTextFormat(Qt.RichText)
+        link_label.setOpenExternalLinks(True)
+        link_label.setStyleSheet('font-size:13px; color:#357ae8; border:none;')
+        info_layout.addWidget(link_label)
+        card_layout.addWidget(info_widget, 3)
+
+        # Load to sorter button
+        btn = QPushButton("Load to sorter")
+        btn.setFixedSize(120, 30)
+        btn.setStyleSheet('''
+            QPushButton {
+                background: #4f8cff;
+                color: white;
+                border-radius: 4px;
+                font-weight: bold;
+                font-size: 15px;
+                border: none;
+            }
+            QPushButton:hover {
+                background: #357ae8;
+            }
+        ''')
+        btn.clicked.connect(lambda checked, lnk=link: self.load_playlist_to_sorter(lnk))
+        card_layout.addWidget(btn, 1)
+        return card
+
+    def request_channel_thumbnail(self, url, label):
+        if not url:
+            return
+        # Channel-card thumbnails are cached under their own size, apart from the larger
+        # copies the video list keeps under the bare URL
+        memory = get_thumbnail_cache().memory
+        pixmap = memory.get((url, CHANNEL_THUMB_WIDTH, CHANNEL_THUMB_HEIGHT))
+        if pixmap is not None:
+            label.setPixmap(pixmap)
+            return
+        pixmap = memory.get(url)
+        if pixmap is not None:
+            label.setPixmap(pixmap.scaled(CHANNEL_THUMB_WIDTH, CHANNEL_THUMB_HEIGHT, Qt.KeepAspectRatio, Qt.SmoothTransformation))
+            return
+        waiting = self._channel_thumb_labels.setdefault(url, [])
+        waiting.append(label)
+        if len(waiting) == 1:
+            get_thumbnail_pool().start(
+                ThumbnailLoader(url, CHANNEL_THUMB_WIDTH, CHANNEL_THUMB_HEIGHT, self._channel_thumb_signals))
+
+    def on_channel_thumbnail_loaded(self, url, image):
+        # Labels of an earlier search were dropped from the map, so they are never touched here
+        labels = self._channel_thumb_labels.pop(url, [])
+        if image is None:
+            return  # the cards keep their placeholder; the next listing tries again
+        pixmap = QPixmap.fromImage(image)
+        get_thumbnail_cache().memory.put((url, CHANNEL_THUMB_WIDTH, CHANNEL_THUMB_HEIGHT), pixmap)
+        for label in labels:
+            label.setPixmap(pixmap)
+
+    def sort_playlist(self, force_refresh=False):
         url = self.url_entry.text().strip()
         playlist_id = get_playlist_id(url)
         if not playlist_id:
             QMessageBox.critical(self, 'Error', 'Invalid playlist URL.')
             return
 
-        # Path for cache file in app folder
-        cache_path = os.path.join(os.path.dirname(__file__), 'playlist_videos_cache.json')
-        cache_data = None
-        cache_exists = os.path.exists(cache_path)
-        cache_valid = False
-        if cache_exists:
-            try:
-                with open(cache_path, 'r', encoding='utf-8') as f:
-                    cache_data = json.load(f)
-                if cache_data.get('playlist_link') == url and 'videos' in cache_data:
-                    cache_valid = True
-            except Exception:
-                cache_data = None
-                cache_valid = False
-
-        # Show loading animation and text in widget-based layout
-        while self.result_layout.count():
-            item = self.result_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
-
-        loading_frame = QFrame()
-        loading_layout = QVBoxLayout()
-        loading_layout.setAlignment(Qt.AlignCenter)
-        loading_frame.setLayout(loading_layout)
-        gif_label = QLabel()
-        gif_label.setAlignment(Qt.AlignCenter)
-        gif_label.setFixedSize(64, 64)
-        loading_layout.addWidget(gif_label)
-        loading_text = QLabel()
-        loading_text.setAlignment(Qt.AlignCenter)
-        loading_text.setStyleSheet('font-size:32px; color:#04044b; margin-top:18px; font-weight:bold;')
-        loading_layout.addWidget(loading_text)
-        self.result_layout.addWidget(loading_frame)
-        QApplication.processEvents()
+        self._fetch_generation += 1
+        generation = self._fetch_generation
+        for task in (self._fetch_task, self._enrich_task):
+            if task is not None:
+                task.cancel()
+        self._fetch_task = self._enrich_task = None
+
+        # Previously fetched playlists are re-sorted from the local store
+        store = get_store()
+        # unless a check has found new videos in it since
+        stored = store.get_playlist(playlist_id)
+        cache_valid = (not force_refresh and store.has_videos(playlist_id)
+                       and not (stored and stored.get('new_vids_count')))
+
+        # Show loading animation and text above the (cleared) result list
+        self.sort_index = None
+        self.sorted_videos = []
+        self._stream = None
+        self.stream_timer.stop()
+        self.result_view.video_model.clear()
+        gif_label = self.loading_icon
+        loading_text = self.loading_text
+        gif_label.clear()
+        self.loading_frame.setVisible(True)
 
         if cache_valid:
-            # Show 'Resorting' animation with a suitable emoji
-            gif_label.setText('🔄')  # Resorting emoji
-            gif_label.setStyleSheet('font-size:48px;')
-            loading_text.setText('Resorting...')
-            QApplication.processEvents()
-            # Use cached videos, re-sort and update UI
-            videos = cache_data['videos']
+            # Stored videos are read locally, no network involved
+            videos = load_playlist_videos(playlist_id, store)
             self.on_fetch_complete_with_error_popup(videos, None, url, playlist_id)
+            self._enrich_task = run_task(
+                enrich_stored_playlist, playlist_id, videos, stored['fetched_at'], cancellable=True,
+                on_result=lambda enriched: self.on_enrich_complete(generation, enriched))
         else:
             # Show fetching animation
             try:
@@ -1034,104 +1115,111 @@ class PlaylistSorterQt(QWidget):
                 gif_label.setText('⏳')
                 gif_label.setStyleSheet('font-size:48px;')
             loading_text.setText('fetching...')
-            QApplication.processEvents()
-            # If cache exists but playlist changed, clear it
-            if cache_exists:
-                try:
-                    os.remove(cache_path)
-                except Exception:
-                    pass
-            # Fetch new videos and store in cache after fetch
-            def after_fetch(videos, error):
-                if not error and videos is not None:
-                    try:
-                        with open(cache_path, 'w', encoding='utf-8') as f:
-                            json.dump({'playlist_link': url, 'videos': videos}, f)
-                    except Exception:
-                        pass
-                self.on_fetch_complete_with_error_popup(videos, error, url, playlist_id)
-            self.fetch_thread = FetchPlaylistWorker(playlist_id)
-            self.fetch_thread.finished.connect(after_fetch)
-            self.fetch_thread.start()
-
-    def on_fetch_complete_with_error_popup(self, videos, error, url, playlist_id):
+            # Pages are shown as they arrive, so clicks already belong to this playlist
+            self.current_playlist_id = playlist_id
+            self.clicked_links = self.load_clicked_links(playlist_id)
+            self._stream = {'playlist_id': playlist_id, 'generation': generation, 'videos': [], 'pending': [],
+                            'key': None, 'started': time.monotonic()}
+            # Fetch new videos in the background; the task stores them before reporting back
+            self._fetch_task = run_task(
+                fetch_and_store_playlist, playlist_id, url, cancellable=True,
+                on_progress=lambda res: self.on_fetch_page(generation, *res),
+                on_result=lambda res: self.on_fetch_complete_with_error_popup(res[0], None, url, playlist_id, added=res[1],
+                                                                        fetched_at=res[2], generation=generation),
+                on_error=lambda error: self.on_fetch_complete_with_error_popup(None, error, url, playlist_id, generation=generation))
+
+    def on_fetch_page(self, generation, page_videos, done, total):
+        stream = self._stream
+        if stream is None or stream['generation'] != generation:
+            return
+        stream['pending'].extend(page_videos)
+        text = f'{done:,} / {total:,} videos' if total else f'{done:,} videos'
+        if total and 0 < done < total:
+            left = (time.monotonic() - stream['started']) / done * (total - done)
+            text += f' · about {int(left) + 1} s left' if left < 90 else f' · about {int(left / 60) + 1} min left'
+        self.loading_text.setText(text)
+        # The first page is shown right away; later ones are merged at most every
+        # STREAM_REFRESH_MS, however fast they come in
+        if not stream['videos']:
+            self.flush_stream()
+        elif not self.stream_timer.isActive():
+            self.stream_timer.start()
+
+    def flush_stream(self):
+        # Keeps what has arrived so far sorted by the selected mode. The list is already sorted,
+        # so sorting it with a new page appended is a run merge, close to linear.
+        stream = self._stream
+        if stream is None:
+            return
+        key, ascending = self.selected_sort()
+        videos = stream['videos']
+        if stream['pending'] or stream['key'] != key:
+            # A new list, as the model may be showing the previous one
+            videos = stream['videos'] = sorted(videos + stream['pending'], key=SORT_KEYS[key])
+            stream['pending'].clear()
+            stream['key'] = key
+        if self._search_index is not None:
+            return  # results from all playlists are shown instead
+        # Reversing the ascending order matches SortIndex's descending views
+        scroll_bar = self.result_view.verticalScrollBar()
+        position = scroll_bar.value()
+        self.result_view.video_model.set_videos(videos if ascending else videos[::-1], self.clicked_links)
+        scroll_bar.setValue(position)
+
+    def on_fetch_complete_with_error_popup(self, videos, error, url, playlist_id, added=None, fetched_at=None,
+                                           generation=None):
+        # generation: the sort request a fetch belongs to (None for store reads, which finish at once);
+        # fetched_at: what the store has for the fetched videos, which their snapshot is tagged with
+        if generation is not None:
+            if generation != self._fetch_generation:
+                log.debug('Dropping superseded fetch of %s', playlist_id)
+                return
+            self._fetch_task = None
+            self._stream = None
+            self.stream_timer.stop()
         # Remove loading animation after fetch
-        while self.result_layout.count():
-            item = self.result_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        self.loading_frame.setVisible(False)
         if error:
             self.show_api_error_popup(error)
             return
-        self.on_fetch_complete(videos, error, url, playlist_id)
+        self.on_fetch_complete(videos, error, url, playlist_id, added=added, synced=generation is not None)
+        if generation is not None:
+            # Publish dates and statistics follow; sorts by them are redone when they arrive
+            self._enrich_task = run_task(
+                enrich_and_snapshot_playlist, playlist_id, videos, fetched_at, cancellable=True,
+                on_result=lambda enriched: self.on_enrich_complete(generation, enriched))
+
+    def on_enrich_complete(self, generation, videos):
+        if generation != self._fetch_generation:
+            return  # another playlist (or a refresh) has been requested since
+        self._enrich_task = None
+        if videos is None:
+            return  # nothing was missing
+        self.sort_index = SortIndex(videos)
+        self.apply_sort()
+        scroll_bar = self.result_view.verticalScrollBar()
+        position = scroll_bar.value()
+        self.update_playlist_display_links()
+        scroll_bar.setValue(position)
 
-    def on_fetch_complete(self, videos, error, url, playlist_id):
+    def on_fetch_complete(self, videos, error, url, playlist_id, added=None, synced=False):
+        # added: videos the sync found that were not in the stored copy (None when read from the store
+        # or on the first fetch); synced: the videos were just fetched rather than read from the store
         # Remove loading animation after fetch
-        while self.result_layout.count():
-            item = self.result_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        self.loading_frame.setVisible(False)
         if error:
             QMessageBox.critical(self, 'API Error', error)
             return
-        # Determine sorting mode
-        if self.radio_added_asc.isChecked():
-            self.sorted_videos = sort_videos(videos, ascending=True, by_published=False)
-        elif self.radio_added_desc.isChecked():
-            self.sorted_videos = sort_videos(videos, ascending=False, by_published=False)
-        elif self.radio_published_asc.isChecked():
-            self.sorted_videos = sort_videos(videos, ascending=True, by_published=True)
-        elif self.radio_published_desc.isChecked():
-            self.sorted_videos = sort_videos(videos, ascending=False, by_published=True)
-        else:
-            self.sorted_videos = videos
+        # Orderings are computed once per key for this playlist and reused on every mode change
+        self.sort_index = SortIndex(videos)
+        self.apply_sort()
         self.current_playlist_id = playlist_id
 
         # ...existing code for saving playlist link, channel/playlist name, video count, etc...
         self.current_playlist_link = url
-        playlist_name = None
-        channel_name = None
-        if videos:
-            playlist_name = videos[0].get('playlist_title', None)
-            channel_name = videos[0].get('channel_title', None)
-        try:
-            playlist_api = 'https://www.googleapis.com/youtube/v3/playlists'
-            params = {
-                'part': 'snippet',
-                'id': playlist_id,
-                'key': API_KEY
-            }
-            resp = requests.get(playlist_api, params=params)
-            if resp.status_code == 200:
-                data = resp.json()
-                items = data.get('items', [])
-                if items:
-                    snippet = items[0]['snippet']
-                    playlist_name = snippet.get('title', None)
-                    channel_name = snippet.get('channelTitle', None)
-        except Exception:
-            pass
-        self.current_playlist_name = playlist_name
-        self.current_channel_name = channel_name
         self.current_no_of_vids = len(videos)
-        memory_dir = os.path.join(os.environ['APPDATA'], 'YT-playlist-sorter', 'memory')
-        os.makedirs(memory_dir, exist_ok=True)
-        json_path = os.path.join(memory_dir, f'{playlist_id}.json')
-        prev_count = None
-        if os.path.exists(json_path):
-            try:
-                with open(json_path, 'r', encoding='utf-8') as f:
-                    prev_data = json.load(f)
-                    prev_count = prev_data.get('no_of_vids', None)
-            except Exception:
-                pass
-        new_vids_count = None
-        if prev_count is not None:
-            new_vids_count = self.current_no_of_vids - prev_count
-            if new_vids_count < 0:
-                new_vids_count = 0
+        # Counted by video ID, so removals elsewhere in the playlist do not hide additions
+        new_vids_count = added
         if new_vids_count is not None and new_vids_count > 0:
             for i in reversed(range(self.new_vids_layout.count())):
                 widget = self.new_vids_layout.itemAt(i).widget()
@@ -1144,22 +1232,52 @@ class PlaylistSorterQt(QWidget):
         else:
             self.new_vids_card.setVisible(False)
         self.clicked_links = self.load_clicked_links(playlist_id)
+        # Re-applies any filter text to the newly loaded playlist
+        self.apply_filter()
+        # After a sync everything up to now is stored, so nothing is pending for the Viewed Playlists card
+        self.save_playlist_state(new_vids_count=0 if synced else None)
+        # Title and channel name arrive separately so the list is shown without waiting on them.
+        # Stored names are kept until the next sync, so reopening a playlist spends no quota.
+        if synced or not (self.current_playlist_name and self.current_channel_name):
+            run_task(lambda: (fetch_playlist_metadata(playlist_id), None),
+                     on_result=lambda meta: self.on_playlist_metadata(playlist_id, meta))
+
+    def on_playlist_metadata(self, playlist_id, meta):
+        playlist_name, channel_name, error = meta
+        if error:
+            log.warning('Playlist metadata unavailable for %s: %s', playlist_id, error)
+            return
+        get_store().update_playlist(playlist_id, playlist_name=playlist_name, channel_name=channel_name)
+        if playlist_id == self.current_playlist_id:
+            self.current_playlist_name = playlist_name or self.current_playlist_name
+            self.current_channel_name = channel_name or self.current_channel_name
+
+    def selected_sort(self):
+        return self.sort_radios.get(self.sort_radio_group.checkedButton(), ('added', True))
+
+    def apply_sort(self):
+        key, ascending = self.selected_sort()
+        self.sorted_videos = self.sort_index.view(key, ascending)
+
+    def on_sort_mode_changed(self, button, checked):
+        if not checked:
+            return
+        if getattr(self, 'sort_index', None) is not None:
+            self.apply_sort()
+        elif self._search_index is None and self._stream is None:
+            return
         self.update_playlist_display_links()
-        self.save_clicked_links(new_vids_count=new_vids_count)
 
     def load_playlist_to_sorter(self, playlist_link):
         # Switch to Sort Playlist tab
         self.tabs.setCurrentIndex(0)
         # Clear previous results in Sort Playlist tab
-        while self.result_layout.count():
-            item = self.result_layout.takeAt(0)
-            widget = item.widget()
-            if widget:
-                widget.deleteLater()
+        self.result_view.video_model.clear()
         # Load the relevant link to the input
         self.url_entry.setText(playlist_link if playlist_link else "")
 
 if __name__ == '__main__':
+    setup_logging()
     app = QApplication(sys.argv)
     window = PlaylistSorterQt()
     window.show()
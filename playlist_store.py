@@ -0,0 +1,393 @@
+import os
+import re
+import json
+import time
+import sqlite3
+import threading
+
+from video_record import VideoRecord
+
+
+SCHEMA = '''
+CREATE TABLE IF NOT EXISTS playlists (
+    playlist_id TEXT PRIMARY KEY,
+    playlist_link TEXT,
+    playlist_name TEXT,
+    channel_name TEXT,
+    no_of_vids INTEGER,
+    new_vids_count INTEGER,
+    fetched_at REAL,
+    updated_at REAL
+);
+CREATE INDEX IF NOT EXISTS idx_playlists_updated_at ON playlists(updated_at);
+CREATE TABLE IF NOT EXISTS videos (
+    id INTEGER PRIMARY KEY,
+    playlist_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    video_id TEXT NOT NULL,
+    title TEXT,
+    added_ts INTEGER,
+    thumbnail TEXT,
+    UNIQUE (playlist_id, position)
+);
+CREATE INDEX IF NOT EXISTS idx_videos_video_id ON videos(video_id);
+CREATE TABLE IF NOT EXISTS watched (
+    playlist_id TEXT NOT NULL,
+    video_url TEXT NOT NULL,
+    watched_at REAL,
+    PRIMARY KEY (playlist_id, video_url)
+);
+CREATE TABLE IF NOT EXISTS page_cache (
+    playlist_id TEXT NOT NULL,
+    page_token TEXT NOT NULL,
+    etag TEXT,
+    page TEXT,
+    PRIMARY KEY (playlist_id, page_token)
+);
+CREATE TABLE IF NOT EXISTS video_details (
+    video_id TEXT PRIMARY KEY,
+    published_ts INTEGER,
+    duration INTEGER,
+    view_count INTEGER,
+    like_count INTEGER,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS channel_handles (
+    handle TEXT PRIMARY KEY,
+    channel_id TEXT NOT NULL,
+    resolved_at REAL
+);
+CREATE TABLE IF NOT EXISTS channel_playlists (
+    channel_id TEXT NOT NULL,
+    position INTEGER NOT NULL,
+    playlist_id TEXT NOT NULL,
+    title TEXT,
+    item_count INTEGER,
+    thumbnail TEXT,
+    PRIMARY KEY (channel_id, position)
+);
+CREATE TABLE IF NOT EXISTS channel_listings (
+    channel_id TEXT PRIMARY KEY,
+    fetched_at REAL
+);
+CREATE TABLE IF NOT EXISTS playlist_polls (
+    playlist_id TEXT PRIMARY KEY,
+    item_count INTEGER,
+    checked_at REAL,
+    next_check_at REAL,
+    upload_rate REAL
+);
+CREATE TABLE IF NOT EXISTS store_meta (
+    key TEXT PRIMARY KEY,
+    value TEXT
+);
+'''
+
+# Full-text index over video titles. External content: the index stores only tokens and
+# the triggers keep it in step with every insert and delete on videos. It is keyed by
+# videos.id, an INTEGER PRIMARY KEY, so VACUUM cannot renumber the rows under it.
+FTS_SCHEMA = '''
+CREATE VIRTUAL TABLE IF NOT EXISTS videos_fts USING fts5(
+    title, content='videos', content_rowid='id',
+    tokenize='unicode61 remove_diacritics 2', prefix='2 3'
+);
+CREATE TRIGGER IF NOT EXISTS videos_fts_insert AFTER INSERT ON videos BEGIN
+    INSERT INTO videos_fts (rowid, title) VALUES (new.id, new.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_fts_delete AFTER DELETE ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title) VALUES ('delete', old.id, old.title);
+END;
+CREATE TRIGGER IF NOT EXISTS videos_fts_update AFTER UPDATE OF title ON videos BEGIN
+    INSERT INTO videos_fts (videos_fts, rowid, title) VALUES ('delete', old.id, old.title);
+    INSERT INTO videos_fts (rowid, title) VALUES (new.id, new.title);
+END;
+'''
+
+SEARCH_WORD_RE = re.compile(r'\w+', re.UNICODE)
+
+PLAYLIST_FIELDS = ('playlist_link', 'playlist_name', 'channel_name', 'no_of_vids', 'new_vids_count', 'fetched_at')
+
+
+def get_app_data_dir():
+    # %APPDATA% on Windows; ~/.config elsewhere so headless servers work too
+    base_dir = os.environ.get('APPDATA') or os.path.join(os.path.expanduser('~'), '.config')
+    app_dir = os.path.join(base_dir, 'YT-playlist-sorter')
+    os.makedirs(app_dir, exist_ok=True)
+    return app_dir
+
+
+class PlaylistStore:
+    # SQLite store for playlists, their videos and watched state.
+    # Each thread gets its own connection; WAL lets readers run during writes.
+    def __init__(self, db_path):
+        self.db_path = db_path
+        self._local = threading.local()
+        with self._conn() as conn:
+            conn.executescript(SCHEMA)
+            self.has_fts = self._create_fts(conn)
+
+    def _create_fts(self, conn):
+        # Returns False on SQLite builds without FTS5; search then falls back to LIKE
+        existed = conn.execute("SELECT 1 FROM sqlite_master WHERE name = 'videos_fts'").fetchone()
+        try:
+            conn.executescript(FTS_SCHEMA)
+        except sqlite3.OperationalError:
+            return False
+        if not existed:
+            # Index titles stored before the index existed
+            conn.execute("INSERT INTO videos_fts (videos_fts) VALUES ('rebuild')")
+        return True
+
+    def _conn(self):
+        conn = getattr(self._local, 'conn', None)
+        if conn is None:
+            conn = sqlite3.connect(self.db_path, timeout=30)
+            conn.row_factory = sqlite3.Row
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute('PRAGMA synchronous=NORMAL')
+            self._local.conn = conn
+        return conn
+
+    def get_playlist(self, playlist_id):
+        row = self._conn().execute('SELECT * FROM playlists WHERE playlist_id = ?', (playlist_id,)).fetchone()
+        return dict(row) if row else None
+
+    def list_playlists(self, updated_after=None):
+        # All playlists, or only those saved after the given updated_at, oldest first
+        if updated_after is None:
+            rows = self._conn().execute('SELECT * FROM playlists ORDER BY updated_at').fetchall()
+        else:
+            rows = self._conn().execute('SELECT * FROM playlists WHERE updated_at > ? ORDER BY updated_at',
+                                        (updated_after,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def playlists_fingerprint(self):
+        # Changes whenever a playlist is added or saved; answered from the updated_at index
+        row = self._conn().execute('SELECT COUNT(*), MAX(updated_at) FROM playlists').fetchone()
+        return tuple(row)
+
+    def update_playlist(self, playlist_id, **fields):
+        # Upsert metadata; fields passed as None are left untouched
+        fields = {k: v for k, v in fields.items() if k in PLAYLIST_FIELDS and v is not None}
+        fields['updated_at'] = time.time()
+        columns = ', '.join(fields)
+        placeholders = ', '.join('?' for _ in fields)
+        updates = ', '.join(f'{k} = excluded.{k}' for k in fields)
+        with self._conn() as conn:
+            conn.execute(
+                f'INSERT INTO playlists (playlist_id, {columns}) VALUES (?, {placeholders}) '
+                f'ON CONFLICT(playlist_id) DO UPDATE SET {updates}',
+                (playlist_id, *fields.values()))
+
+    def set_new_vids_counts(self, counts):
+        # Background check results; updated_at is left alone so the playlists keep their order
+        with self._conn() as conn:
+            conn.executemany('UPDATE playlists SET new_vids_count = ? WHERE playlist_id = ?',
+                             ((n, pid) for pid, n in counts.items()))
+
+    def get_polls(self):
+        rows = self._conn().execute('SELECT * FROM playlist_polls').fetchall()
+        return {r['playlist_id']: dict(r) for r in rows}
+
+    def save_polls(self, polls):
+        with self._conn() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO playlist_polls (playlist_id, item_count, checked_at, next_check_at, upload_rate) '
+                'VALUES (:playlist_id, :item_count, :checked_at, :next_check_at, :upload_rate)', polls)
+
+    def has_videos(self, playlist_id):
+        row = self._conn().execute('SELECT fetched_at FROM playlists WHERE playlist_id = ?', (playlist_id,)).fetchone()
+        return bool(row and row['fetched_at'])
+
+    def get_videos(self, playlist_id):
+        # Stored details are included whatever their age, so re-sorting never needs the API
+        cursor = self._conn().cursor()
+        cursor.row_factory = None  # plain tuples are much cheaper than sqlite3.Row here
+        rows = cursor.execute(
+            'SELECT v.title, v.video_id, v.added_ts, v.thumbnail, '
+            'd.published_ts, d.duration, d.view_count, d.like_count '
+            'FROM videos v LEFT JOIN video_details d ON d.video_id = v.video_id '
+            'WHERE v.playlist_id = ? ORDER BY v.position',
+            (playlist_id,)).fetchall()
+        return [VideoRecord(*r) for r in rows]
+
+    def _search_sql(self, columns, query, playlist_id, limit):
+        words = SEARCH_WORD_RE.findall(query)
+        if not words:
+            return None, None
+        if self.has_fts:
+            # CROSS JOIN keeps the index lookup as the outer loop; otherwise SQLite may walk
+            # the playlist's rows and evaluate MATCH once per row
+            sql = (f'SELECT {columns} FROM videos_fts f CROSS JOIN videos v ON v.id = f.rowid '
+                   'LEFT JOIN video_details d ON d.video_id = v.video_id WHERE videos_fts MATCH ?')
+            args = [' '.join('"' + w.replace('"', '') + '"*' for w in words)]
+        else:
+            sql = f'SELECT {columns} FROM videos v LEFT JOIN video_details d ON d.video_id = v.video_id WHERE 1'
+            args = []
+            for w in words:
+                sql += ' AND v.title LIKE ?'
+                args.append(f'%{w}%')
+        if playlist_id is not None:
+            sql += ' AND v.playlist_id = ?'
+            args.append(playlist_id)
+        if limit is not None:
+            sql += ' LIMIT ?'
+            args.append(limit)
+        return sql, args
+
+    def search_videos(self, query, playlist_id=None, limit=None):
+        # Videos whose title has every word of query as a word prefix, as (playlist_id, VideoRecord)
+        sql, args = self._search_sql('v.playlist_id, v.title, v.video_id, v.added_ts, v.thumbnail, '
+                                     'd.published_ts, d.duration, d.view_count, d.like_count',
+                                     query, playlist_id, limit)
+        if sql is None:
+            return []
+        cursor = self._conn().cursor()
+        cursor.row_factory = None
+        return [(r[0], VideoRecord(*r[1:])) for r in cursor.execute(sql, args).fetchall()]
+
+    def search_video_ids(self, query, playlist_id=None):
+        # Same matching as search_videos, but only the IDs (enough to filter a loaded playlist)
+        sql, args = self._search_sql('v.video_id', query, playlist_id, None)
+        if sql is None:
+            return set()
+        cursor = self._conn().cursor()
+        cursor.row_factory = None
+        return {r[0] for r in cursor.execute(sql, args)}
+
+    def save_videos(self, playlist_id, videos, playlist_link=None, fetched_at=None):
+        # Replace the stored copy of a playlist's videos in one transaction
+        with self._conn() as conn:
+            conn.execute('DELETE FROM videos WHERE playlist_id = ?', (playlist_id,))
+            conn.executemany(
+                'INSERT INTO videos (playlist_id, position, video_id, title, added_ts, thumbnail) VALUES (?, ?, ?, ?, ?, ?)',
+                ((playlist_id, i, v.video_id, v.title, v.added_ts, v._thumbnail) for i, v in enumerate(videos)))
+        self.update_playlist(playlist_id, playlist_link=playlist_link, fetched_at=fetched_at or time.time())
+
+    def prepend_videos(self, playlist_id, videos, playlist_link=None, fetched_at=None):
+        # New videos at the top of a newest-first playlist take positions above the current
+        # first row, so the rows already stored are left as they are
+        with self._conn() as conn:
+            first = conn.execute('SELECT MIN(position) FROM videos WHERE playlist_id = ?', (playlist_id,)).fetchone()[0] or 0
+            conn.executemany(
+                'INSERT INTO videos (playlist_id, position, video_id, title, added_ts, thumbnail) VALUES (?, ?, ?, ?, ?, ?)',
+                ((playlist_id, first - len(videos) + i, v.video_id, v.title, v.added_ts, v._thumbnail) for i, v in enumerate(videos)))
+        self.update_playlist(playlist_id, playlist_link=playlist_link, fetched_at=fetched_at or time.time())
+
+    def get_video_details(self, video_ids, max_age=None):
+        # Returns {video_id: details} for the IDs we have, optionally only fresh ones
+        conn = self._conn()
+        min_fetched = time.time() - max_age if max_age is not None else 0
+        details = {}
+        for start in range(0, len(video_ids), 500):
+            chunk = video_ids[start:start + 500]
+            placeholders = ', '.join('?' for _ in chunk)
+            rows = conn.execute(
+                f'SELECT video_id, published_ts, duration, view_count, like_count FROM video_details '
+                f'WHERE video_id IN ({placeholders}) AND fetched_at >= ?',
+                (*chunk, min_fetched)).fetchall()
+            for r in rows:
+                details[r['video_id']] = dict(r)
+        return details
+
+    def save_video_details(self, details, fetched_at):
+        with self._conn() as conn:
+            conn.executemany(
+                'INSERT OR REPLACE INTO video_details (video_id, published_ts, duration, view_count, like_count, fetched_at) '
+                'VALUES (?, ?, ?, ?, ?, ?)',
+                ((d['video_id'], d['published_ts'], d['duration'], d['view_count'], d['like_count'], fetched_at) for d in details))
+
+    def get_page(self, playlist_id, page_token):
+        # Cached playlistItems page and its ETag, used for conditional revalidation
+        row = self._conn().execute('SELECT etag, page FROM page_cache WHERE playlist_id = ? AND page_token = ?',
+                                   (playlist_id, page_token or '')).fetchone()
+        if not row:
+            return None
+        return {'etag': row['etag'], 'page': json.loads(row['page'])}
+
+    def save_page(self, playlist_id, page_token, etag, page):
+        with self._conn() as conn:
+            conn.execute('INSERT OR REPLACE INTO page_cache (playlist_id, page_token, etag, page) VALUES (?, ?, ?, ?)',
+                         (playlist_id, page_token or '', etag, json.dumps(page)))
+
+    def get_watched(self, playlist_id):
+        rows = self._conn().execute('SELECT video_url FROM watched WHERE playlist_id = ?', (playlist_id,)).fetchall()
+        return set(r['video_url'] for r in rows)
+
+    def mark_watched(self, playlist_id, video_url):
+        self.mark_watched_many([(playlist_id, video_url, time.time())])
+
+    def mark_watched_many(self, events):
+        # (playlist_id, video_url, watched_at) tuples in one transaction; repeats are ignored
+        with self._conn() as conn:
+            conn.executemany('INSERT OR IGNORE INTO watched (playlist_id, video_url, watched_at) VALUES (?, ?, ?)', events)
+
+    def get_channel_for_handle(self, handle):
+        row = self._conn().execute('SELECT channel_id FROM channel_handles WHERE handle = ?', (handle.lower(),)).fetchone()
+        return row['channel_id'] if row else None
+
+    def save_channel_handle(self, handle, channel_id):
+        # A handle always points at the same channel, so the mapping is kept for good
+        with self._conn() as conn:
+            conn.execute('INSERT OR REPLACE INTO channel_handles (handle, channel_id, resolved_at) VALUES (?, ?, ?)',
+                         (handle.lower(), channel_id, time.time()))
+
+    def get_channel_playlists(self, channel_id, max_age=None):
+        # Stored playlist listing of a channel, or None if there is none (or it is older than max_age)
+        conn = self._conn()
+        row = conn.execute('SELECT fetched_at FROM channel_listings WHERE channel_id = ?', (channel_id,)).fetchone()
+        if not row or (max_age is not None and row['fetched_at'] < time.time() - max_age):
+            return None
+        rows = conn.execute('SELECT playlist_id, title, item_count, thumbnail FROM channel_playlists '
+                            'WHERE channel_id = ? ORDER BY position', (channel_id,)).fetchall()
+        return [dict(r) for r in rows]
+
+    def save_channel_playlists(self, channel_id, playlists):
+        with self._conn() as conn:
+            conn.execute('DELETE FROM channel_playlists WHERE channel_id = ?', (channel_id,))
+            conn.executemany(
+                'INSERT INTO channel_playlists (channel_id, position, playlist_id, title, item_count, thumbnail) VALUES (?, ?, ?, ?, ?, ?)',
+                ((channel_id, i, p['playlist_id'], p['title'], p['item_count'], p['thumbnail']) for i, p in enumerate(playlists)))
+            conn.execute('INSERT OR REPLACE INTO channel_listings (channel_id, fetched_at) VALUES (?, ?)', (channel_id, time.time()))
+
+    def get_meta(self, key):
+        row = self._conn().execute('SELECT value FROM store_meta WHERE key = ?', (key,)).fetchone()
+        return row['value'] if row else None
+
+    def set_meta(self, key, value):
+        with self._conn() as conn:
+            conn.execute('INSERT OR REPLACE INTO store_meta (key, value) VALUES (?, ?)', (key, value))
+
+    def import_legacy_memory(self, memory_dir):
+        # One-time import of the old per-playlist memory/<id>.json files
+        done = self.get_meta('legacy_memory_imported')
+        if done or not os.path.isdir(memory_dir):
+            return
+        for fname in os.listdir(memory_dir):
+            if not fname.endswith('.json'):
+                continue
+            playlist_id = fname[:-len('.json')]
+            try:
+                with open(os.path.join(memory_dir, fname), 'r', encoding='utf-8') as f:
+                    data = json.load(f)
+            except Exception:
+                continue
+            self.update_playlist(playlist_id, **{k: data.get(k) for k in PLAYLIST_FIELDS})
+            with self._conn() as conn:
+                conn.executemany('INSERT OR IGNORE INTO watched (playlist_id, video_url, watched_at) VALUES (?, ?, NULL)',
+                                 ((playlist_id, url) for url in data.get('clicked_vids', [])))
+        self.set_meta('legacy_memory_imported', '1')
+
+
+_store = None
+_store_lock = threading.Lock()
+
+
+def get_store():
+    global _store
+    with _store_lock:
+        if _store is None:
+            app_dir = get_app_data_dir()
+            _store = PlaylistStore(os.path.join(app_dir, 'playlists.db'))
+            _store.import_legacy_memory(os.path.join(app_dir, 'memory'))
+        return _store
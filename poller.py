@@ -0,0 +1,151 @@
+import time
+
+from PyQt5.QtCore import QObject, QTimer, pyqtSignal
+
+from app_logging import get_logger
+from helpers import count_new_videos, iter_playlist_item_counts, PLAYLISTS_PER_REQUEST
+from playlist_store import get_store
+from quota import get_scheduler
+from tasks import run_task
+from config import (
+    POLL_MIN_INTERVAL, POLL_MAX_INTERVAL, POLL_DEFAULT_INTERVAL, POLL_RATE_SMOOTHING,
+    POLL_TICK, POLL_STARTUP_DELAY, QUOTA_INTERACTIVE_RESERVE,
+)
+
+
+log = get_logger('poller')
+
+# Most playlists checked per wake-up; every 50 of them cost one quota unit
+POLL_MAX_PLAYLISTS = 10 * PLAYLISTS_PER_REQUEST
+
+
+def next_interval(upload_rate):
+    # About one expected upload between checks; dormant playlists drift to the maximum
+    if upload_rate is None:
+        return POLL_DEFAULT_INTERVAL
+    if upload_rate <= 0:
+        return POLL_MAX_INTERVAL
+    return min(max(1.0 / upload_rate, POLL_MIN_INTERVAL), POLL_MAX_INTERVAL)
+
+
+def update_poll(poll, playlist_id, item_count, now):
+    # Folds one observed item count into the playlist's upload rate (items per second)
+    rate = poll.get('upload_rate') if poll else None
+    if poll and poll.get('item_count') is not None and item_count is not None and poll.get('checked_at'):
+        elapsed = now - poll['checked_at']
+        if elapsed > 0:
+            observed = max(item_count - poll['item_count'], 0) / elapsed
+            if rate is None:
+                # Start from the default pace so one quiet stretch backs off gradually
+                rate = 1.0 / POLL_DEFAULT_INTERVAL
+            rate = POLL_RATE_SMOOTHING * observed + (1 - POLL_RATE_SMOOTHING) * rate
+    interval = next_interval(rate) if item_count is not None else POLL_MAX_INTERVAL
+    return {'playlist_id': playlist_id, 'item_count': item_count, 'checked_at': now,
+            'next_check_at': now + interval, 'upload_rate': rate}
+
+
+def check_new_videos(playlist_ids, progress):
+    # Reports (playlist_id, new_vids, error) through progress as each playlists.list batch comes back.
+    # Every check, manual or background, also feeds the playlists' upload rates.
+    store = get_store()
+    polls = store.get_polls()
+    for batch, counts, error in iter_playlist_item_counts(playlist_ids):
+        now = time.time()
+        if error:
+            # Try these again later rather than on every wake-up
+            for playlist_id in batch:
+                retry = dict(polls.get(playlist_id) or {'playlist_id': playlist_id, 'item_count': None,
+                                                        'checked_at': None, 'upload_rate': None})
+                retry['next_check_at'] = now + POLL_MIN_INTERVAL
+                polls[playlist_id] = retry
+            store.save_polls([polls[pid] for pid in batch])
+            for playlist_id in batch:
+                progress((playlist_id, None, error))
+            continue
+        new_counts = {}
+        results = []
+        for playlist_id in batch:
+            total = counts.get(playlist_id)
+            previous = polls.get(playlist_id)
+            polls[playlist_id] = update_poll(previous, playlist_id, total, now)
+            stored = store.get_playlist(playlist_id)
+            stored_count = stored.get('no_of_vids') if stored else None
+            if total is None or stored_count is None:
+                results.append((playlist_id, None, None))
+                continue
+            if total == stored_count:
+                new_vids = 0
+            elif previous and previous.get('item_count') == total and stored.get('new_vids_count') is not None:
+                # Unchanged since the last check, which already counted them
+                new_vids = stored['new_vids_count']
+            else:
+                # The item count only gives the net change, which removals offset; the new
+                # videos themselves are counted by ID (a page or two for uploads playlists)
+                new_vids, count_error = count_new_videos(playlist_id)
+                if count_error:
+                    # Left unknown, so the next check counts again rather than reusing it
+                    new_counts[playlist_id] = None
+                    results.append((playlist_id, None, count_error))
+                    continue
+            new_counts[playlist_id] = new_vids
+            results.append((playlist_id, new_vids, None))
+        store.set_new_vids_counts(new_counts)
+        store.save_polls([polls[pid] for pid in batch])
+        for result in results:
+            progress(result)
+    return None, None
+
+
+def due_playlists(store, now, limit=POLL_MAX_PLAYLISTS):
+    # Tracked playlists whose next check has come, most overdue first; never-checked ones lead
+    polls = store.get_polls()
+    due = []
+    for p in store.list_playlists():
+        poll = polls.get(p['playlist_id'])
+        next_at = poll['next_check_at'] if poll and poll['next_check_at'] is not None else 0
+        if next_at <= now:
+            due.append((next_at, p['playlist_id']))
+    due.sort()
+    return [pid for _, pid in due[:limit]]
+
+
+class AdaptivePoller(QObject):
+    # Wakes up on a GUI-thread timer and checks the due playlists on the task pool at
+    # background priority, so a poll never competes with what the user is waiting for
+    checked = pyqtSignal(object)  # (playlist_id, new_vids, error), as check_new_videos reports
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._timer = QTimer(self)
+        self._timer.setSingleShot(True)
+        self._timer.timeout.connect(self.poll)
+        self._running = False
+
+    def start(self):
+        self._timer.start(POLL_STARTUP_DELAY * 1000)
+
+    def stop(self):
+        self._timer.stop()
+
+    def poll(self):
+        if self._running:
+            return
+        usage = get_scheduler().usage()
+        if usage['remaining'] <= QUOTA_INTERACTIVE_RESERVE:
+            log.debug('Skipping background poll: %d quota units left', usage['remaining'])
+            self._timer.start(POLL_TICK * 1000)
+            return
+        playlist_ids = due_playlists(get_store(), time.time())
+        if not playlist_ids:
+            self._timer.start(POLL_TICK * 1000)
+            return
+        log.debug('Polling %d playlists for new videos', len(playlist_ids))
+        self._running = True
+        run_task(check_new_videos, playlist_ids,
+                 on_progress=self.checked.emit,
+                 on_error=lambda error: log.warning('Background poll failed: %s', error),
+                 on_finished=self._on_finished)
+
+    def _on_finished(self):
+        self._running = False
+        self._timer.start(POLL_TICK * 1000)
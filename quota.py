@@ -0,0 +1,150 @@
+import json
+import time
+import threading
+from datetime import datetime, timedelta, timezone
+
+import requests
+
+from app_logging import get_logger
+from playlist_store import get_store
+from config import DAILY_QUOTA_BUDGET, QUOTA_INTERACTIVE_RESERVE, QUOTA_BACKGROUND_BURST, QUOTA_BACKGROUND_MAX_WAIT
+
+
+log = get_logger('quota')
+
+# Request priorities. Interactive requests (the user waiting on a sort) are never
+# paced; background ones (checks, prefetch, enrichment) yield to them and are
+# rate-limited so they cannot drain the day's quota.
+INTERACTIVE = 'interactive'
+BACKGROUND = 'background'
+
+# Quota units per call of each YouTube Data API endpoint
+ENDPOINT_COSTS = {
+    'playlistItems': 1,
+    'playlists': 1,
+    'channels': 1,
+    'videos': 1,
+    'search': 100,
+}
+
+# The daily quota resets at midnight Pacific time
+try:
+    from zoneinfo import ZoneInfo
+    _QUOTA_TZ = ZoneInfo('America/Los_Angeles')
+except Exception:
+    _QUOTA_TZ = timezone(timedelta(hours=-8))
+
+
+def quota_day(now=None):
+    return datetime.fromtimestamp(time.time() if now is None else now, _QUOTA_TZ).strftime('%Y-%m-%d')
+
+
+class QuotaExceeded(requests.RequestException):
+    # Raised instead of sending a request the budget cannot cover
+    pass
+
+
+class QuotaScheduler:
+    # Tracks the units spent today against a daily budget. Background requests
+    # draw from a token bucket refilled at budget/day and may not touch the last
+    # `reserve` units, which are kept for interactive use.
+    def __init__(self, budget=DAILY_QUOTA_BUDGET, reserve=QUOTA_INTERACTIVE_RESERVE,
+                 burst=QUOTA_BACKGROUND_BURST, max_wait=QUOTA_BACKGROUND_MAX_WAIT, store=None):
+        self.budget = budget
+        self.reserve = min(reserve, budget)
+        self.burst = burst
+        self.max_wait = max_wait
+        self.rate = budget / 86400.0  # units per second
+        self.store = store
+        self._cond = threading.Condition()
+        self._interactive_active = 0
+        self._tokens = float(burst)
+        self._refilled_at = time.monotonic()
+        self._day = quota_day()
+        self._used = 0
+        if store is not None:
+            saved = store.get_meta('quota_usage')
+            if saved:
+                saved = json.loads(saved)
+                if saved.get('day') == self._day:
+                    self._used = saved.get('used', 0)
+
+    def _roll_day(self):
+        day = quota_day()
+        if day != self._day:
+            log.info('Quota day %s ended with %d/%d units used', self._day, self._used, self.budget)
+            self._day = day
+            self._used = 0
+            self._save()
+
+    def _refill(self):
+        now = time.monotonic()
+        self._tokens = min(self.burst, self._tokens + (now - self._refilled_at) * self.rate)
+        self._refilled_at = now
+
+    def _save(self):
+        if self.store is not None:
+            self.store.set_meta('quota_usage', json.dumps({'day': self._day, 'used': self._used}))
+
+    def acquire(self, endpoint, priority=INTERACTIVE):
+        # Reserves the endpoint's cost, waiting if a background request has to; returns the cost
+        cost = ENDPOINT_COSTS.get(endpoint, 1)
+        with self._cond:
+            self._roll_day()
+            if priority == INTERACTIVE:
+                if self._used + cost > self.budget:
+                    raise QuotaExceeded(f'Daily quota budget used up ({self._used}/{self.budget} units); it resets at midnight Pacific time.')
+                self._interactive_active += 1
+            else:
+                deadline = time.monotonic() + self.max_wait
+                while True:
+                    self._roll_day()
+                    self._refill()
+                    if self._used + cost > self.budget - self.reserve:
+                        raise QuotaExceeded(f'Background quota used up ({self._used}/{self.budget} units, {self.reserve} kept for interactive use).')
+                    if not self._interactive_active and self._tokens >= cost:
+                        break
+                    remaining = deadline - time.monotonic()
+                    if remaining <= 0:
+                        raise QuotaExceeded('Background requests are being throttled to stay within the daily quota.')
+                    wait = remaining if self._interactive_active else min(remaining, (cost - self._tokens) / self.rate)
+                    self._cond.wait(wait)
+            self._refill()
+            self._tokens = max(self._tokens - cost, 0.0)
+            self._used += cost
+            self._save()
+        return cost
+
+    def release(self, priority=INTERACTIVE):
+        if priority == INTERACTIVE:
+            with self._cond:
+                self._interactive_active -= 1
+                self._cond.notify_all()
+
+    def mark_exhausted(self):
+        # The API itself reported quotaExceeded: stop sending until the day rolls over
+        with self._cond:
+            self._roll_day()
+            if self._used < self.budget:
+                log.warning('API reported quotaExceeded at %d/%d tracked units', self._used, self.budget)
+                self._used = self.budget
+                self._save()
+            self._cond.notify_all()
+
+    def usage(self):
+        with self._cond:
+            self._roll_day()
+            return {'day': self._day, 'used': self._used, 'budget': self.budget,
+                    'remaining': max(self.budget - self._used, 0)}
+
+
+_scheduler = None
+_scheduler_lock = threading.Lock()
+
+
+def get_scheduler():
+    global _scheduler
+    with _scheduler_lock:
+        if _scheduler is None:
+            _scheduler = QuotaScheduler(store=get_store())
+        return _scheduler
@@ -0,0 +1,230 @@
+import os
+import sys
+import mmap
+import zlib
+import struct
+from array import array
+from collections.abc import Sequence
+
+from app_logging import get_logger
+from playlist_store import get_store, get_app_data_dir
+from video_record import VideoRecord
+from config import SNAPSHOT_CODEC
+
+try:
+    import zstandard
+except ImportError:
+    zstandard = None
+
+
+log = get_logger('snapshot')
+
+# Read-only copy of one playlist's videos, written after each fetch and memory-mapped on open,
+# so showing a stored playlist costs neither SQL rows nor parsing. Layout (little-endian):
+#
+#   header    magic, version, codec, video count, playlist fetched_at, string section sizes
+#   columns   added_ts, published_ts, duration, view_count, like_count: int64 each, NONE for missing
+#   ends      uint32 end offset of every video_id, title and thumbnail in the string section
+#   strings   UTF-8, stored as is or compressed as a whole (codec 1 = zlib, 2 = zstd)
+#
+# Numbers and offsets are read straight from the mapping; strings only for the rows shown.
+MAGIC = b'YTSN'
+VERSION = 1
+HEADER = struct.Struct('<4sHHIdQQ4x')
+COLUMNS = ('added_ts', 'published_ts', 'duration', 'view_count', 'like_count')
+STRINGS_PER_VIDEO = 3  # video_id, title, non-standard thumbnail
+NONE = -2 ** 63
+
+CODEC_NONE, CODEC_ZLIB, CODEC_ZSTD = 0, 1, 2
+
+
+class SnapshotError(ValueError):
+    pass
+
+
+def _int_array(values):
+    a = array('q', values)
+    if sys.byteorder != 'little':
+        a.byteswap()
+    return a
+
+
+def _int_view(buf, typecode):
+    if sys.byteorder == 'little':
+        return buf.cast(typecode)
+    a = array(typecode)
+    a.frombytes(buf)
+    a.byteswap()
+    return a
+
+
+def _pick_codec(codec):
+    if codec == 'zstd':
+        if zstandard is not None:
+            return CODEC_ZSTD
+        codec = 'zlib'  # zstandard is optional; zlib is always there
+    return CODEC_ZLIB if codec == 'zlib' else CODEC_NONE
+
+
+def write_snapshot(path, videos, fetched_at, codec=SNAPSHOT_CODEC):
+    # Returns whether the file was written; on failure any existing snapshot is left as it was
+    count = len(videos)
+    columns = [_int_array(NONE if getattr(v, name) is None else getattr(v, name) for v in videos) for name in COLUMNS]
+    ends = array('I')
+    parts = []
+    size = 0
+    for v in videos:
+        for s in (v.video_id, v.title or '', v._thumbnail or ''):
+            b = s.encode('utf-8')
+            parts.append(b)
+            size += len(b)
+            ends.append(size)
+    if sys.byteorder != 'little':
+        ends.byteswap()
+    strings = b''.join(parts)
+    codec_id = _pick_codec(codec)
+    if codec_id == CODEC_ZSTD:
+        stored = zstandard.ZstdCompressor().compress(strings)
+    elif codec_id == CODEC_ZLIB:
+        stored = zlib.compress(strings, 6)
+    else:
+        stored = strings
+    tmp_path = path + '.tmp'
+    try:
+        with open(tmp_path, 'wb') as f:
+            f.write(HEADER.pack(MAGIC, VERSION, codec_id, count, fetched_at or 0.0, len(stored), len(strings)))
+            for column in columns:
+                f.write(column.tobytes())
+            f.write(ends.tobytes())
+            f.write(stored)
+        os.replace(tmp_path, path)
+    except OSError as e:
+        # On Windows the file cannot be replaced while a loaded copy still maps it
+        log.info('Snapshot %s not written: %s', path, e)
+        try:
+            os.remove(tmp_path)
+        except OSError:
+            pass
+        return False
+    return True
+
+
+class Snapshot(Sequence):
+    # Videos of a snapshot file; VideoRecords are built on first access and kept
+    def __init__(self, path):
+        with open(path, 'rb') as f:
+            self._mm = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        self._view = view = memoryview(self._mm)
+        if len(view) < HEADER.size:
+            raise SnapshotError(f'{path}: truncated header')
+        magic, version, codec_id, count, self.fetched_at, stored_len, raw_len = HEADER.unpack_from(view)
+        if magic != MAGIC or version != VERSION:
+            raise SnapshotError(f'{path}: not a version {VERSION} snapshot')
+        offset = HEADER.size
+        self._columns = {}
+        for name in COLUMNS:
+            self._columns[name] = _int_view(view[offset:offset + count * 8], 'q')
+            offset += count * 8
+        self._ends = _int_view(view[offset:offset + count * STRINGS_PER_VIDEO * 4], 'I')
+        offset += count * STRINGS_PER_VIDEO * 4
+        if offset + stored_len != len(view):
+            raise SnapshotError(f'{path}: size does not match its header')
+        stored = view[offset:]
+        if codec_id == CODEC_ZSTD:
+            if zstandard is None:
+                raise SnapshotError(f'{path}: zstd-compressed, but zstandard is not installed')
+            self._strings = zstandard.ZstdDecompressor().decompress(stored, max_output_size=raw_len)
+        elif codec_id == CODEC_ZLIB:
+            self._strings = zlib.decompress(stored)
+        else:
+            self._strings = stored
+        self._count = count
+        self._records = [None] * count
+
+    def __len__(self):
+        return self._count
+
+    def close(self):
+        # Unmaps the file; only for snapshots nothing else refers to any more
+        for buf in (*self._columns.values(), self._ends, self._strings, self._view):
+            if isinstance(buf, memoryview):
+                buf.release()
+        self._mm.close()
+
+    def _string(self, i, field):
+        k = i * STRINGS_PER_VIDEO + field
+        start = self._ends[k - 1] if k else 0
+        return bytes(self._strings[start:self._ends[k]]).decode('utf-8')
+
+    def _int(self, name, i):
+        value = self._columns[name][i]
+        return None if value == NONE else value
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(self._count))]
+        if i < 0:
+            i += self._count
+        if not 0 <= i < self._count:
+            raise IndexError('Snapshot index out of range')
+        record = self._records[i]
+        if record is None:
+            record = self._records[i] = VideoRecord(
+                self._string(i, 1), self._string(i, 0), self._int('added_ts', i), self._string(i, 2) or None,
+                self._int('published_ts', i), self._int('duration', i), self._int('view_count', i), self._int('like_count', i))
+        return record
+
+    def sort_key(self, key):
+        # Index -> key with the same ordering as sort_index.SORT_KEYS, read from the columns
+        added = self._columns['added_ts']
+        if key == 'added':
+            return added.__getitem__
+        if key == 'published':
+            published = self._columns['published_ts']
+            return lambda i: (published[i] if published[i] != NONE else added[i], added[i])
+        if key == 'title':
+            return lambda i: (self._string(i, 1).casefold(), added[i])
+        column = self._columns[{'duration': 'duration', 'views': 'view_count'}[key]]
+        return lambda i: (column[i] if column[i] != NONE else -1, added[i])
+
+
+def snapshot_path(playlist_id):
+    snapshot_dir = os.path.join(get_app_data_dir(), 'snapshots')
+    os.makedirs(snapshot_dir, exist_ok=True)
+    return os.path.join(snapshot_dir, f'{playlist_id}.snap')
+
+
+def save_playlist_snapshot(playlist_id, videos, fetched_at, store=None):
+    # fetched_at is that of the stored copy the videos were read from or synced into; the
+    # snapshot is tagged with it, so a later fetch makes it stale. Videos that a later fetch
+    # has already replaced are not written at all, leaving any newer snapshot in place.
+    # Returns whether the snapshot was written.
+    store = store or get_store()
+    playlist = store.get_playlist(playlist_id)
+    if not fetched_at or fetched_at != (playlist.get('fetched_at') if playlist else None):
+        log.debug('Not snapshotting %s: its videos are from an earlier fetch', playlist_id)
+        return False
+    return write_snapshot(snapshot_path(playlist_id), videos, fetched_at)
+
+
+def load_playlist_videos(playlist_id, store=None):
+    # The stored playlist's videos, from its snapshot when that is current, otherwise from
+    # the store (writing a fresh snapshot for next time)
+    store = store or get_store()
+    playlist = store.get_playlist(playlist_id)
+    fetched_at = playlist.get('fetched_at') if playlist else None
+    path = snapshot_path(playlist_id)
+    if fetched_at and os.path.exists(path):
+        try:
+            snapshot = Snapshot(path)
+            if snapshot.fetched_at == fetched_at:
+                return snapshot
+            log.debug('Snapshot of %s is stale', playlist_id)
+            snapshot.close()
+        except (OSError, SnapshotError) as e:
+            log.warning('Ignoring unreadable snapshot of %s: %s', playlist_id, e)
+    # fetched_at was read first: a sync landing in between makes the rows newer than the
+    # tag, never older, and that snapshot is then simply not written
+    videos = store.get_videos(playlist_id)
+    save_playlist_snapshot(playlist_id, videos, fetched_at, store)
+    return videos
@@ -0,0 +1,79 @@
+from array import array
+from collections.abc import Sequence
+
+
+# Sort keys offered for a playlist. Every key ends with added time, and the sorts are
+# stable, so remaining ties keep playlist position order.
+def _published(v):
+    return (v.published_ts if v.published_ts is not None else v.added_ts, v.added_ts)
+
+
+SORT_KEYS = {
+    'added': lambda v: v.added_ts,
+    'published': _published,
+    'title': lambda v: (v.title.casefold(), v.added_ts),
+    'duration': lambda v: (v.duration if v.duration is not None else -1, v.added_ts),
+    'views': lambda v: (v.view_count if v.view_count is not None else -1, v.added_ts),
+}
+
+
+class SortedView(Sequence):
+    # Read-only view of videos through a permutation; descending just reads it backwards
+    __slots__ = ('_videos', '_order', '_reverse')
+
+    def __init__(self, videos, order, reverse=False):
+        self._videos = videos
+        self._order = order
+        self._reverse = reverse
+
+    def __len__(self):
+        return len(self._order)
+
+    def __getitem__(self, i):
+        if isinstance(i, slice):
+            return [self[j] for j in range(*i.indices(len(self)))]
+        n = len(self._order)
+        if i < 0:
+            i += n
+        if not 0 <= i < n:
+            raise IndexError('SortedView index out of range')
+        if self._reverse:
+            i = n - 1 - i
+        return self._videos[self._order[i]]
+
+    def __iter__(self):
+        videos = self._videos
+        order = reversed(self._order) if self._reverse else self._order
+        return (videos[i] for i in order)
+
+    def reversed(self):
+        return SortedView(self._videos, self._order, not self._reverse)
+
+
+class SortIndex:
+    # Ascending orderings of one loaded playlist, computed on first use per key.
+    # Sources with their own sort_key(key) (snapshots) are sorted by index, without
+    # building every video.
+    def __init__(self, videos):
+        self.videos = videos if hasattr(videos, 'sort_key') else list(videos)
+        self._orders = {}
+
+    def order(self, key):
+        order = self._orders.get(key)
+        if order is None:
+            videos = self.videos
+            if hasattr(videos, 'sort_key'):
+                index_key = videos.sort_key(key)
+            else:
+                key_fn = SORT_KEYS[key]
+                index_key = lambda i: key_fn(videos[i])
+            # sorted() is stable, so equal keys keep playlist position order
+            order = array('I', sorted(range(len(videos)), key=index_key))
+            self._orders[key] = order
+        return order
+
+    def view(self, key, ascending=True):
+        return SortedView(self.videos, self.order(key), reverse=not ascending)
+
+    def __len__(self):
+        return len(self.videos)
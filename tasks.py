@@ -0,0 +1,103 @@
+from PyQt5.QtCore import QObject, QRunnable, QThreadPool, pyqtSignal
+
+from app_logging import get_logger
+from cancel import Cancelled, CancelToken
+
+
+log = get_logger('tasks')
+
+
+class TaskSignals(QObject):
+    result = pyqtSignal(object)    # the function's value
+    error = pyqtSignal(str)        # its error message, or the exception text
+    progress = pyqtSignal(object)  # whatever the function passes to its progress callback
+    finished = pyqtSignal()        # always last, after result or error
+
+
+# Runs a function on the shared QThreadPool and reports back through queued signals,
+# so connected slots run on the GUI thread. Functions follow the helpers convention of
+# returning (value, error); a truthy error goes to `error`, anything else to `result`.
+# With with_progress=True the function also gets a `progress` keyword callback, and with
+# cancellable=True a `cancel` keyword CancelToken. Once a task is cancelled it reports
+# nothing but `finished`, whether the function noticed (raising Cancelled) or not.
+class Task(QRunnable):
+    def __init__(self, fn, *args, with_progress=False, cancellable=False, **kwargs):
+        super().__init__()
+        self.fn = fn
+        self.args = args
+        self.kwargs = kwargs
+        self.signals = TaskSignals()
+        self.cancel_token = CancelToken()
+        if with_progress:
+            self.kwargs['progress'] = self._progress
+        if cancellable:
+            self.kwargs['cancel'] = self.cancel_token
+
+    @property
+    def cancelled(self):
+        return self.cancel_token.cancelled
+
+    def cancel(self):
+        self.cancel_token.cancel()
+
+    def _emit(self, name, *args):
+        try:
+            getattr(self.signals, name).emit(*args)
+        except RuntimeError:
+            # The application has quit and deleted the signals object under a running task
+            log.debug('Task %s outlived the application', getattr(self.fn, '__name__', self.fn))
+
+    def _progress(self, value):
+        if not self.cancelled:
+            self._emit('progress', value)
+
+    def run(self):
+        try:
+            if self.cancelled:
+                return
+            try:
+                value, error = self.fn(*self.args, **self.kwargs)
+            except Cancelled:
+                log.debug('Task %s cancelled', getattr(self.fn, '__name__', self.fn))
+                return
+            except Exception as e:
+                log.exception('Task %s failed', getattr(self.fn, '__name__', self.fn))
+                value, error = None, e
+            if self.cancelled:
+                return
+            if error:
+                self._emit('error', str(error))
+            else:
+                self._emit('result', value)
+        finally:
+            self._emit('finished')
+
+
+# Tasks stay referenced until their finished signal has been handled, so the
+# signals object outlives any queued emissions still waiting on the GUI thread
+_active_tasks = set()
+
+
+def run_task(fn, *args, on_result=None, on_error=None, on_progress=None, on_finished=None,
+             cancellable=False, **kwargs):
+    # Must be called from the GUI thread; returns the started Task
+    task = Task(fn, *args, with_progress=on_progress is not None, cancellable=cancellable, **kwargs)
+    if on_result is not None:
+        task.signals.result.connect(on_result)
+    if on_error is not None:
+        task.signals.error.connect(on_error)
+    if on_progress is not None:
+        task.signals.progress.connect(on_progress)
+    if on_finished is not None:
+        task.signals.finished.connect(on_finished)
+    task.signals.finished.connect(lambda: _active_tasks.discard(task))
+    task.setAutoDelete(False)
+    _active_tasks.add(task)
+    QThreadPool.globalInstance().start(task)
+    return task
+
+
+def cancel_all_tasks():
+    # On shutdown: cancelled tasks stop at their next check and report nothing more
+    for task in list(_active_tasks):
+        task.cancel()
@@ -0,0 +1,32 @@
+import os
+import sys
+
+import pytest
+
+# The app's modules live at the top of the repository, not in a package
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import api_client
+import playlist_store
+from api_client import YouTubeApiClient
+from fake_api import FakeYouTubeApi
+from quota import QuotaScheduler
+
+
+@pytest.fixture
+def store(tmp_path, monkeypatch):
+    # A fresh database (and app data directory) per test, used by everything calling get_store()
+    monkeypatch.setenv('APPDATA', str(tmp_path))
+    store = playlist_store.PlaylistStore(str(tmp_path / 'playlists.db'))
+    monkeypatch.setattr(playlist_store, '_store', store)
+    return store
+
+
+@pytest.fixture
+def api(store, monkeypatch):
+    # The fake YouTube Data API on a local port, with the shared client pointed at it
+    fake = FakeYouTubeApi()
+    client = YouTubeApiClient(base_url=fake.start(), scheduler=QuotaScheduler())
+    monkeypatch.setattr(api_client, '_client', client)
+    yield fake
+    fake.stop()
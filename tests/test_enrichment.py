@@ -0,0 +1,58 @@
+import time
+import threading
+
+import pytest
+
+from cancel import Cancelled, CancelToken
+from enrichment import enrich_videos, parse_duration
+from fake_api import make_video_id
+from video_record import VideoRecord
+
+
+def video_requests(api):
+    return [entry for entry in api.request_log if entry[0] == 'videos']
+
+
+def test_parse_duration():
+    assert parse_duration('PT1H2M3S') == 3723
+    assert parse_duration('P1DT5M') == 86700
+    assert parse_duration('PT45S') == 45
+    assert parse_duration('not a duration') is None
+
+
+def test_details_are_fetched_once_per_video(api):
+    videos = [VideoRecord(f'Video {n}', make_video_id(n), 1_600_000_000 + n) for n in range(120)]
+    videos, error = enrich_videos(videos)
+    assert error is None
+    assert len(video_requests(api)) == 3
+    assert all(v.published_ts is not None and v.duration is not None for v in videos)
+    api.request_log.clear()
+    enrich_videos([VideoRecord(v.title, v.video_id, v.added_ts) for v in videos])
+    assert video_requests(api) == []
+
+
+def test_unavailable_videos_are_not_requested_again(api, store):
+    videos = [VideoRecord('Live', make_video_id(1), 1), VideoRecord('Deleted video', 'deleted0001', 2)]
+    videos, error = enrich_videos(videos)
+    assert error is None
+    assert videos[0].duration is not None and videos[1].duration is None
+    assert 'deleted0001' in store.get_video_details(['deleted0001'])
+    api.request_log.clear()
+    enrich_videos([VideoRecord('Deleted video', 'deleted0001', 2)])
+    assert video_requests(api) == []
+
+
+def test_cancelled_enrichment_stops_requesting_and_storing(api, store):
+    api.latency = 0.1
+    videos = [VideoRecord(f'Video {n}', make_video_id(n), n) for n in range(2000)]
+    cancel = CancelToken()
+    threading.Timer(0.15, cancel.cancel).start()
+    with pytest.raises(Cancelled):
+        enrich_videos(videos, cancel=cancel)
+    time.sleep(0.3)  # batches already on the wire finish, but nothing new is sent
+    sent = len(video_requests(api))
+    assert sent < 40
+    time.sleep(0.3)
+    assert len(video_requests(api)) == sent
+    assert all(v.duration is None for v in videos)
+    assert len(store.get_video_details([v.video_id for v in videos])) < 2000
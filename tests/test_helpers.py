@@ -0,0 +1,52 @@
+from fake_api import make_video_id
+from helpers import fetch_playlist_items, iter_playlist_pages
+
+
+def statuses(api):
+    return [status for endpoint, status, _ in api.request_log if endpoint == 'playlistItems']
+
+
+def video_ids(videos):
+    return [v.video_id for v in videos]
+
+
+def test_fetch_returns_every_page_in_order(api):
+    api.add_playlist('PLtest', 120)
+    videos, error = fetch_playlist_items('PLtest')
+    assert error is None
+    assert video_ids(videos) == [make_video_id(n) for n in range(120)]
+    assert statuses(api) == [200, 200, 200]
+
+
+def test_unchanged_pages_are_revalidated_by_etag(api):
+    api.add_playlist('PLtest', 120)
+    first, _ = fetch_playlist_items('PLtest')
+    api.request_log.clear()
+    second, error = fetch_playlist_items('PLtest')
+    assert error is None
+    assert statuses(api) == [304, 304, 304]
+    assert [v.to_row() for v in second] == [v.to_row() for v in first]
+
+
+def test_changed_pages_are_fetched_again(api):
+    api.add_playlist('PLtest', 120)
+    fetch_playlist_items('PLtest')
+    api.append_videos('PLtest', 1)
+    api.request_log.clear()
+    videos, error = fetch_playlist_items('PLtest')
+    assert error is None
+    # totalResults is on every page, so a new video changes them all
+    assert statuses(api) == [200, 200, 200]
+    assert len(videos) == 121
+
+
+def test_pages_report_total_results(api):
+    api.add_playlist('PLtest', 75)
+    pages = list(iter_playlist_pages('PLtest'))
+    assert [(len(page), total, error) for page, total, error in pages] == [(50, 75, None), (25, 75, None)]
+
+
+def test_unknown_playlist_is_an_error(api):
+    videos, error = fetch_playlist_items('PLmissing')
+    assert videos is None
+    assert error.startswith('API Error')
@@ -0,0 +1,25 @@
+from video_record import VideoRecord
+
+
+def make_videos(prefix, titles):
+    return [VideoRecord(title, f'{prefix}{i:03d}', 1_600_000_000 + i) for i, title in enumerate(titles)]
+
+
+def test_title_search_matches_word_prefixes(store):
+    store.save_videos('PLa', make_videos('a', ['Guitar lesson one', 'Piano basics', 'Guitar solos live']))
+    store.save_videos('PLb', make_videos('b', ['Live guitar lessons']))
+    assert store.search_video_ids('guit les') == {'a000', 'b000'}
+    assert store.search_video_ids('guitar', playlist_id='PLa') == {'a000', 'a002'}
+    assert [(pid, v.title) for pid, v in store.search_videos('piano')] == [('PLa', 'Piano basics')]
+
+
+def test_title_search_survives_vacuum(store):
+    store.save_videos('PLa', make_videos('a', [f'Alpha {i}' for i in range(50)]))
+    store.save_videos('PLb', make_videos('b', [f'Beta {i}' for i in range(50)]))
+    # Replacing PLa leaves a gap of deleted rows before PLb's, which VACUUM would close up
+    store.save_videos('PLa', make_videos('a', ['Gamma']))
+    with store._conn() as conn:
+        conn.execute('VACUUM')
+    assert store.search_video_ids('beta 7') == {'b007'}
+    assert store.search_video_ids('gamma') == {'a000'}
+    assert store.search_video_ids('alpha') == set()
@@ -0,0 +1,53 @@
+from helpers import sync_playlist_items
+from poller import check_new_videos
+
+
+def endpoints(api):
+    return [endpoint for endpoint, _, _ in api.request_log]
+
+
+def track(store, playlist_id):
+    # Stored as after sorting it in the app
+    sync, _ = sync_playlist_items(playlist_id)
+    store.update_playlist(playlist_id, no_of_vids=len(sync.videos))
+
+
+def check(playlist_id):
+    results = []
+    check_new_videos([playlist_id], results.append)
+    return results
+
+
+def test_new_videos_are_counted_by_video_id(api, store):
+    api.add_playlist('PLtest', 60)
+    track(store, 'PLtest')
+    # Two added and one removed: the item count only grows by one
+    api.remove_videos('PLtest', [3])
+    api.append_videos('PLtest', 2)
+    assert check('PLtest') == [('PLtest', 2, None)]
+    assert store.get_playlist('PLtest')['new_vids_count'] == 2
+    # Nothing was stored, so the next sync still finds them as added
+    sync, _ = sync_playlist_items('PLtest')
+    assert len(sync.added) == 2
+
+
+def test_uploads_count_stops_at_the_first_known_video(api, store):
+    api.add_playlist('UUtest', 500)
+    track(store, 'UUtest')
+    api.upload_videos('UUtest', 3)
+    api.remove_videos('UUtest', [300])
+    api.request_log.clear()
+    assert check('UUtest') == [('UUtest', 3, None)]
+    assert endpoints(api) == ['playlists', 'playlistItems']
+    # The item count has not moved since, so the next check reuses the count
+    api.request_log.clear()
+    assert check('UUtest') == [('UUtest', 3, None)]
+    assert endpoints(api) == ['playlists']
+
+
+def test_unchanged_item_count_is_not_paged(api, store):
+    api.add_playlist('PLtest', 60)
+    track(store, 'PLtest')
+    api.request_log.clear()
+    assert check('PLtest') == [('PLtest', 0, None)]
+    assert endpoints(api) == ['playlists']
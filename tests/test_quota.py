@@ -0,0 +1,80 @@
+import json
+
+import pytest
+
+from api_client import get_client
+from helpers import fetch_playlist_items
+from quota import BACKGROUND, INTERACTIVE, QuotaExceeded, QuotaScheduler
+
+
+def test_interactive_requests_may_use_the_whole_budget():
+    scheduler = QuotaScheduler(budget=10, reserve=5, burst=0)
+    for _ in range(10):
+        scheduler.acquire('playlistItems', INTERACTIVE)
+        scheduler.release(INTERACTIVE)
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire('playlistItems', INTERACTIVE)
+    assert scheduler.usage()['remaining'] == 0
+
+
+def test_background_requests_leave_the_reserve():
+    scheduler = QuotaScheduler(budget=10, reserve=4, burst=100)
+    for _ in range(6):
+        scheduler.acquire('videos', BACKGROUND)
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire('videos', BACKGROUND)
+    # Interactive use can still spend what was kept back
+    scheduler.acquire('videos', INTERACTIVE)
+    scheduler.release(INTERACTIVE)
+
+
+def test_background_burst_is_throttled_once_spent():
+    scheduler = QuotaScheduler(budget=10000, reserve=0, burst=3, max_wait=0.05)
+    for _ in range(3):
+        scheduler.acquire('videos', BACKGROUND)
+    with pytest.raises(QuotaExceeded, match='throttled'):
+        scheduler.acquire('videos', BACKGROUND)
+
+
+def test_endpoint_costs_are_charged():
+    scheduler = QuotaScheduler(budget=1000, reserve=0, burst=0)
+    scheduler.acquire('search', INTERACTIVE)
+    scheduler.release(INTERACTIVE)
+    assert scheduler.usage()['used'] == 100
+
+
+def test_api_reported_exhaustion_stops_all_requests():
+    scheduler = QuotaScheduler(budget=1000, reserve=0, burst=100)
+    scheduler.mark_exhausted()
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire('videos', INTERACTIVE)
+    with pytest.raises(QuotaExceeded):
+        scheduler.acquire('videos', BACKGROUND)
+
+
+def test_usage_survives_a_restart(store):
+    scheduler = QuotaScheduler(budget=1000, store=store)
+    for _ in range(7):
+        scheduler.acquire('playlistItems', INTERACTIVE)
+        scheduler.release(INTERACTIVE)
+    assert json.loads(store.get_meta('quota_usage'))['used'] == 7
+    assert QuotaScheduler(budget=1000, store=store).usage()['used'] == 7
+
+
+def test_client_requests_are_charged(api):
+    api.add_playlist('PLtest', 120)
+    scheduler = get_client().scheduler
+    fetch_playlist_items('PLtest')
+    assert scheduler.usage()['used'] == 3
+    # A 304 revalidation is charged like any other call
+    fetch_playlist_items('PLtest')
+    assert scheduler.usage()['used'] == 6
+
+
+def test_exhausted_quota_fails_without_a_request(api):
+    api.add_playlist('PLtest', 120)
+    get_client().scheduler.mark_exhausted()
+    videos, error = fetch_playlist_items('PLtest')
+    assert videos is None
+    assert error.startswith('Quota Error')
+    assert api.request_log == []
@@ -0,0 +1,147 @@
+import os
+import struct
+
+import pytest
+
+import snapshot as snapshot_module
+from snapshot import (CODEC_ZLIB, HEADER, VERSION, Snapshot, SnapshotError, load_playlist_videos,
+                      save_playlist_snapshot, snapshot_path, write_snapshot)
+from sort_index import SORT_KEYS
+from video_record import VideoRecord
+
+
+FIELDS = ('title', 'video_id', 'added_ts', '_thumbnail', 'published_ts', 'duration', 'view_count', 'like_count')
+
+
+def make_videos(count):
+    videos = []
+    for n in range(count):
+        videos.append(VideoRecord(
+            f'Vidéo {n % 7} ✓', f'vid{n:08d}', 1_600_000_000 + (n * 7919) % 1000,
+            thumbnail='https://example.com/custom.jpg' if n % 5 == 0 else None,
+            published_ts=None if n % 3 == 0 else 1_500_000_000 + n,
+            duration=None if n % 4 == 0 else n % 600,
+            view_count=(n * 31) % 97, like_count=None))
+    return videos
+
+
+def rows(videos):
+    return [tuple(getattr(v, f) for f in FIELDS) for v in videos]
+
+
+@pytest.mark.parametrize('codec', [None, 'zlib'])
+def test_round_trip(tmp_path, codec):
+    videos = make_videos(200)
+    path = str(tmp_path / 'test.snap')
+    write_snapshot(path, videos, 123.5, codec=codec)
+    snapshot = Snapshot(path)
+    try:
+        assert snapshot.fetched_at == 123.5
+        assert len(snapshot) == 200
+        assert rows(snapshot) == rows(videos)
+        assert rows(snapshot[-3:]) == rows(videos[-3:])
+        with pytest.raises(IndexError):
+            snapshot[200]
+    finally:
+        snapshot.close()
+
+
+def test_zstd_falls_back_to_zlib_without_zstandard(tmp_path, monkeypatch):
+    monkeypatch.setattr(snapshot_module, 'zstandard', None)
+    videos = make_videos(50)
+    path = str(tmp_path / 'test.snap')
+    write_snapshot(path, videos, 1.0, codec='zstd')
+    with open(path, 'rb') as f:
+        assert HEADER.unpack(f.read(HEADER.size))[2] == CODEC_ZLIB
+    snapshot = Snapshot(path)
+    assert rows(snapshot) == rows(videos)
+    snapshot.close()
+
+
+def test_other_versions_are_rejected(tmp_path):
+    path = str(tmp_path / 'test.snap')
+    write_snapshot(path, make_videos(10), 1.0)
+    with open(path, 'r+b') as f:
+        f.seek(4)
+        f.write(struct.pack('<H', VERSION + 1))
+    with pytest.raises(SnapshotError, match='version'):
+        Snapshot(path)
+
+
+@pytest.mark.parametrize('key', list(SORT_KEYS))
+def test_sort_keys_match_the_records(tmp_path, key):
+    videos = make_videos(200)
+    path = str(tmp_path / 'test.snap')
+    write_snapshot(path, videos, 1.0)
+    snapshot = Snapshot(path)
+    try:
+        index_key = snapshot.sort_key(key)
+        expected = sorted(range(len(videos)), key=lambda i: SORT_KEYS[key](videos[i]))
+        assert sorted(range(len(snapshot)), key=index_key) == expected
+    finally:
+        snapshot.close()
+
+
+def test_current_snapshot_is_mapped(store):
+    videos = make_videos(50)
+    store.save_videos('PLtest', videos, fetched_at=1.0)
+    save_playlist_snapshot('PLtest', videos, 1.0, store)
+    loaded = load_playlist_videos('PLtest', store)
+    assert isinstance(loaded, Snapshot)
+    assert [v.video_id for v in loaded] == [v.video_id for v in videos]
+    loaded.close()
+
+
+def test_stale_snapshot_falls_back_to_the_store(store):
+    videos = make_videos(50)
+    store.save_videos('PLtest', videos, fetched_at=1.0)
+    save_playlist_snapshot('PLtest', videos, 1.0, store)
+    # A later sync stores a different copy and moves fetched_at on
+    store.save_videos('PLtest', videos[:10])
+    loaded = load_playlist_videos('PLtest', store)
+    assert not isinstance(loaded, Snapshot)
+    assert [v.video_id for v in loaded] == [v.video_id for v in videos[:10]]
+    # ... and leaves a fresh snapshot for next time
+    reloaded = load_playlist_videos('PLtest', store)
+    assert isinstance(reloaded, Snapshot)
+    assert len(reloaded) == 10
+    reloaded.close()
+
+
+def test_superseded_writer_keeps_the_newer_snapshot(store):
+    videos = make_videos(50)
+    store.save_videos('PLtest', videos, fetched_at=1.0)
+    # A second sync stores and snapshots a newer copy before the first one's snapshot is written
+    store.save_videos('PLtest', videos[:10], fetched_at=2.0)
+    assert save_playlist_snapshot('PLtest', videos[:10], 2.0, store)
+    assert not save_playlist_snapshot('PLtest', videos, 1.0, store)
+    loaded = load_playlist_videos('PLtest', store)
+    assert isinstance(loaded, Snapshot)
+    assert loaded.fetched_at == 2.0
+    assert [v.video_id for v in loaded] == [v.video_id for v in videos[:10]]
+    loaded.close()
+
+
+def test_unreadable_snapshot_falls_back_to_the_store(store):
+    videos = make_videos(50)
+    store.save_videos('PLtest', videos, fetched_at=1.0)
+    save_playlist_snapshot('PLtest', videos, 1.0, store)
+    path = snapshot_path('PLtest')
+    with open(path, 'r+b') as f:
+        f.truncate(os.path.getsize(path) - 1)
+    loaded = load_playlist_videos('PLtest', store)
+    assert [v.video_id for v in loaded] == [v.video_id for v in videos]
+
+
+def test_failed_replace_keeps_the_old_snapshot(tmp_path, monkeypatch):
+    path = str(tmp_path / 'test.snap')
+    write_snapshot(path, make_videos(10), 1.0)
+
+    def locked(src, dst):
+        raise PermissionError('file is mapped')
+    monkeypatch.setattr(os, 'replace', locked)
+    assert write_snapshot(path, make_videos(20), 2.0) is False
+    assert os.listdir(tmp_path) == ['test.snap']
+    snapshot = Snapshot(path)
+    assert (snapshot.fetched_at, len(snapshot)) == (1.0, 10)
+    snapshot.close()
@@ -0,0 +1,26 @@
+from sort_index import SortIndex
+from video_record import VideoRecord
+
+
+def ids(view):
+    return [v.video_id for v in view]
+
+
+def test_published_ties_fall_back_to_added_time_then_position():
+    videos = [
+        VideoRecord('a', 'a', added_ts=30, published_ts=5),
+        VideoRecord('b', 'b', added_ts=10, published_ts=5),
+        VideoRecord('c', 'c', added_ts=10, published_ts=5),
+        VideoRecord('d', 'd', added_ts=5),  # not enriched: sorts by its added time
+    ]
+    index = SortIndex(videos)
+    assert ids(index.view('published')) == ['d', 'b', 'c', 'a']
+    assert ids(index.view('published', ascending=False)) == ['a', 'c', 'b', 'd']
+
+
+def test_descending_view_reads_the_order_backwards():
+    videos = [VideoRecord(t, t, added_ts=ts) for t, ts in (('x', 3), ('y', 1), ('z', 2))]
+    view = SortIndex(videos).view('added', ascending=False)
+    assert ids(view) == ['x', 'z', 'y']
+    assert [view[i].video_id for i in range(-3, 3)] == ['x', 'z', 'y', 'x', 'z', 'y']
+    assert len(list(view)) == len(view) == 3
@@ -0,0 +1,71 @@
+from fake_api import make_video_id
+from helpers import sync_playlist_items
+
+
+def statuses(api):
+    return [status for endpoint, status, _ in api.request_log if endpoint == 'playlistItems']
+
+
+def video_ids(videos):
+    return [v.video_id for v in videos]
+
+
+def test_first_sync_stores_everything(api, store):
+    api.add_playlist('PLtest', 60)
+    sync, error = sync_playlist_items('PLtest')
+    assert error is None
+    assert len(sync.added) == 60 and sync.removed == []
+    assert video_ids(store.get_videos('PLtest')) == video_ids(sync.videos)
+
+
+def test_sync_diffs_by_video_id(api, store):
+    api.add_playlist('PLtest', 60)
+    sync_playlist_items('PLtest')
+    # As many removed as added: the count alone would show no change
+    removed = [make_video_id(3), make_video_id(40)]
+    api.remove_videos('PLtest', [3, 40])
+    api.append_videos('PLtest', 2)
+    sync, error = sync_playlist_items('PLtest')
+    assert error is None
+    assert video_ids(sync.added) == [make_video_id(60), make_video_id(61)]
+    assert video_ids(sync.removed) == removed
+    assert video_ids(store.get_videos('PLtest')) == video_ids(sync.videos)
+
+
+def test_uploads_sync_stops_at_the_first_known_video(api, store):
+    api.add_playlist('UUtest', 500)
+    sync_playlist_items('UUtest')
+    api.upload_videos('UUtest', 3)
+    api.request_log.clear()
+    sync, error = sync_playlist_items('UUtest')
+    assert error is None
+    assert len(statuses(api)) == 1
+    assert video_ids(sync.added) == [make_video_id(502), make_video_id(501), make_video_id(500)]
+    assert sync.removed == []
+    assert video_ids(store.get_videos('UUtest')) == video_ids(sync.videos)
+    assert len(sync.videos) == 503
+
+
+def test_uploads_sync_walks_in_full_after_a_removal(api, store):
+    api.add_playlist('UUtest', 500)
+    sync_playlist_items('UUtest')
+    api.upload_videos('UUtest', 1)
+    api.remove_videos('UUtest', [300])
+    api.request_log.clear()
+    sync, error = sync_playlist_items('UUtest')
+    assert error is None
+    # The total comes up one short, so the early stop is not trusted
+    assert len(statuses(api)) == 10
+    assert video_ids(sync.added) == [make_video_id(500)]
+    assert video_ids(sync.removed) == [make_video_id(299)]
+    assert video_ids(store.get_videos('UUtest')) == video_ids(sync.videos)
+
+
+def test_sync_reports_the_fetched_at_it_stored(api, store):
+    api.add_playlist('UUtest', 60)
+    first, _ = sync_playlist_items('UUtest')
+    assert store.get_playlist('UUtest')['fetched_at'] == first.fetched_at
+    api.upload_videos('UUtest', 1)
+    second, _ = sync_playlist_items('UUtest')
+    assert second.fetched_at > first.fetched_at
+    assert store.get_playlist('UUtest')['fetched_at'] == second.fetched_at
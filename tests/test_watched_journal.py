@@ -0,0 +1,66 @@
+import json
+import os
+
+import pytest
+
+from watched_journal import WatchedJournal
+
+
+def journal_line(playlist_id, url, ts):
+    return json.dumps({'p': playlist_id, 'u': url, 't': ts}) + '\n'
+
+
+def watched_rows(store):
+    return store._conn().execute('SELECT COUNT(*) FROM watched').fetchone()[0]
+
+
+@pytest.fixture
+def path(tmp_path):
+    return str(tmp_path / 'watched.journal')
+
+
+def test_replay_skips_a_torn_last_line(store, path):
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(journal_line('PLa', 'https://youtu.be/a', 1.0))
+        f.write(journal_line('PLa', 'https://youtu.be/b', 2.0))
+        f.write(journal_line('PLa', 'https://youtu.be/c', 3.0)[:20])
+    journal = WatchedJournal(path, store)
+    try:
+        assert store.get_watched('PLa') == {'https://youtu.be/a', 'https://youtu.be/b'}
+        assert os.path.getsize(path) == 0
+    finally:
+        journal.close()
+
+
+def test_replay_after_compaction_is_idempotent(store, path):
+    # A crash after the events reached the store but before the journal was swapped
+    events = [('PLa', 'https://youtu.be/a', 1.0), ('PLb', 'https://youtu.be/b', 2.0)]
+    store.mark_watched_many(events)
+    with open(path, 'w', encoding='utf-8') as f:
+        f.write(''.join(journal_line(*e) for e in events))
+    journal = WatchedJournal(path, store)
+    try:
+        assert watched_rows(store) == 2
+        assert store.get_watched('PLa') == {'https://youtu.be/a'}
+        assert store.get_watched('PLb') == {'https://youtu.be/b'}
+    finally:
+        journal.close()
+
+
+def test_get_watched_includes_uncompacted_events(store, path):
+    store.mark_watched_many([('PLa', 'https://youtu.be/stored', 1.0)])
+    # The writer thread waits out its interval, so flushes here are explicit
+    journal = WatchedJournal(path, store, flush_interval=3600, compact_events=100)
+    try:
+        journal.record('PLa', 'https://youtu.be/buffered')
+        journal.record('PLb', 'https://youtu.be/other')
+        assert journal.get_watched('PLa') == {'https://youtu.be/stored', 'https://youtu.be/buffered'}
+        journal.flush()
+        # Journaled but below the compaction threshold: not in the store yet
+        assert store.get_watched('PLa') == {'https://youtu.be/stored'}
+        assert journal.get_watched('PLa') == {'https://youtu.be/stored', 'https://youtu.be/buffered'}
+    finally:
+        journal.close()
+    assert store.get_watched('PLa') == {'https://youtu.be/stored', 'https://youtu.be/buffered'}
+    assert store.get_watched('PLb') == {'https://youtu.be/other'}
+    assert os.path.getsize(path) == 0
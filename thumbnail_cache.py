@@ -0,0 +1,124 @@
+import os
+import hashlib
+import threading
+from collections import OrderedDict
+
+from playlist_store import get_app_data_dir
+from config import THUMBNAIL_MEMORY_CACHE_BYTES, THUMBNAIL_DISK_CACHE_BYTES
+
+
+class MemoryLRUCache:
+    # Size-bounded LRU; sizeof(value) gives each entry's cost in bytes
+    def __init__(self, max_bytes, sizeof):
+        self.max_bytes = max_bytes
+        self.sizeof = sizeof
+        self.total_bytes = 0
+        self._entries = OrderedDict()
+        self._lock = threading.Lock()
+
+    def get(self, key):
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                return None
+            self._entries.move_to_end(key)
+            return entry[0]
+
+    def put(self, key, value):
+        size = self.sizeof(value)
+        with self._lock:
+            old = self._entries.pop(key, None)
+            if old is not None:
+                self.total_bytes -= old[1]
+            self._entries[key] = (value, size)
+            self.total_bytes += size
+            while self.total_bytes > self.max_bytes and len(self._entries) > 1:
+                _, (_, evicted_size) = self._entries.popitem(last=False)
+                self.total_bytes -= evicted_size
+
+    def __contains__(self, key):
+        with self._lock:
+            return key in self._entries
+
+    def __len__(self):
+        return len(self._entries)
+
+
+class DiskThumbnailCache:
+    # Downloaded thumbnail files keyed by URL hash. File mtime doubles as the
+    # LRU clock: hits touch the file and eviction removes the oldest first.
+    def __init__(self, cache_dir, max_bytes):
+        self.cache_dir = cache_dir
+        self.max_bytes = max_bytes
+        self._lock = threading.Lock()
+        os.makedirs(cache_dir, exist_ok=True)
+        self.total_bytes = sum(e.stat().st_size for e in os.scandir(cache_dir) if e.is_file())
+
+    def _path(self, url):
+        return os.path.join(self.cache_dir, hashlib.sha1(url.encode('utf-8')).hexdigest() + '.img')
+
+    def get(self, url):
+        path = self._path(url)
+        try:
+            with open(path, 'rb') as f:
+                content = f.read()
+            os.utime(path)
+            return content
+        except OSError:
+            return None
+
+    def put(self, url, content):
+        path = self._path(url)
+        tmp_path = f'{path}.{threading.get_ident()}.tmp'
+        try:
+            with open(tmp_path, 'wb') as f:
+                f.write(content)
+            previous = os.path.getsize(path) if os.path.exists(path) else 0
+            os.replace(tmp_path, path)
+        except OSError:
+            return
+        with self._lock:
+            self.total_bytes += len(content) - previous
+            if self.total_bytes > self.max_bytes:
+                self._evict()
+
+    def _evict(self):
+        # Drop least recently used files until we are 10% under budget
+        entries = sorted((e for e in os.scandir(self.cache_dir) if e.is_file() and e.name.endswith('.img')),
+                         key=lambda e: e.stat().st_mtime)
+        target = self.max_bytes * 0.9
+        for entry in entries:
+            if self.total_bytes <= target:
+                break
+            try:
+                size = entry.stat().st_size
+                os.remove(entry.path)
+                self.total_bytes -= size
+            except OSError:
+                continue
+
+
+class ThumbnailCache:
+    # Two tiers: decoded images in memory, raw downloads on disk
+    def __init__(self, memory_bytes, disk_dir, disk_bytes, sizeof):
+        self.memory = MemoryLRUCache(memory_bytes, sizeof)
+        self.disk = DiskThumbnailCache(disk_dir, disk_bytes)
+
+
+_cache = None
+_cache_lock = threading.Lock()
+
+
+def image_nbytes(image):
+    # Decoded QImage/QPixmap cost: width * height * bytes per pixel
+    return image.width() * image.height() * 4
+
+
+def get_thumbnail_cache():
+    global _cache
+    with _cache_lock:
+        if _cache is None:
+            _cache = ThumbnailCache(THUMBNAIL_MEMORY_CACHE_BYTES,
+                                    os.path.join(get_app_data_dir(), 'thumbnails'),
+                                    THUMBNAIL_DISK_CACHE_BYTES, image_nbytes)
+        return _cache
@@ -0,0 +1,239 @@
+from PyQt5.QtCore import Qt, QAbstractListModel, QModelIndex, QObject, QRect, QRunnable, QSize, QThreadPool, QEvent, pyqtSignal
+from PyQt5.QtGui import QColor, QFont, QFontMetrics, QImage, QPainter, QPainterPath, QPen, QPixmap
+from PyQt5.QtWidgets import QListView, QStyledItemDelegate, QAbstractItemView
+
+from api_client import get_client
+from cancel import CancelToken
+from thumbnail_cache import get_thumbnail_cache
+from config import CLICKED_LINK_COLOR, UNCLICKED_LINK_COLOR, THUMBNAIL_THREADS
+
+
+CARD_HEIGHT = 160
+CARD_MARGIN = 8
+THUMB_WIDTH = 240
+THUMB_HEIGHT = 135  # 16:9
+
+VideoRole = Qt.UserRole + 1
+LinkRole = Qt.UserRole + 2
+WatchedRole = Qt.UserRole + 3
+ThumbnailRole = Qt.UserRole + 4
+
+
+class ThumbnailSignals(QObject):
+    loaded = pyqtSignal(str, object)  # (url, QImage), or (url, None) when loading failed
+
+
+_thumbnail_pool = None
+
+
+def get_thumbnail_pool():
+    # Separate from the global pool that runs fetches and checks (tasks.run_task)
+    global _thumbnail_pool
+    if _thumbnail_pool is None:
+        _thumbnail_pool = QThreadPool()
+        _thumbnail_pool.setMaxThreadCount(THUMBNAIL_THREADS)
+    return _thumbnail_pool
+
+
+# Loads one thumbnail on the thumbnail pool, from the disk cache when possible.
+# Decoding uses QImage, which unlike QPixmap is safe off the GUI thread.
+# A cancelled loader that is still queued returns at once; one that is downloading gives up.
+class ThumbnailLoader(QRunnable):
+    def __init__(self, url, width, height, signals, cancel=None):
+        super().__init__()
+        self.url = url
+        self.width = width
+        self.height = height
+        self.signals = signals
+        self.cancel = cancel or CancelToken()
+
+    def run(self):
+        if self.cancel.cancelled:
+            return
+        scaled = None
+        try:
+            disk_cache = get_thumbnail_cache().disk
+            content = disk_cache.get(self.url)
+            if content is None:
+                content = get_client().fetch_url(self.url, timeout=5, cancel=self.cancel)
+                if content is not None:
+                    disk_cache.put(self.url, content)
+            image = QImage()
+            if content is not None and image.loadFromData(content):
+                scaled = image.scaled(self.width, self.height, Qt.KeepAspectRatio, Qt.SmoothTransformation)
+        except Exception:
+            pass
+        # Failures are reported too, so the URL is no longer marked as loading
+        if not self.cancel.cancelled:
+            try:
+                self.signals.loaded.emit(self.url, scaled)
+            except RuntimeError:
+                pass  # the application has quit and deleted the signals object
+
+
+# List model over the sorted videos; the view only asks for rows it paints
+class VideoListModel(QAbstractListModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._videos = []
+        self._clicked_links = set()
+        self._thumbnails = get_thumbnail_cache().memory
+        self._pending_thumbnails = {}  # url -> CancelToken of its loader
+        self._thumb_signals = ThumbnailSignals()
+        self._thumb_signals.loaded.connect(self._on_thumbnail_loaded)
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._videos)
+
+    def data(self, index, role=Qt.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._videos):
+            return None
+        v = self._videos[index.row()]
+        if role == Qt.DisplayRole:
+            return v.title
+        if role == Qt.ToolTipRole:
+            return v.title
+        if role == VideoRole:
+            return v
+        if role == LinkRole:
+            return v.link
+        if role == WatchedRole:
+            return v.link in self._clicked_links
+        if role == ThumbnailRole:
+            return self._thumbnail(index.row(), v.thumbnail)
+        return None
+
+    def set_videos(self, videos, clicked_links):
+        # Any sequence works (e.g. a SortedView); it is not copied, so a re-sort costs O(1) here
+        self.beginResetModel()
+        self._videos = videos
+        self._clicked_links = clicked_links
+        self.endResetModel()
+
+    def clear(self):
+        # A new list is coming, so thumbnails still loading for the old one are cancelled
+        for cancel in self._pending_thumbnails.values():
+            cancel.cancel()
+        self._pending_thumbnails.clear()
+        self.set_videos([], set())
+
+    def mark_watched(self, row):
+        index = self.index(row)
+        self._clicked_links.add(self._videos[row].link)
+        self.dataChanged.emit(index, index, [WatchedRole])
+
+    def _thumbnail(self, row, url):
+        # Thumbnails are requested lazily the first time a row is painted
+        if not url:
+            return None
+        pixmap = self._thumbnails.get(url)
+        if pixmap is None and url not in self._pending_thumbnails:
+            cancel = self._pending_thumbnails[url] = CancelToken()
+            get_thumbnail_pool().start(ThumbnailLoader(url, THUMB_WIDTH, THUMB_HEIGHT, self._thumb_signals, cancel))
+        return pixmap
+
+    def _on_thumbnail_loaded(self, url, image):
+        self._pending_thumbnails.pop(url, None)
+        if image is None:
+            return  # asked for again the next time its row is painted
+        self._thumbnails.put(url, QPixmap.fromImage(image))
+        # Only painted rows request thumbnails, so a whole-range change just repaints the viewport
+        if self._videos:
+            self.dataChanged.emit(self.index(0), self.index(len(self._videos) - 1), [ThumbnailRole])
+
+
+# Paints a video card (thumbnail, date, title, link) straight onto the view
+class VideoCardDelegate(QStyledItemDelegate):
+    linkActivated = pyqtSignal(str, int)  # (url, row)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.date_font = QFont()
+        self.date_font.setPixelSize(13)
+        self.title_font = QFont()
+        self.title_font.setPixelSize(16)
+        self.title_font.setBold(True)
+        self.link_font = QFont()
+        self.link_font.setPixelSize(13)
+        self.link_font.setUnderline(True)
+
+    def sizeHint(self, option, index):
+        return QSize(option.rect.width(), CARD_HEIGHT)
+
+    def _layout(self, rect):
+        card = rect.adjusted(CARD_MARGIN, CARD_MARGIN // 2, -CARD_MARGIN, -CARD_MARGIN // 2)
+        thumb = QRect(card.left() + 8, card.top() + (card.height() - THUMB_HEIGHT) // 2, THUMB_WIDTH, THUMB_HEIGHT)
+        info_left = thumb.right() + 16
+        info = QRect(info_left, card.top() + 12, max(card.right() - 8 - info_left, 0), card.height() - 24)
+        return card, thumb, info
+
+    def _link_rect(self, info, link):
+        fm = QFontMetrics(self.link_font)
+        width = min(fm.horizontalAdvance(link), info.width())
+        return QRect(info.left(), info.top() + 54, width, fm.height())
+
+    def paint(self, painter, option, index):
+        v = index.data(VideoRole)
+        if v is None:
+            return
+        painter.save()
+        painter.setRenderHint(QPainter.Antialiasing)
+        card, thumb, info = self._layout(option.rect)
+
+        path = QPainterPath()
+        path.addRoundedRect(card.x(), card.y(), card.width(), card.height(), 8, 8)
+        painter.fillPath(path, QColor('#fafbfc'))
+        painter.setPen(QPen(QColor('#d0d0d0'), 1))
+        painter.drawPath(path)
+
+        pixmap = index.data(ThumbnailRole)
+        if pixmap is not None:
+            x = thumb.left() + (thumb.width() - pixmap.width()) // 2
+            y = thumb.top() + (thumb.height() - pixmap.height()) // 2
+            painter.drawPixmap(x, y, pixmap)
+        else:
+            painter.fillRect(thumb, QColor('#eee'))
+
+        painter.setFont(self.date_font)
+        painter.setPen(QColor('#666'))
+        painter.drawText(QRect(info.left(), info.top(), info.width(), 18), Qt.AlignLeft | Qt.AlignVCenter, v.added_at)
+
+        painter.setFont(self.title_font)
+        painter.setPen(QColor('#222'))
+        title = QFontMetrics(self.title_font).elidedText(v.title, Qt.ElideRight, info.width())
+        painter.drawText(QRect(info.left(), info.top() + 24, info.width(), 24), Qt.AlignLeft | Qt.AlignVCenter, title)
+
+        link = index.data(LinkRole)
+        painter.setFont(self.link_font)
+        painter.setPen(QColor(CLICKED_LINK_COLOR if index.data(WatchedRole) else UNCLICKED_LINK_COLOR))
+        painter.drawText(self._link_rect(info, link), Qt.AlignLeft | Qt.AlignVCenter, link)
+        painter.restore()
+
+    def editorEvent(self, event, model, option, index):
+        if event.type() in (QEvent.MouseButtonRelease, QEvent.MouseMove):
+            _, _, info = self._layout(option.rect)
+            link = index.data(LinkRole)
+            over_link = self._link_rect(info, link).contains(event.pos())
+            view = self.parent()
+            if view is not None:
+                view.viewport().setCursor(Qt.PointingHandCursor if over_link else Qt.ArrowCursor)
+            if event.type() == QEvent.MouseButtonRelease and event.button() == Qt.LeftButton and over_link:
+                self.linkActivated.emit(link, index.row())
+                return True
+        return super().editorEvent(event, model, option, index)
+
+
+class VideoListView(QListView):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.video_model = VideoListModel(self)
+        self.video_delegate = VideoCardDelegate(self)
+        self.setModel(self.video_model)
+        self.setItemDelegate(self.video_delegate)
+        # Fixed-height rows let the view skip measuring every item
+        self.setUniformItemSizes(True)
+        self.setVerticalScrollMode(QAbstractItemView.ScrollPerPixel)
+        self.verticalScrollBar().setSingleStep(24)
+        self.setSelectionMode(QAbstractItemView.NoSelection)
+        self.setMouseTracking(True)
+        self.setStyleSheet('QListView { border: none; background: transparent; }')
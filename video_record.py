@@ -0,0 +1,79 @@
+import time
+import calendar
+
+
+# Medium-size thumbnail URL YouTube serves for every video; only stored when a video differs
+THUMBNAIL_URL = 'https://i.ytimg.com/vi/{}/mqdefault.jpg'
+
+
+def parse_timestamp(value):
+    # 'YYYY-MM-DDTHH:MM:SS[.fff]Z' -> seconds since the epoch (UTC)
+    if not value:
+        return None
+    return calendar.timegm((int(value[0:4]), int(value[5:7]), int(value[8:10]),
+                            int(value[11:13]), int(value[14:16]), int(value[17:19]), 0, 0, 0))
+
+
+def format_timestamp(ts):
+    if ts is None:
+        return None
+    y, mo, d, h, mi, s = time.gmtime(ts)[:6]
+    return f'{y:04d}-{mo:02d}-{d:02d}T{h:02d}:{mi:02d}:{s:02d}Z'
+
+
+class VideoRecord:
+    # One playlist video. Slots instead of a per-video dict, timestamps as ints,
+    # and the thumbnail URL derived from the video ID unless it is non-standard.
+    __slots__ = ('title', 'video_id', 'added_ts', 'published_ts', 'duration', 'view_count', 'like_count', '_thumbnail')
+
+    def __init__(self, title, video_id, added_ts, thumbnail=None, published_ts=None,
+                 duration=None, view_count=None, like_count=None):
+        self.title = title
+        self.video_id = video_id
+        self.added_ts = added_ts
+        self.published_ts = published_ts
+        self.duration = duration
+        self.view_count = view_count
+        self.like_count = like_count
+        self._thumbnail = None if thumbnail == THUMBNAIL_URL.format(video_id) else thumbnail
+
+    @property
+    def thumbnail(self):
+        return self._thumbnail or THUMBNAIL_URL.format(self.video_id)
+
+    @property
+    def added_at(self):
+        return format_timestamp(self.added_ts)
+
+    @property
+    def published_at(self):
+        return format_timestamp(self.published_ts)
+
+    @property
+    def link(self):
+        return f'https://www.youtube.com/watch?v={self.video_id}'
+
+    def to_row(self):
+        # Compact list form used for cached API pages
+        return [self.title, self.video_id, self.added_ts, self._thumbnail]
+
+    @classmethod
+    def from_row(cls, row):
+        title, video_id, added_ts, thumbnail = row
+        return cls(title, video_id, added_ts, thumbnail)
+
+    def to_dict(self):
+        # Plain dict for JSON/CSV output
+        return {
+            'title': self.title,
+            'video_id': self.video_id,
+            'added_at': self.added_at,
+            'published_at': self.published_at,
+            'duration': self.duration,
+            'view_count': self.view_count,
+            'like_count': self.like_count,
+            'thumbnail': self.thumbnail,
+        }
+
+    def __repr__(self):
+        return f'VideoRecord({self.video_id!r}, {self.title!r}, added_at={self.added_at!r})'
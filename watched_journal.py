@@ -0,0 +1,125 @@
+import os
+import json
+import time
+import atexit
+import threading
+
+from app_logging import get_logger
+from playlist_store import get_store, get_app_data_dir
+from config import WATCHED_FLUSH_INTERVAL, WATCHED_COMPACT_EVENTS
+
+
+log = get_logger('watched_journal')
+
+
+class WatchedJournal:
+    # Write-behind log of watched-link clicks. record() only appends to memory; a
+    # writer thread group-commits whatever has piled up to an append-only JSON-lines
+    # file (one write and one fsync per group), and once enough events are journaled
+    # it compacts them into the store and atomically swaps in an empty journal.
+    # A crash loses at most the last flush interval; replaying is idempotent, so a
+    # crash between compacting and swapping the file is harmless.
+    def __init__(self, path, store, flush_interval=WATCHED_FLUSH_INTERVAL, compact_events=WATCHED_COMPACT_EVENTS):
+        self.path = path
+        self.store = store
+        self.flush_interval = flush_interval
+        self.compact_events = compact_events
+        self._lock = threading.Condition()
+        self._io_lock = threading.Lock()
+        self._buffer = []     # (playlist_id, url, ts) not yet written
+        self._journaled = []  # (playlist_id, url, ts) in the journal file, not yet in the store
+        self._closed = False
+        self._recover()
+        self._thread = threading.Thread(target=self._run, name='watched-journal', daemon=True)
+        self._thread.start()
+
+    def _recover(self):
+        # Events left by a previous run go straight into the store
+        if not os.path.exists(self.path) or os.path.getsize(self.path) == 0:
+            return
+        events = []
+        with open(self.path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    e = json.loads(line)
+                    events.append((e['p'], e['u'], e['t']))
+                except (ValueError, KeyError):
+                    continue  # torn last line from a crash mid-write
+        if events:
+            log.info('Replaying %d watched events from %s', len(events), self.path)
+            self.store.mark_watched_many(events)
+        self._replace_journal()
+
+    def record(self, playlist_id, video_url):
+        with self._lock:
+            self._buffer.append((playlist_id, video_url, time.time()))
+            self._lock.notify()
+
+    def get_watched(self, playlist_id):
+        # Store contents plus whatever has not been compacted yet
+        watched = self.store.get_watched(playlist_id)
+        with self._lock:
+            watched.update(url for pid, url, _ in self._journaled if pid == playlist_id)
+            watched.update(url for pid, url, _ in self._buffer if pid == playlist_id)
+        return watched
+
+    def _run(self):
+        while True:
+            with self._lock:
+                while not self._buffer and not self._closed:
+                    self._lock.wait()
+                if self._closed and not self._buffer:
+                    return
+            # Let clicks in quick succession share one write
+            time.sleep(self.flush_interval)
+            try:
+                self.flush()
+            except Exception:
+                log.exception('Writing the watched journal failed')
+
+    def flush(self, compact=False):
+        # Disk work happens under _io_lock only, so record() never waits on an fsync
+        with self._io_lock:
+            with self._lock:
+                events, self._buffer = self._buffer, []
+                self._journaled.extend(events)
+                pending = list(self._journaled)
+            if events:
+                with open(self.path, 'a', encoding='utf-8') as f:
+                    f.write(''.join(json.dumps({'p': p, 'u': u, 't': t}) + '\n' for p, u, t in events))
+                    f.flush()
+                    os.fsync(f.fileno())
+            if pending and (compact or len(pending) >= self.compact_events):
+                self.store.mark_watched_many(pending)
+                self._replace_journal()
+                with self._lock:
+                    del self._journaled[:len(pending)]
+                log.debug('Compacted %d watched events into the store', len(pending))
+
+    def _replace_journal(self):
+        tmp_path = self.path + '.tmp'
+        with open(tmp_path, 'w', encoding='utf-8') as f:
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(tmp_path, self.path)
+
+    def close(self):
+        with self._lock:
+            if self._closed:
+                return
+            self._closed = True
+            self._lock.notify()
+        self.flush(compact=True)
+
+
+_journal = None
+_journal_lock = threading.Lock()
+
+
+def get_watched_journal():
+    global _journal
+    with _journal_lock:
+        if _journal is None:
+            _journal = WatchedJournal(os.path.join(get_app_data_dir(), 'watched.journal'), get_store())
+            atexit.register(_journal.close)
+        return _journal